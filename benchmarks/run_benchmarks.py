@@ -0,0 +1,176 @@
+import os
+import sys
+
+# Prima di importare Qt e matplotlib: nessuna finestra e nessun backend grafico interattivo
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QCoreApplication
+from models.database_schema import Round, Match, Participant, MatchResult
+from models.tournament_model import TournamentModel
+from viewmodels.main_viewmodel import MainViewModel
+from benchmarks.synthetic_tournament import (build_tournament, OUTCOMES, MAX_PARTICIPANTS, MAX_ROUNDS,
+                                             MAX_MATCHES_PER_ROUND)
+
+REPORT_METHODS = [
+    'generate_participant_performance_report',
+    'generate_most_predicted_teams_report',
+    'generate_weekly_prizes_report',
+    'generate_final_standings_report',
+    'generate_prediction_accuracy_report',
+    'generate_team_performance_report',
+    'generate_tournament_summary_report',
+]
+
+
+def measure(function, repeat):
+    # Tempi in millisecondi di `repeat` esecuzioni
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'repeat': repeat,
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'max_ms': round(max(timings), 3),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(num_participants, num_rounds, num_matches, repeat, write_operations):
+    results = {}
+    model = TournamentModel(db_url=f"sqlite:///{os.path.join(os.getcwd(), 'torneo_pronostici.db')}")
+
+    start = time.perf_counter()
+    tournament = build_tournament(model, num_participants=num_participants, num_rounds=num_rounds,
+                                  num_matches=num_matches)
+    results['build_tournament'] = {'repeat': 1, 'min_ms': round((time.perf_counter() - start) * 1000, 3)}
+
+    rounds = model.get_rounds(tournament.id)
+    played_round, open_round = rounds[-2], rounds[-1]
+    participant_ids = [p.id for p in model.get_participants(tournament.id)]
+    open_match_ids = [m.id for m in model.get_matches(open_round.id)]
+
+    def load_scoring_engine():
+        model.scoring_engine = None
+        model.get_scoring_engine(tournament.id)
+
+    results['scoring_engine_load'] = measure(load_scoring_engine, repeat)
+    results['get_tournament_standings'] = measure(lambda: model.get_tournament_standings(tournament.id), repeat)
+    results['calculate_round_scores'] = measure(lambda: model.calculate_round_scores(played_round.id), repeat)
+    results['get_round_summary'] = measure(lambda: model.get_round_summary(played_round.id), repeat)
+    results['get_tournament_summary'] = measure(lambda: model.get_tournament_summary(tournament.id), 1)
+
+    viewmodel = MainViewModel(model)
+    for method in REPORT_METHODS:
+        generate = getattr(viewmodel.report_generator, method)
+        results[f'report.{method}'] = measure(lambda: generate(tournament.id), 1)
+
+    # PDF della griglia partecipanti × giornate più larga prevista (200 × 42 colonne)
+    grid_header = ["Partecipante"] + [f"Giornata {n}" for n in range(1, 42)]
+    grid_rows = [[f"Partecipante {row}"] + [(row + column) % 11 for column in range(41)] for row in range(200)]
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_filename = os.path.join(directory, "griglia.pdf")
+        results['export_pdf_grid_200x42'] = measure(
+            lambda: viewmodel.data_exporter.export_to_pdf(grid_rows, pdf_filename, "Prestazioni", header=grid_header), 1
+        )
+
+    # Scritture: un pronostico alla volta sulla giornata aperta
+    operations = [(participant_ids[i % len(participant_ids)], open_match_ids[i % len(open_match_ids)],
+                   OUTCOMES[i % len(OUTCOMES)]) for i in range(write_operations)]
+    start = time.perf_counter()
+    for participant_id, match_id, prediction in operations:
+        model.add_prediction(participant_id, match_id, prediction)
+    elapsed = time.perf_counter() - start
+    results['add_prediction'] = {
+        'repeat': write_operations,
+        'mean_ms': round(elapsed * 1000 / write_operations, 3),
+        'ops_per_second': round(write_operations / elapsed, 1),
+    }
+
+    # Latenza di un risultato inserito dalla GUI: salvataggio, classifica incrementale e segnali.
+    # L'ultima partita resta senza risultato, così la giornata non cambia stato
+    viewmodel.active_tournament = tournament
+    viewmodel.current_round = open_round
+    viewmodel.update_standings()
+    result_match_ids = open_match_ids[:-1]
+    counter = iter(range(repeat * len(result_match_ids)))
+
+    def enter_match_result():
+        i = next(counter)
+        viewmodel.enter_match_result(result_match_ids[i % len(result_match_ids)], OUTCOMES[i % len(OUTCOMES)].value)
+        # Senza ciclo degli eventi il flush dei segnali raggruppati va chiamato esplicitamente
+        viewmodel.flush_updates()
+
+    results['enter_match_result'] = measure(enter_match_result, repeat * len(result_match_ids))
+
+    predictions_count = len(participant_ids) * num_rounds * num_matches
+    return {
+        'metadata': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'participants': num_participants,
+            'rounds': num_rounds,
+            'matches_per_round': num_matches,
+            'predictions': predictions_count,
+        },
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dei percorsi critici su un torneo sintetico")
+    parser.add_argument("--participants", type=int, default=MAX_PARTICIPANTS)
+    parser.add_argument("--rounds", type=int, default=MAX_ROUNDS)
+    parser.add_argument("--matches", type=int, default=MAX_MATCHES_PER_ROUND)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--writes", type=int, default=500, help="pronostici inseriti per misurare add_prediction")
+    parser.add_argument("--output", help="file JSON dei risultati (default: stdout)")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    output = os.path.abspath(args.output) if args.output else None
+
+    # Database e backup in una cartella temporanea
+    current_dir = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="totoamici_bench_") as work_dir:
+        os.chdir(work_dir)
+        try:
+            report = run_benchmarks(args.participants, args.rounds, args.matches, args.repeat, args.writes)
+        finally:
+            os.chdir(current_dir)
+
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
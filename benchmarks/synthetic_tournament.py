@@ -0,0 +1,55 @@
+import random
+from datetime import date, timedelta
+from models.database_schema import Participant, Round, Match, Prediction, MatchResult, RoundState, TournamentState
+
+# Limiti massimi accettati da DataValidator.validate_tournament_creation
+MAX_PARTICIPANTS = 200
+MAX_ROUNDS = 42
+MAX_MATCHES_PER_ROUND = 16
+
+OUTCOMES = [MatchResult.WIN_HOME, MatchResult.DRAW, MatchResult.WIN_AWAY]
+
+
+def build_tournament(model, name="Torneo Sintetico", num_participants=MAX_PARTICIPANTS, num_rounds=MAX_ROUNDS,
+                     num_matches=MAX_MATCHES_PER_ROUND, played_rounds=None, seed=0):
+    # Torneo completo con tutti i pronostici inseriti: le prime played_rounds giornate (di default
+    # tutte tranne l'ultima) hanno i risultati, l'ultima resta aperta per le misure sulle scritture.
+    # Le righe sono inserite in blocco, senza passare dai metodi del modello riga per riga
+    rnd = random.Random(seed)
+    played_rounds = num_rounds - 1 if played_rounds is None else played_rounds
+    start_date = date(2024, 8, 18)
+
+    tournament = model.create_tournament(name, start_date.year, start_date, num_rounds, num_matches,
+                                         num_participants, 9, 10.0, 20.0, 80.0)
+    with model.transaction() as session:
+        session.execute(Participant.__table__.insert(), [
+            {'tournament_id': tournament.id, 'name': f"Partecipante {i + 1:03d}"} for i in range(num_participants)
+        ])
+        participant_ids = [pid for pid, in session.query(Participant.id).filter(
+            Participant.tournament_id == tournament.id).order_by(Participant.id)]
+
+        for round_number in range(1, num_rounds + 1):
+            played = round_number <= played_rounds
+            round_id = session.execute(Round.__table__.insert().values(
+                tournament_id=tournament.id, round_number=round_number,
+                date=start_date + timedelta(weeks=round_number - 1),
+                state=RoundState.ROUND_CONCLUDED if played else RoundState.ENTERING_RESULTS,
+                weekly_budget=tournament.weekly_budget
+            )).inserted_primary_key[0]
+
+            session.execute(Match.__table__.insert(), [{
+                'round_id': round_id,
+                'home_team': f"Squadra {(round_number + 2 * i) % 20 + 1}",
+                'away_team': f"Squadra {(round_number + 2 * i + 1) % 20 + 1}",
+                'result': rnd.choice(OUTCOMES) if played else None,
+            } for i in range(num_matches)])
+            match_ids = [mid for mid, in session.query(Match.id).filter(Match.round_id == round_id).order_by(Match.id)]
+
+            session.execute(Prediction.__table__.insert(), [
+                {'participant_id': pid, 'match_id': mid, 'prediction': rnd.choice(OUTCOMES)}
+                for pid in participant_ids for mid in match_ids
+            ])
+
+        tournament.state = TournamentState.IN_PROGRESS
+        tournament.current_round = min(played_rounds + 1, num_rounds)
+    return tournament
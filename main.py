@@ -1,9 +1,18 @@
 import sys
+import logging
+from utils.startup_timer import StartupTimer
+
+# Il timer parte prima degli import, così il report include anche il loro tempo
+startup_timer = StartupTimer()
+
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
 from views.main_window import MainWindow
 from models.tournament_model import TournamentModel
 from viewmodels.main_viewmodel import MainViewModel
 
+startup_timer.mark("import")
+
 def exception_hook(exctype, value, traceback):
     print(f"Un'eccezione non gestita si è verificata: {exctype}, {value}")
     print("Traceback:")
@@ -14,9 +23,21 @@ def exception_hook(exctype, value, traceback):
 
 if __name__ == "__main__":
     sys.excepthook = exception_hook
+    # Senza configurazione i messaggi INFO (es. il report dei tempi di avvio) non verrebbero mostrati
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     app = QApplication(sys.argv)
     model = TournamentModel()
+    startup_timer.mark("database")
     viewmodel = MainViewModel(model)
     window = MainWindow(viewmodel)
+    startup_timer.mark("finestra")
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+
+    def on_first_paint():
+        # Primo giro dell'event loop: la finestra è già stata disegnata
+        startup_timer.mark("primo paint")
+        startup_timer.report()
+        viewmodel.start_background_services()
+
+    QTimer.singleShot(0, on_first_paint)
+    sys.exit(app.exec())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Float, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Float, Enum, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 import enum
@@ -66,6 +66,9 @@ class Tournament(Base):
 
 class Participant(Base):
     __tablename__ = 'participants'
+    __table_args__ = (
+        Index('ix_participants_tournament_name', 'tournament_id', 'name'),
+    )
 
     id = Column(Integer, primary_key=True)
     tournament_id = Column(Integer, ForeignKey('tournaments.id'))
@@ -76,6 +79,9 @@ class Participant(Base):
 
 class Round(Base):
     __tablename__ = 'rounds'
+    __table_args__ = (
+        Index('uq_rounds_tournament_round_number', 'tournament_id', 'round_number', unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     tournament_id = Column(Integer, ForeignKey('tournaments.id'))
@@ -89,6 +95,10 @@ class Round(Base):
 
 class Match(Base):
     __tablename__ = 'matches'
+    __table_args__ = (
+        # Copre i filtri per giornata e i conteggi dei risultati inseriti
+        Index('ix_matches_round_result', 'round_id', 'result'),
+    )
 
     id = Column(Integer, primary_key=True)
     round_id = Column(Integer, ForeignKey('rounds.id'))
@@ -102,6 +112,11 @@ class Match(Base):
 
 class Prediction(Base):
     __tablename__ = 'predictions'
+    __table_args__ = (
+        Index('uq_predictions_participant_match', 'participant_id', 'match_id', unique=True),
+        # Indice coprente per classifica, punteggi e variazioni per partita: non serve leggere la tabella
+        Index('ix_predictions_match_prediction_participant', 'match_id', 'prediction', 'participant_id'),
+    )
 
     id = Column(Integer, primary_key=True)
     participant_id = Column(Integer, ForeignKey('participants.id'))
@@ -113,6 +128,9 @@ class Prediction(Base):
 
 class WeeklyPrize(Base):
     __tablename__ = 'weekly_prizes'
+    __table_args__ = (
+        Index('ix_weekly_prizes_tournament_round', 'tournament_id', 'round_id'),
+    )
 
     id = Column(Integer, primary_key=True)
     tournament_id = Column(Integer, ForeignKey('tournaments.id'))
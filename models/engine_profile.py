@@ -0,0 +1,25 @@
+from sqlalchemy import event
+
+# Profilo predefinito del motore SQLite usato da TournamentModel.
+# Ogni voce diventa un "PRAGMA chiave=valore" eseguito all'apertura di ogni connessione.
+DEFAULT_ENGINE_PROFILE = {
+    'journal_mode': 'WAL',          # lettori e scrittore non si bloccano a vicenda
+    'synchronous': 'NORMAL',        # con WAL è sicuro e evita un fsync ad ogni commit
+    'mmap_size': 256 * 1024 * 1024, # letture tramite memory map (256 MB)
+    'cache_size': -64000,           # valore negativo = KiB, circa 64 MB di cache delle pagine
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+}
+
+
+def apply_engine_profile(engine, profile):
+    # Registra i PRAGMA del profilo su ogni nuova connessione del pool
+    if not profile:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in profile.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
@@ -0,0 +1,88 @@
+import os
+import sqlite3
+import logging
+from datetime import datetime
+from sqlalchemy import text
+from .database_schema import Base
+
+logger = logging.getLogger(__name__)
+
+# Versione dello schema registrata nel database (PRAGMA user_version):
+# 1 = pronostici duplicati rimossi prima del vincolo (participant_id, match_id)
+SCHEMA_VERSION = 1
+
+
+def upgrade_schema(engine):
+    # Porta un database esistente (es. un vecchio torneo_pronostici.db) allo schema attuale:
+    # create_all crea solo le tabelle mancanti, gli indici sulle tabelle già esistenti vanno creati qui.
+    # Le migrazioni che modificano i dati girano una volta sola, in base alla versione registrata
+    if get_schema_version(engine) < 1:
+        remove_duplicate_predictions(engine)
+        set_schema_version(engine, 1)
+
+    with engine.begin() as connection:
+        duplicate_rounds = connection.execute(text(
+            "SELECT tournament_id, round_number FROM rounds "
+            "GROUP BY tournament_id, round_number HAVING COUNT(*) > 1"
+        )).all()
+
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name == 'uq_rounds_tournament_round_number' and duplicate_rounds:
+                    # Le giornate duplicate hanno partite collegate: non le cancelliamo automaticamente
+                    logger.warning(f"Giornate duplicate {duplicate_rounds}: vincolo di unicità non applicato")
+                    continue
+                index.create(connection, checkfirst=True)
+
+        connection.execute(text("PRAGMA optimize"))
+
+
+def get_schema_version(engine):
+    with engine.connect() as connection:
+        return connection.execute(text("PRAGMA user_version")).scalar()
+
+
+def set_schema_version(engine, version):
+    with engine.begin() as connection:
+        connection.execute(text(f"PRAGMA user_version = {int(version)}"))
+
+
+def remove_duplicate_predictions(engine):
+    # Prima di applicare il vincolo (participant_id, match_id) teniamo solo il pronostico più recente.
+    # È una cancellazione di dati dell'utente: prima si fa una copia del database e le righe
+    # rimosse finiscono nel log come warning
+    duplicates_query = (
+        "FROM predictions WHERE id NOT IN ("
+        "SELECT MAX(id) FROM predictions GROUP BY participant_id, match_id)"
+    )
+    with engine.connect() as connection:
+        duplicates = connection.execute(text(
+            f"SELECT id, participant_id, match_id, prediction {duplicates_query}"
+        )).all()
+    if not duplicates:
+        return []
+
+    backup_path = backup_before_upgrade(engine, 1)
+    with engine.begin() as connection:
+        connection.execute(text(f"DELETE {duplicates_query}"))
+    logger.warning(
+        f"Rimossi {len(duplicates)} pronostici duplicati (copia del database: {backup_path}). "
+        f"Righe rimosse (id, participant_id, match_id, pronostico): {[tuple(row) for row in duplicates]}"
+    )
+    return duplicates
+
+
+def backup_before_upgrade(engine, version):
+    # Copia completa del database accanto al file originale, con l'API di backup di SQLite
+    database = engine.url.database
+    if not database or database == ":memory:":
+        return None
+    target = f"{os.path.splitext(database)[0]}_pre_schema_{version}_{datetime.now():%Y%m%d_%H%M%S_%f}.db"
+    raw_connection = engine.raw_connection()
+    target_connection = sqlite3.connect(target)
+    try:
+        raw_connection.driver_connection.backup(target_connection)
+    finally:
+        target_connection.close()
+        raw_connection.close()
+    return target
@@ -0,0 +1,29 @@
+import numpy as np
+
+
+class ScoreMatrix:
+    # Matrice densa giornate × partecipanti dei pronostici corretti di un torneo.
+    # Le righe seguono l'ordine di `rounds` (per numero di giornata), le colonne quello di `participants`.
+    def __init__(self, rounds, participants, scores):
+        self.rounds = rounds
+        self.participants = participants
+        self.scores = scores
+        self.round_index = {r.id: i for i, r in enumerate(rounds)}
+        self.participant_index = {p.id: i for i, p in enumerate(participants)}
+
+    @property
+    def round_numbers(self):
+        return [r.round_number for r in self.rounds]
+
+    def round_scores(self, round_id):
+        row = self.scores[self.round_index[round_id]]
+        return {p.id: int(score) for p, score in zip(self.participants, row)}
+
+    def participant_scores(self, participant_id):
+        index = self.participant_index.get(participant_id)
+        if index is None:
+            return np.zeros(len(self.rounds), dtype=self.scores.dtype)
+        return self.scores[:, index]
+
+    def totals(self):
+        return self.scores.sum(axis=0)
@@ -0,0 +1,162 @@
+import numpy as np
+from sqlalchemy import String, cast, select
+from .database_schema import Participant, Round, Match, Prediction, MatchResult
+
+# Codifica compatta (int8) di pronostici e risultati
+MISSING = 0
+OUTCOME_CODES = {MatchResult.WIN_HOME: 1, MatchResult.DRAW: 2, MatchResult.WIN_AWAY: 3}
+CODE_OUTCOMES = {code: result for result, code in OUTCOME_CODES.items()}
+# Risultati che non assegnano punti (Sospesa, Rinviata, ...): mai uguali a un pronostico
+NOT_SCORING = -1
+
+
+def encode_result(result):
+    if result is None:
+        return MISSING
+    if isinstance(result, str):
+        result = MatchResult(result)
+    return OUTCOME_CODES.get(result, NOT_SCORING)
+
+
+class ScoringEngine:
+    # Motore di calcolo in memoria per un torneo: i pronostici sono una matrice int8
+    # partecipanti × partite, i risultati un vettore int8 allineato alle colonne.
+    # Si carica una volta dal database e TournamentModel lo tiene allineato ad ogni scrittura.
+    def __init__(self, tournament_id):
+        self.tournament_id = tournament_id
+        self.participant_ids = []
+        self.participant_index = {}
+        self.round_ids = []
+        self.round_index = {}
+        self.match_ids = []
+        self.match_index = {}
+        self.match_rounds = np.zeros(0, dtype=np.int32)
+        self.predictions = np.zeros((0, 0), dtype=np.int8)
+        self.results = np.zeros(0, dtype=np.int8)
+
+    @classmethod
+    def load(cls, session, tournament_id):
+        engine = cls(tournament_id)
+        participant_ids = [pid for pid, in session.query(Participant.id).filter(
+            Participant.tournament_id == tournament_id
+        ).order_by(Participant.id)]
+        round_ids = [rid for rid, in session.query(Round.id).filter(
+            Round.tournament_id == tournament_id
+        ).order_by(Round.round_number)]
+        matches = session.query(Match.id, Match.round_id, Match.result).join(Match.round).filter(
+            Round.tournament_id == tournament_id
+        ).order_by(Round.round_number, Match.id).all()
+
+        engine.participant_ids = participant_ids
+        engine.participant_index = {pid: i for i, pid in enumerate(participant_ids)}
+        engine.round_ids = round_ids
+        engine.round_index = {rid: i for i, rid in enumerate(round_ids)}
+        engine.match_ids = [m.id for m in matches]
+        engine.match_index = {mid: i for i, mid in enumerate(engine.match_ids)}
+        engine.match_rounds = np.array([engine.round_index[m.round_id] for m in matches], dtype=np.int32)
+        engine.results = np.array([encode_result(m.result) for m in matches], dtype=np.int8)
+        engine.predictions = np.zeros((len(participant_ids), len(matches)), dtype=np.int8)
+
+        # I pronostici si leggono come nomi grezzi dell'enum (cast a stringa) per evitare
+        # la conversione riga per riga dell'ORM (query Core): è l'unica query di dimensione P × M
+        rows = session.connection().execute(select(
+            Prediction.participant_id, Prediction.match_id, cast(Prediction.prediction, String)
+        ).join(Prediction.match).join(Match.round).where(Round.tournament_id == tournament_id)).all()
+        if rows:
+            name_codes = {result.name: encode_result(result) for result in MatchResult}
+            p_idx = np.fromiter((engine.participant_index.get(r[0], -1) for r in rows), dtype=np.int64, count=len(rows))
+            m_idx = np.fromiter((engine.match_index[r[1]] for r in rows), dtype=np.int64, count=len(rows))
+            codes = np.fromiter((name_codes[r[2]] for r in rows), dtype=np.int8, count=len(rows))
+            valid = p_idx >= 0
+            engine.predictions[p_idx[valid], m_idx[valid]] = codes[valid]
+        return engine
+
+    # Sincronizzazione con le scritture sul database
+
+    def add_participant(self, participant_id):
+        if participant_id in self.participant_index:
+            return
+        self.participant_index[participant_id] = len(self.participant_ids)
+        self.participant_ids.append(participant_id)
+        self.predictions = np.vstack([self.predictions, np.zeros((1, len(self.match_ids)), dtype=np.int8)])
+
+    def add_round(self, round_id):
+        if round_id in self.round_index:
+            return
+        self.round_index[round_id] = len(self.round_ids)
+        self.round_ids.append(round_id)
+
+    def add_match(self, match_id, round_id, result=None):
+        if match_id in self.match_index:
+            return
+        self.add_round(round_id)
+        self.match_index[match_id] = len(self.match_ids)
+        self.match_ids.append(match_id)
+        self.match_rounds = np.append(self.match_rounds, np.int32(self.round_index[round_id]))
+        self.results = np.append(self.results, np.int8(encode_result(result)))
+        self.predictions = np.hstack([self.predictions, np.zeros((len(self.participant_ids), 1), dtype=np.int8)])
+
+    def set_prediction(self, participant_id, match_id, prediction):
+        p = self.participant_index.get(participant_id)
+        m = self.match_index.get(match_id)
+        if p is not None and m is not None:
+            self.predictions[p, m] = encode_result(prediction)
+
+    def set_result(self, match_id, result):
+        m = self.match_index.get(match_id)
+        if m is not None:
+            self.results[m] = encode_result(result)
+
+    # Calcoli vettoriali
+
+    def correct(self):
+        return (self.predictions == self.results) & (self.results > 0)
+
+    def score_matrix(self, round_ids=None, participant_ids=None):
+        # Giornate × partecipanti: somma dei pronostici corretti raggruppati per giornata
+        membership = np.zeros((len(self.match_ids), len(self.round_ids)), dtype=np.int16)
+        membership[np.arange(len(self.match_ids)), self.match_rounds] = 1
+        scores = (self.correct().astype(np.int16) @ membership).T
+        if round_ids is not None:
+            scores = self._reindex(scores, 0, round_ids, self.round_index)
+        if participant_ids is not None:
+            scores = self._reindex(scores, 1, participant_ids, self.participant_index)
+        return scores
+
+    @staticmethod
+    def _reindex(scores, axis, ids, index):
+        positions = np.array([index.get(i, -1) for i in ids], dtype=np.int64)
+        shape = list(scores.shape)
+        shape[axis] = len(ids)
+        reindexed = np.zeros(shape, dtype=scores.dtype)
+        found = positions >= 0
+        if axis == 0:
+            reindexed[found] = scores[positions[found]]
+        else:
+            reindexed[:, found] = scores[:, positions[found]]
+        return reindexed
+
+    def round_scores(self, round_id):
+        columns = self.match_rounds == self.round_index[round_id]
+        scores = self.correct()[:, columns].sum(axis=1)
+        return dict(zip(self.participant_ids, scores.tolist()))
+
+    def totals(self):
+        return dict(zip(self.participant_ids, self.correct().sum(axis=1).tolist()))
+
+    def weekly_winners(self, round_id, min_correct_predictions):
+        scores = self.round_scores(round_id)
+        max_score = max(scores.values()) if scores else 0
+        if max_score < min_correct_predictions:
+            return [], max_score
+        return [pid for pid, score in scores.items() if score == max_score], max_score
+
+    def accuracy(self):
+        # Pronostici corretti sul totale dei pronostici inseriti
+        total = int(np.count_nonzero(self.predictions))
+        correct = int(self.correct().sum())
+        return correct, total
+
+    def prediction_distribution(self):
+        counts = np.bincount(self.predictions[self.predictions > 0], minlength=4)
+        return {CODE_OUTCOMES[code].value: int(counts[code]) for code in (1, 2, 3)}
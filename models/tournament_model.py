@@ -1,18 +1,94 @@
-from sqlalchemy import create_engine, func
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import bindparam, create_engine, delete, func, inspect, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker, scoped_session
 from .database_schema import Base, Tournament, Participant, Round, Match, Prediction, WeeklyPrize, FinalPrize, TournamentState, RoundState, MatchResult
+from .engine_profile import DEFAULT_ENGINE_PROFILE, apply_engine_profile
+from .schema_upgrade import upgrade_schema
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from datetime import date as date_type
 
+logger = logging.getLogger(__name__)
+
+# Risultati che assegnano punti: gli altri (Sospesa, Rinviata, ...) non contano
+SCORING_RESULTS = [MatchResult.WIN_HOME, MatchResult.DRAW, MatchResult.WIN_AWAY]
+
+# Colonne dell'esportazione completa dei pronostici (una riga per pronostico)
+PREDICTION_EXPORT_COLUMNS = ['Torneo', 'Anno', 'Giornata', 'Partecipante', 'Squadra Casa', 'Squadra Trasferta',
+                             'Pronostico', 'Risultato']
+
 class TournamentModel:
-    def __init__(self):
-        self.engine = create_engine('sqlite:///torneo_pronostici.db', echo=True)
-        self.Session = sessionmaker(bind=self.engine)
-        self.session = self.Session()
+    def __init__(self, db_url='sqlite:///torneo_pronostici.db', engine_profile=None, echo=False):
+        # engine_profile=None usa DEFAULT_ENGINE_PROFILE; un dizionario vuoto lascia i PRAGMA di SQLite
+        self.engine = create_engine(db_url, echo=echo)
+        self.engine_profile = DEFAULT_ENGINE_PROFILE if engine_profile is None else engine_profile
+        apply_engine_profile(self.engine, self.engine_profile)
+        # Una sessione per thread (scoped_session): la GUI e i thread di lavoro non condividono mai
+        # la stessa sessione. expire_on_commit=False lascia utilizzabili gli oggetti già caricati
+        # anche dopo release_session, senza ricaricarli ad ogni commit: le scritture qui sotto
+        # passano tutte da transaction() e fanno ricaricare esplicitamente ciò che cambiano
+        self.session_factory = sessionmaker(bind=self.engine, expire_on_commit=False)
+        self.Session = scoped_session(self.session_factory)
+        # Il motore dei punteggi è condiviso tra la GUI e i thread dei report: caricamento,
+        # sostituzione e aggiornamenti avvengono sotto questo lock
+        self.engine_lock = threading.RLock()
+        self.scoring_engine = None
         self.create_tables()
 
     def create_tables(self):
         Base.metadata.create_all(self.engine)
+        upgrade_schema(self.engine)
+
+    @property
+    def session(self):
+        # Sessione del thread corrente
+        return self.Session()
+
+    @contextmanager
+    def transaction(self):
+        # Unità di lavoro esplicita: commit all'uscita, rollback in caso di errore
+        session = self.session
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+    def expire_loaded(self, session, cls, object_id, *attributes):
+        # Con expire_on_commit=False le collezioni già caricate (es. tournament.participants) non
+        # vedono le righe aggiunte: si fanno ricaricare al prossimo accesso. Nessuna query se
+        # l'oggetto non è nella sessione
+        obj = session.identity_map.get(session.identity_key(cls, object_id))
+        if obj is not None:
+            session.expire(obj, attributes or None)
+
+    def save_changes(self):
+        # Salva le modifiche in sospeso della sessione del thread corrente
+        with self.transaction():
+            pass
+
+    @contextmanager
+    def read_session(self):
+        # Sessione indipendente e di breve durata per le letture dai thread di lavoro
+        session = self.session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def release_session(self):
+        # Chiude la sessione del thread corrente: l'identity map riparte vuota e la memoria
+        # resta costante nel corso della stagione. Gli oggetti già caricati restano leggibili
+        self.Session.remove()
+
+    def set_sql_echo(self, enabled):
+        # Attiva o disattiva a runtime la stampa delle istruzioni SQL
+        self.engine.echo = enabled
 
     def create_tournament(self, name, year, start_date, num_rounds, num_matches_per_round, num_participants,
                               min_correct_predictions, participant_fee, weekly_prize_percentage, final_prizes_percentage):
@@ -42,11 +118,10 @@ class TournamentModel:
                 final_budget=final_budget,
                 state=TournamentState.ADDING_PARTICIPANTS
             )
-            self.session.add(tournament)
-            self.session.commit()
+            with self.transaction() as session:
+                session.add(tournament)
             return tournament
         except Exception as e:
-            self.session.rollback()
             print(f"Errore durante la creazione del torneo: {e}")  # Per il debug
             raise
 
@@ -58,19 +133,48 @@ class TournamentModel:
             self.session.rollback()
             return None
 
+    def get_scoring_engine(self, tournament_id):
+        # Il motore vettoriale viene caricato una sola volta per torneo e poi mantenuto
+        # allineato dai metodi di scrittura qui sotto
+        with self.engine_lock:
+            if self.scoring_engine is None or self.scoring_engine.tournament_id != tournament_id:
+                # numpy si importa solo quando serve il motore, non all'avvio
+                from .scoring_engine import ScoringEngine
+                self.scoring_engine = ScoringEngine.load(self.session, tournament_id)
+            return self.scoring_engine
+
+    def invalidate_scoring_engine(self):
+        # Da chiamare quando il database cambia senza passare dal modello (es. ripristino di un backup)
+        with self.engine_lock:
+            self.scoring_engine = None
+
+    def _engine_for(self, tournament_id):
+        # Da chiamare con engine_lock acquisito
+        if self.scoring_engine is not None and self.scoring_engine.tournament_id == tournament_id:
+            return self.scoring_engine
+        return None
+
     def add_participant(self, tournament_id, name):
         participant = Participant(tournament_id=tournament_id, name=name)
-        self.session.add(participant)
-        self.session.commit()
+        with self.transaction() as session:
+            session.add(participant)
+            self.expire_loaded(session, Tournament, tournament_id, 'participants')
+        with self.engine_lock:
+            engine = self._engine_for(tournament_id)
+            if engine:
+                engine.add_participant(participant.id)
         return participant
 
+    def get_participant_name(self, participant_id):
+        participant = self.session.get(Participant, participant_id)
+        return participant.name if participant else None
+
     def edit_participant(self, participant_id, new_name):
-        participant = self.session.query(Participant).get(participant_id)
-        if participant:
+        with self.transaction() as session:
+            participant = session.get(Participant, participant_id)
+            if not participant:
+                raise ValueError("Partecipante non trovato")
             participant.name = new_name
-            self.session.commit()
-        else:
-            raise ValueError("Partecipante non trovato")
     
     def get_participants(self, tournament_id):
         return self.session.query(Participant).filter_by(tournament_id=tournament_id).all()
@@ -101,12 +205,18 @@ class TournamentModel:
                 weekly_budget=tournament.weekly_budget,
                 state=RoundState.SELECTING_DATE
             )
-            self.session.add(round)
-            tournament.current_round = round_number
-            self.session.commit()
+            with self.transaction() as session:
+                session.add(round)
+                tournament.current_round = round_number
+                self.expire_loaded(session, Tournament, tournament_id, 'rounds')
+            with self.engine_lock:
+                engine = self._engine_for(tournament_id)
+                if engine:
+                    engine.add_round(round.id)
             return round
+        except IntegrityError:
+            raise ValueError(f"La giornata {round_number} esiste già per questo torneo")
         except Exception as e:
-            self.session.rollback()
             print(f"Errore durante la creazione della giornata: {e}")
             raise
 
@@ -127,18 +237,83 @@ class TournamentModel:
 
     def add_match(self, round_id, home_team, away_team):
         match = Match(round_id=round_id, home_team=home_team, away_team=away_team)
-        self.session.add(match)
-        self.session.commit()
+        with self.transaction() as session:
+            session.add(match)
+            self.expire_loaded(session, Round, round_id, 'matches')
+        with self.engine_lock:
+            if self.scoring_engine is not None and round_id in self.scoring_engine.round_index:
+                self.scoring_engine.add_match(match.id, round_id)
         return match
 
     def get_matches(self, round_id):
-        return self.session.query(Match).filter_by(round_id=round_id).all()
+        # Ordine stabile: l'indice (round_id, result) altrimenti ordinerebbe le partite per risultato
+        return self.session.query(Match).filter_by(round_id=round_id).order_by(Match.id).all()
 
     def add_prediction(self, participant_id, match_id, prediction):
-        prediction = Prediction(participant_id=participant_id, match_id=match_id, prediction=prediction)
-        self.session.add(prediction)
-        self.session.commit()
-        return prediction
+        self.add_predictions([(participant_id, match_id, prediction)])
+        return self.session.query(Prediction).filter_by(participant_id=participant_id, match_id=match_id).first()
+
+    def add_predictions(self, predictions, deletions=()):
+        # Inserimento in blocco di (participant_id, match_id, pronostico) in un'unica transazione.
+        # Il vincolo unico (participant_id, match_id) trasforma i duplicati in aggiornamenti (upsert).
+        # deletions: coppie (participant_id, match_id) dei pronostici cancellati, rimossi nella
+        # stessa transazione
+        predictions = [(participant_id, match_id, MatchResult(p) if isinstance(p, str) else p)
+                       for participant_id, match_id, p in predictions]
+        deletions = set(deletions)
+        if not predictions and not deletions:
+            return 0
+        try:
+            statement = sqlite_insert(Prediction.__table__)
+            statement = statement.on_conflict_do_update(
+                index_elements=['participant_id', 'match_id'],
+                set_={'prediction': statement.excluded.prediction}
+            )
+            with self.transaction() as session:
+                # Upsert e cancellazioni passano dal Core: i pronostici già in memoria vanno ricaricati,
+                # quelli cancellati (o non più riconoscibili perché già scaduti) tolti dalla sessione
+                for obj in list(session.identity_map.values()):
+                    if isinstance(obj, Prediction):
+                        loaded = inspect(obj).dict
+                        key = (loaded.get('participant_id'), loaded.get('match_id'))
+                        if deletions and (key in deletions or None in key):
+                            session.expunge(obj)
+                        else:
+                            session.expire(obj)
+                if deletions:
+                    table = Prediction.__table__
+                    session.execute(
+                        delete(table).where(table.c.participant_id == bindparam('p_id'),
+                                            table.c.match_id == bindparam('m_id')),
+                        [{'p_id': participant_id, 'm_id': match_id} for participant_id, match_id in deletions]
+                    )
+                if predictions:
+                    session.execute(statement, [
+                        {'participant_id': participant_id, 'match_id': match_id, 'prediction': prediction}
+                        for participant_id, match_id, prediction in predictions
+                    ])
+        except Exception as e:
+            logger.exception(f"Errore durante l'inserimento dei pronostici: {e}")
+            raise
+
+        with self.engine_lock:
+            if self.scoring_engine is not None:
+                for participant_id, match_id in deletions:
+                    self.scoring_engine.set_prediction(participant_id, match_id, None)
+                for participant_id, match_id, prediction in predictions:
+                    self.scoring_engine.set_prediction(participant_id, match_id, prediction)
+        return len(predictions) + len(deletions)
+
+    def get_matchday_predictions(self, tournament_id, round_id):
+        # (partecipanti, partite, pronostici già inseriti) per la griglia di una giornata
+        return (self.get_participants(tournament_id), self.get_matches(round_id),
+                self.get_round_predictions(round_id))
+
+    def get_round_predictions(self, round_id, participant_ids=None):
+        query = self.session.query(Prediction).join(Match).filter(Match.round_id == round_id)
+        if participant_ids is not None:
+            query = query.filter(Prediction.participant_id.in_(participant_ids))
+        return query.all()
 
     def get_predictions(self, participant_id, round_id):
         return self.session.query(Prediction).join(Match).filter(
@@ -146,103 +321,288 @@ class TournamentModel:
             Match.round_id == round_id
         ).all()
 
+    def iter_prediction_rows(self, tournament_id=None, batch_size=1000):
+        # Tutti i pronostici di un torneo (o di tutti i tornei se tournament_id è None) letti a
+        # blocchi di batch_size righe con yield_per: la memoria usata non dipende dal numero di righe.
+        # Usa una sessione propria, chiusa quando il generatore termina
+        query = select(
+            Tournament.name, Tournament.year, Round.round_number, Participant.name,
+            Match.home_team, Match.away_team, Prediction.prediction, Match.result
+        ).select_from(Prediction).join(Prediction.match).join(Match.round).join(Round.tournament).join(
+            Prediction.participant
+        ).order_by(Tournament.id, Round.round_number, Match.id, Participant.id)
+        if tournament_id is not None:
+            query = query.where(Round.tournament_id == tournament_id)
+
+        with self.read_session() as session:
+            for row in session.execute(query.execution_options(yield_per=batch_size)):
+                yield (row[0], row[1], row[2], row[3], row[4], row[5],
+                       row[6].value if row[6] else None, row[7].value if row[7] else None)
+
+    def iter_prediction_batches(self, tournament_id=None):
+        # Gli stessi pronostici di iter_prediction_rows organizzati per colonne (nome -> lista),
+        # una giornata alla volta: in memoria c'è sempre una sola giornata
+        with self.read_session() as session:
+            rounds = session.query(
+                Round.id, Round.round_number, Round.date, Tournament.id, Tournament.name, Tournament.year
+            ).join(Round.tournament).order_by(Tournament.id, Round.round_number)
+            if tournament_id is not None:
+                rounds = rounds.filter(Round.tournament_id == tournament_id)
+
+            for round_id, round_number, round_date, t_id, t_name, t_year in rounds.all():
+                rows = session.execute(select(
+                    Match.id, Match.home_team, Match.away_team, Match.result,
+                    Participant.id, Participant.name, Prediction.prediction
+                ).select_from(Prediction).join(Prediction.match).join(Prediction.participant).where(
+                    Match.round_id == round_id
+                ).order_by(Match.id, Participant.id)).all()
+                if not rows:
+                    continue
+
+                count = len(rows)
+                match_ids, home_teams, away_teams, results, participant_ids, participant_names, predictions = zip(*rows)
+                yield {
+                    'torneo_id': [t_id] * count,
+                    'torneo': [t_name] * count,
+                    'anno': [t_year] * count,
+                    'giornata': [round_number] * count,
+                    'data_giornata': [round_date] * count,
+                    'partita_id': list(match_ids),
+                    'squadra_casa': list(home_teams),
+                    'squadra_trasferta': list(away_teams),
+                    'risultato': [r.value if r else None for r in results],
+                    'partecipante_id': list(participant_ids),
+                    'partecipante': list(participant_names),
+                    'pronostico': [p.value if p else None for p in predictions],
+                }
+
+    def get_match_result(self, match_id):
+        match = self.session.get(Match, match_id)
+        return match.result if match else None
+
     def update_match_result(self, match_id, result):
-        match = self.session.query(Match).get(match_id)
-        if match:
-            match.result = result
-            self.session.commit()
-            return match
-        return None
+        with self.transaction() as session:
+            match = session.get(Match, match_id)
+            if not match:
+                return None
+            match.result = MatchResult(result) if isinstance(result, str) else result
+        with self.engine_lock:
+            if self.scoring_engine is not None:
+                self.scoring_engine.set_result(match_id, match.result)
+        return match
+
+    def update_match_results(self, results):
+        # Risultati di più partite {match_id: risultato} in un'unica transazione.
+        # Restituisce {match_id: risultato precedente} per l'aggiornamento incrementale dei punteggi
+        results = {match_id: MatchResult(r) if isinstance(r, str) else r for match_id, r in results.items()}
+        if not results:
+            return {}
+        try:
+            with self.transaction() as session:
+                matches = session.query(Match).filter(Match.id.in_(results)).all()
+                previous_results = {}
+                for match in matches:
+                    previous_results[match.id] = match.result
+                    match.result = results[match.id]
+        except Exception as e:
+            logger.exception(f"Errore durante l'inserimento dei risultati: {e}")
+            raise
+
+        with self.engine_lock:
+            if self.scoring_engine is not None:
+                for match_id in previous_results:
+                    self.scoring_engine.set_result(match_id, results[match_id])
+        return previous_results
+
+    def get_score_deltas(self, match_id, previous_result, new_result):
+        return self.get_score_deltas_for_matches({match_id: (previous_result, new_result)})
+
+    def get_score_deltas_for_matches(self, changes):
+        # changes: {match_id: (risultato precedente, nuovo risultato)}.
+        # Variazione di punteggio per i soli partecipanti che hanno pronosticato le partite:
+        # -1 a chi aveva indovinato il risultato precedente, +1 a chi indovina quello nuovo
+        scoring_changes = {}
+        for match_id, (previous_result, new_result) in changes.items():
+            previous_result = MatchResult(previous_result) if isinstance(previous_result, str) else previous_result
+            new_result = MatchResult(new_result) if isinstance(new_result, str) else new_result
+            if previous_result != new_result and (previous_result in SCORING_RESULTS or new_result in SCORING_RESULTS):
+                scoring_changes[match_id] = (previous_result, new_result)
+        if not scoring_changes:
+            return {}
+
+        deltas = {}
+        rows = self.session.query(Prediction.participant_id, Prediction.match_id, Prediction.prediction).filter(
+            Prediction.match_id.in_(scoring_changes)
+        ).all()
+        for participant_id, match_id, prediction in rows:
+            previous_result, new_result = scoring_changes[match_id]
+            delta = (prediction == new_result) - (prediction == previous_result)
+            if delta:
+                deltas[participant_id] = deltas.get(participant_id, 0) + delta
+        return deltas
 
     def calculate_round_scores(self, round_id):
-        scores = {}
-        round = self.session.query(Round).get(round_id)
-        for participant in round.tournament.participants:
-            correct_predictions = self.session.query(Prediction).join(Match).filter(
-                Prediction.participant_id == participant.id,
-                Match.round_id == round_id,
-                Prediction.prediction == Match.result,
-                Match.result.in_([MatchResult.WIN_HOME, MatchResult.DRAW, MatchResult.WIN_AWAY])
-            ).count()
-            scores[participant.id] = correct_predictions
-        return scores
+        round = self.session.get(Round, round_id)
+        with self.engine_lock:
+            return self.get_scoring_engine(round.tournament_id).round_scores(round_id)
+
+    def get_score_matrix(self, tournament_id):
+        # Tutti i punteggi giornata × partecipante in un solo passaggio sul motore vettoriale,
+        # invece di chiamare calculate_round_scores per ogni giornata
+        from .score_matrix import ScoreMatrix
+        rounds = self.get_rounds(tournament_id)
+        participants = self.get_participants(tournament_id)
+        with self.engine_lock:
+            scores = self.get_scoring_engine(tournament_id).score_matrix(
+                [r.id for r in rounds], [p.id for p in participants]
+            )
+        return ScoreMatrix(rounds, participants, scores)
 
     def get_weekly_prize_winners(self, round_id):
         round = self.session.query(Round).get(round_id)
-        scores = self.calculate_round_scores(round_id)
-        max_score = max(scores.values()) if scores else 0
-        
-        if max_score >= round.tournament.min_correct_predictions:
-            winners = [p_id for p_id, score in scores.items() if score == max_score]
+        with self.engine_lock:
+            engine = self.get_scoring_engine(round.tournament_id)
+            winners, _ = engine.weekly_winners(round_id, round.tournament.min_correct_predictions)
+        if winners:
             return winners, round.weekly_budget
         
         return [], 0
 
     def assign_weekly_prize(self, tournament_id, round_id, winner_id, amount):
         weekly_prize = WeeklyPrize(tournament_id=tournament_id, round_id=round_id, winner_id=winner_id, amount=amount)
-        self.session.add(weekly_prize)
-        self.session.commit()
+        with self.transaction() as session:
+            session.add(weekly_prize)
+            self.expire_loaded(session, Tournament, tournament_id, 'weekly_prizes')
         return weekly_prize
 
-    def get_tournament_standings(self, tournament_id):
-        tournament = self.session.query(Tournament).get(tournament_id)
-        standings = {}
-        for participant in tournament.participants:
-            total_score = self.session.query(func.count(Prediction.id)).join(Match).filter(
-                Prediction.participant_id == participant.id,
-                Match.round_id.in_([r.id for r in tournament.rounds]),
-                Prediction.prediction == Match.result,
-                Match.result.in_([MatchResult.WIN_HOME, MatchResult.DRAW, MatchResult.WIN_AWAY])
-            ).scalar()
-            standings[participant.id] = total_score
+    def get_standings(self, tournament_id):
+        # Un'unica query aggregata: pronostici corretti per partecipante, in join esterno
+        # con i partecipanti così che compaiano anche quelli a zero punti
+        correct = self.session.query(
+            Prediction.participant_id.label('participant_id'),
+            func.count(Prediction.id).label('score')
+        ).join(Match).join(Round).filter(
+            Round.tournament_id == tournament_id,
+            Prediction.prediction == Match.result,
+            Match.result.in_(SCORING_RESULTS)
+        ).group_by(Prediction.participant_id).subquery()
+
+        rows = self.session.query(
+            Participant.id, Participant.name, func.coalesce(correct.c.score, 0)
+        ).outerjoin(correct, correct.c.participant_id == Participant.id).filter(
+            Participant.tournament_id == tournament_id
+        ).all()
+        return self.rank_standings(rows)
+
+    @staticmethod
+    def rank_standings(rows):
+        # Ordina le righe (participant_id, nome, punteggio) e assegna posizione e pari merito:
+        # a parità di punteggio i partecipanti condividono la posizione (1, 2, 2, 4, ...)
+        rows = sorted(rows, key=lambda r: (-r[2], r[1]))
+        score_counts = Counter(score for _, _, score in rows)
+        standings = []
+        position = 0
+        previous_score = None
+        for index, (participant_id, name, score) in enumerate(rows, start=1):
+            if score != previous_score:
+                position = index
+                previous_score = score
+            standings.append({
+                'participant_id': participant_id,
+                'name': name,
+                'score': score,
+                'position': position,
+                'tied': score_counts[score] > 1
+            })
         return standings
 
+    def get_tournament_standings(self, tournament_id):
+        return {row['participant_id']: row['score'] for row in self.get_standings(tournament_id)}
+
     def assign_final_prizes(self, tournament_id, participant_id, position, amount):
         final_prizes = FinalPrize(tournament_id=tournament_id, participant_id=participant_id, position=position, amount=amount)
-        self.session.add(final_prizes)
-        self.session.commit()
+        with self.transaction() as session:
+            session.add(final_prizes)
+            self.expire_loaded(session, Tournament, tournament_id, 'final_prizes')
         return final_prizes
 
     def update_tournament_state(self, tournament_id, new_state):
-        tournament = self.session.query(Tournament).get(tournament_id)
-        if tournament:
+        with self.transaction() as session:
+            tournament = session.get(Tournament, tournament_id)
+            if not tournament:
+                return False
             tournament.state = new_state
-            self.session.commit()
-            return True
-        return False
+        return True
 
     def update_round_state(self, round_id, new_state):
-        round = self.session.query(Round).get(round_id)
-        if round:
+        with self.transaction() as session:
+            round = session.get(Round, round_id)
+            if not round:
+                return False
             round.state = new_state
-            self.session.commit()
-            return True
-        return False
+        return True
 
     def update_round_date(self, round_id, date_type):
-        round = self.session.query(Round).get(round_id)
-        if round:
+        with self.transaction() as session:
+            round = session.get(Round, round_id)
+            if not round:
+                raise ValueError("Giornata non trovata")
             round.date = date_type
             round.state = RoundState.ENTERING_TEAMS
-            self.session.commit()
-        else:
-            raise ValueError("Giornata non trovata")
+
+    def add_to_weekly_budget(self, round_id, amount):
+        # Montepremi settimanale non assegnato che passa alla giornata successiva
+        with self.transaction() as session:
+            round = session.get(Round, round_id)
+            if not round:
+                raise ValueError("Giornata non trovata")
+            round.weekly_budget += amount
+
+    def delete_tournament(self, tournament_id):
+        with self.transaction() as session:
+            tournament = session.get(Tournament, tournament_id)
+            if not tournament:
+                raise ValueError("Torneo non trovato")
+            session.delete(tournament)
+        with self.engine_lock:
+            if self._engine_for(tournament_id):
+                self.scoring_engine = None
     
     def get_round_summary(self, round_id):
-        round = self.session.query(Round).get(round_id)
+        # Giornata, partite e tutti i pronostici della giornata in un'unica query (al massimo tre
+        # query in tutto): i partecipanti sono quelli del motore dei punteggi
+        round = self.session.get(Round, round_id)
+        scores = self.calculate_round_scores(round_id)
         summary = {
             'round_number': round.round_number,
             'date': round.date,
             'matches': [(m.id, m.home_team, m.away_team, m.result) for m in round.matches],
-            'predictions': {},
-            'scores': self.calculate_round_scores(round_id)
+            'predictions': {participant_id: [] for participant_id in scores},
+            'scores': scores
         }
-        for participant in round.tournament.participants:
-            summary['predictions'][participant.id] = [
-                (p.match_id, p.prediction) for p in self.get_predictions(participant.id, round_id)
-            ]
+        predictions = self.session.query(Prediction.participant_id, Prediction.match_id, Prediction.prediction).join(
+            Prediction.match
+        ).filter(Match.round_id == round_id).order_by(Prediction.id)
+        for participant_id, match_id, prediction in predictions:
+            summary['predictions'].setdefault(participant_id, []).append((match_id, prediction))
         return summary
 
+    def get_tournament_statistics(self, tournament_id):
+        tournament = self.session.get(Tournament, tournament_id)
+        return {
+            'total_participants': tournament.num_participants,
+            'completed_rounds': self.session.query(Round).filter(
+                Round.tournament_id == tournament_id,
+                Round.state == RoundState.ROUND_CONCLUDED
+            ).count(),
+            'total_matches': self.session.query(Match).join(Round).filter(
+                Round.tournament_id == tournament_id
+            ).count(),
+            'total_predictions': self.session.query(Prediction).join(Match).join(Round).filter(
+                Round.tournament_id == tournament_id
+            ).count(),
+        }
+
     def get_tournament_summary(self, tournament_id):
         tournament = self.session.query(Tournament).get(tournament_id)
         summary = {
@@ -251,7 +611,7 @@ class TournamentModel:
             'num_rounds': tournament.num_rounds,
             'num_participants': tournament.num_participants,
             'rounds': [self.get_round_summary(r.id) for r in tournament.rounds],
-            'final_standings': sorted(self.get_tournament_standings(tournament_id).items(), key=lambda x: x[1], reverse=True),
+            'final_standings': [(row['participant_id'], row['score']) for row in self.get_standings(tournament_id)],
             'weekly_prizes': [(wp.round.round_number, wp.winner.name, wp.amount) for wp in tournament.weekly_prizes],
             'final_prizes': [(fp.position, fp.participant.name, fp.amount) for fp in tournament.final_prizes]
         }
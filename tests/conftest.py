@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Qt senza finestre e matplotlib senza backend interattivo anche nei test
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,52 @@
+import time
+import pytest
+from reportlab.platypus import LongTable
+import utils.data_exporter as data_exporter
+from utils.data_exporter import DataExporter, PDF_CHUNK_SIZE
+
+
+def grid_rows(num_rows, num_columns, consumed):
+    # Griglia partecipanti × giornate come quella delle prestazioni dei partecipanti
+    for row in range(num_rows):
+        consumed[0] += 1
+        yield [f"Partecipante {row}"] + [(row + column) % 11 for column in range(num_columns - 1)]
+
+
+def pdf_pages(filename):
+    with open(filename, 'rb') as pdf:
+        return pdf.read().count(b"/Type /Page\n")
+
+
+def test_performance_grid_renders_in_seconds(tmp_path):
+    # 200 partecipanti × 41 giornate (+ il nome): pagina orizzontale, pochi secondi
+    filename = str(tmp_path / "griglia.pdf")
+    header = ["Partecipante"] + [f"Giornata {n}" for n in range(1, 42)]
+    start = time.perf_counter()
+    DataExporter.export_to_pdf(grid_rows(200, 42, [0]), filename, "Prestazioni", header=header)
+    assert time.perf_counter() - start < 5
+    assert pdf_pages(filename) > 1
+
+
+def test_pdf_rows_are_read_while_drawing(tmp_path, monkeypatch):
+    # Le righe si leggono man mano: quando si disegna la prima tabella il resto non è ancora stato letto
+    consumed = [0]
+    consumed_at_first_draw = []
+
+    class RecordingTable(LongTable):
+        def drawOn(self, *args, **kwargs):
+            if not consumed_at_first_draw:
+                consumed_at_first_draw.append(consumed[0])
+            return super().drawOn(*args, **kwargs)
+
+    monkeypatch.setattr(data_exporter, "LongTable", RecordingTable)
+    num_rows = PDF_CHUNK_SIZE * 10
+    DataExporter.export_to_pdf(grid_rows(num_rows, 4, consumed), str(tmp_path / "righe.pdf"), "Righe",
+                               header=["A", "B", "C", "D"])
+    assert consumed[0] == num_rows
+    assert consumed_at_first_draw[0] <= PDF_CHUNK_SIZE * 2
+
+
+def test_empty_pdf_writes_header_only(tmp_path):
+    filename = str(tmp_path / "vuoto.pdf")
+    DataExporter.export_to_pdf([], filename, "Vuoto", header=["Posizione", "Partecipante"])
+    assert pdf_pages(filename) == 1
@@ -0,0 +1,173 @@
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import pytest
+from PyQt6.QtCore import QCoreApplication
+from benchmarks.synthetic_tournament import build_tournament
+from models.tournament_model import TournamentModel
+from utils.database_backup import DatabaseBackup
+from viewmodels.main_viewmodel import MainViewModel
+
+
+@pytest.fixture
+def viewmodel(tmp_path, monkeypatch):
+    # Il ViewModel usa torneo_pronostici.db e backups/ nella cartella corrente
+    app = QCoreApplication.instance() or QCoreApplication([])
+    monkeypatch.chdir(tmp_path)
+    logging.disable(logging.WARNING)
+    model = TournamentModel()
+    build_tournament(model, num_participants=6, num_rounds=3, num_matches=4)
+    viewmodel = MainViewModel(model)
+    viewmodel.load_active_tournament()
+    yield viewmodel
+    logging.disable(logging.NOTSET)
+    model.engine.dispose()
+
+
+def take_backup(viewmodel):
+    snapshot_id = viewmodel.db_backup.backup()
+    viewmodel.db_backup.wait_for_backups()
+    return snapshot_id
+
+
+def test_restore_discards_cached_scores(viewmodel):
+    model, tournament_id = viewmodel.model, viewmodel.active_tournament.id
+    viewmodel.update_standings()
+    standings = model.get_tournament_standings(tournament_id)
+    snapshot_id = take_backup(viewmodel)
+
+    # Dopo il backup i risultati della prima giornata vengono annullati (motore e classifica aggiornati)
+    first_round = model.get_rounds(tournament_id)[0]
+    model.get_scoring_engine(tournament_id)
+    viewmodel.enter_match_results({m.id: "Annullata" for m in model.get_matches(first_round.id)})
+    assert model.get_scoring_engine(tournament_id).totals() != standings
+
+    assert viewmodel.restore_backup(snapshot_id)
+    assert viewmodel.standings is None
+    assert model.scoring_engine is None
+    viewmodel.load_active_tournament()
+    viewmodel.update_standings()
+    assert viewmodel.standings == standings
+    assert model.get_scoring_engine(tournament_id).totals() == standings
+
+
+def make_database(path, seed):
+    # Database di qualche centinaio di KB con contenuto diverso per ogni seed (più blocchi dell'archivio)
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE dati (id INTEGER PRIMARY KEY, valore BLOB)")
+    connection.executemany("INSERT INTO dati (valore) VALUES (?)",
+                           [(os.urandom(1024),) for _ in range(300 + seed)])
+    connection.commit()
+    connection.close()
+
+
+def table_contents(path):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("SELECT id, valore FROM dati ORDER BY id").fetchall()
+    finally:
+        connection.close()
+
+
+def test_concurrent_backups_can_both_be_restored(tmp_path):
+    # Due backup contemporanei sullo stesso archivio, con pulizia aggressiva (keep_snapshots=2):
+    # nessuno dei due deve perdere blocchi o sovrascrivere il manifest dell'altro
+    backup_dir = str(tmp_path / "backups")
+    sources = [str(tmp_path / f"torneo_{i}.db") for i in range(2)]
+    for seed, source in enumerate(sources):
+        make_database(source, seed)
+    backups = [DatabaseBackup(source, backup_dir, keep_snapshots=2) for source in sources]
+
+    for _ in range(5):
+        barrier = threading.Barrier(len(backups))
+        snapshot_ids = [None] * len(backups)
+
+        def run(index):
+            barrier.wait()
+            snapshot_ids[index] = backups[index].backup()
+            backups[index].wait_for_backups()
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(backups))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(snapshot_ids)) == len(snapshot_ids)
+        for snapshot_id, source in zip(snapshot_ids, sources):
+            restored = str(tmp_path / f"ripristino_{snapshot_id}.db")
+            backups[0].store.restore_snapshot(snapshot_id, restored)
+            assert backups[0].verify_backup(restored)
+            assert table_contents(restored) == table_contents(source)
+
+        # Le sorgenti cambiano tra un giro e l'altro, così i blocchi vecchi diventano da pulire
+        for seed, source in enumerate(sources):
+            os.remove(source)
+            make_database(source, seed)
+
+
+def test_legacy_backups_are_listed_and_restorable(tmp_path):
+    source = str(tmp_path / "torneo.db")
+    make_database(source, 0)
+    backup = DatabaseBackup(source, str(tmp_path / "backups"))
+    shutil.copy(source, os.path.join(backup.backup_dir, "tournament_backup_20240101_120000.db"))
+    expected = table_contents(source)
+    backup.backup()
+    backup.wait_for_backups()
+
+    listed = backup.list_backups()
+    assert [b.get('legacy', False) for b in listed] == [False, True]
+    make_database(str(tmp_path / "altro.db"), 1)
+    os.replace(str(tmp_path / "altro.db"), source)
+    backup.restore_from_backup("tournament_backup_20240101_120000.db")
+    assert table_contents(source) == expected
+
+
+def test_backup_copies_on_worker_thread_and_reports_completion(tmp_path):
+    source = str(tmp_path / "torneo.db")
+    make_database(source, 0)
+    completed = []
+    backup = DatabaseBackup(source, str(tmp_path / "backups"),
+                            on_complete=lambda snapshot_id, error: completed.append((snapshot_id, error)))
+    copy_threads = []
+    copy_database = backup.copy_database
+
+    def recording_copy(*args):
+        copy_threads.append(threading.current_thread())
+        copy_database(*args)
+    backup.copy_database = recording_copy
+
+    snapshot_id = backup.backup()
+    assert backup.wait_for_backups()
+    assert copy_threads and threading.current_thread() not in copy_threads
+    assert not any(thread.daemon for thread in copy_threads)
+    assert completed == [(snapshot_id, None)]
+    assert [s['id'] for s in backup.list_backups()] == [snapshot_id]
+
+
+def test_interrupted_backup_files_removed_on_open(tmp_path):
+    # Come dopo una chiusura forzata a metà backup: copia di lavoro, blocco .tmp e blocco senza manifest
+    source = str(tmp_path / "torneo.db")
+    make_database(source, 0)
+    backup_dir = str(tmp_path / "backups")
+    backup = DatabaseBackup(source, backup_dir)
+    snapshot_id = backup.backup()
+    backup.wait_for_backups()
+
+    staging = os.path.join(backup_dir, "staging_20240101_120000_000000.db")
+    shutil.copy(source, staging)
+    orphan_dir = os.path.join(backup.store.chunks_dir, "00")
+    os.makedirs(orphan_dir, exist_ok=True)
+    orphans = [os.path.join(orphan_dir, "00" + "a" * 62), os.path.join(orphan_dir, "00" + "b" * 62 + ".tmp")]
+    for orphan in orphans:
+        with open(orphan, "wb") as f:
+            f.write(b"blocco incompleto")
+
+    reopened = DatabaseBackup(source, backup_dir)
+    assert not os.path.exists(staging)
+    assert not any(os.path.exists(orphan) for orphan in orphans)
+    restored = str(tmp_path / "ripristino.db")
+    reopened.store.restore_snapshot(snapshot_id, restored)
+    assert table_contents(restored) == table_contents(source)
@@ -0,0 +1,38 @@
+import logging
+import pytest
+from PyQt6.QtWidgets import QApplication, QMessageBox
+from benchmarks.synthetic_tournament import build_tournament
+from models.database_schema import RoundState
+from models.tournament_model import TournamentModel
+from viewmodels.main_viewmodel import MainViewModel
+from views.main_window import MainWindow
+
+
+@pytest.fixture
+def window(tmp_path, monkeypatch):
+    app = QApplication.instance() or QApplication([])
+    monkeypatch.chdir(tmp_path)
+    for name in ("information", "critical", "warning"):
+        monkeypatch.setattr(QMessageBox, name, staticmethod(lambda *args, **kwargs: None))
+    logging.disable(logging.WARNING)
+    model = TournamentModel()
+    build_tournament(model, num_participants=4, num_rounds=2, num_matches=3)
+    viewmodel = MainViewModel(model)
+    window = MainWindow(viewmodel)
+    viewmodel.load_active_tournament()
+    yield window
+    viewmodel.page_loader.wait_for_done()
+    app.processEvents()
+    logging.disable(logging.NOTSET)
+    model.engine.dispose()
+
+
+def test_manage_round_page_for_round_without_date(window):
+    # La pagina si costruisce alla prima apertura: la giornata senza data usa la data predefinita
+    viewmodel = window.viewmodel
+    viewmodel.current_round.date = None
+    viewmodel.current_round.state = RoundState.SELECTING_DATE
+    window.show_page('manage_round')
+    assert window.round_date_input.date().toPyDate() == viewmodel.get_today_or_future_date()
+    assert window.round_date_input.isEnabled()
+    assert window.set_date_btn.isEnabled()
@@ -0,0 +1,75 @@
+import logging
+import pytest
+from PyQt6.QtCore import QCoreApplication
+from benchmarks.synthetic_tournament import build_tournament
+from models.tournament_model import TournamentModel
+from viewmodels.main_viewmodel import MainViewModel
+from views.prediction_matrix import PredictionMatrixModel
+
+
+@pytest.fixture
+def viewmodel(tmp_path, monkeypatch):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    monkeypatch.chdir(tmp_path)
+    logging.disable(logging.WARNING)
+    model = TournamentModel()
+    build_tournament(model, num_participants=5, num_rounds=2, num_matches=4)
+    viewmodel = MainViewModel(model)
+    viewmodel.load_active_tournament()
+    yield viewmodel
+    logging.disable(logging.NOTSET)
+    model.engine.dispose()
+
+
+def load_matrix(viewmodel):
+    matrix = PredictionMatrixModel()
+    matrix.set_matrix(*viewmodel.get_matchday_predictions())
+    return matrix
+
+
+def test_cleared_cells_are_deleted_on_save(viewmodel):
+    engine = viewmodel.model.get_scoring_engine(viewmodel.active_tournament.id)
+    matrix = load_matrix(viewmodel)
+    filled, total, _ = matrix.completion()
+    assert filled == total
+    participant_id, match_id = matrix.participant_ids[0], matrix.match_ids[1]
+
+    # Svuota le prime due schedine dalla seconda partita in poi e ne modifica una cella
+    matrix.clear(0, 1, 1, 3)
+    matrix.setData(matrix.index(2, 0), "X")
+    assert viewmodel.submit_matchday_predictions(matrix.sheets())
+    matrix.mark_saved()
+    assert matrix.sheets()[participant_id] == {matrix.match_ids[0]: matrix.data(matrix.index(0, 0))}
+
+    viewmodel.model.release_session()
+    reloaded = load_matrix(viewmodel)
+    assert (reloaded.codes == matrix.codes).all()
+    assert reloaded.completion()[0] == total - 6
+    assert reloaded.data(reloaded.index(0, 1)) == ""
+    assert reloaded.data(reloaded.index(2, 0)) == "X"
+
+    # Anche il motore dei punteggi già caricato non conta più i pronostici cancellati
+    fresh = type(engine).load(viewmodel.model.session, viewmodel.active_tournament.id)
+    assert (engine.predictions == fresh.predictions).all()
+    assert engine.predictions[engine.participant_index[participant_id], engine.match_index[match_id]] == 0
+
+
+def test_reload_keeps_unsaved_edits(viewmodel):
+    matrix = load_matrix(viewmodel)
+    matrix.setData(matrix.index(0, 0), "X" if matrix.data(matrix.index(0, 0)) != "X" else "2")
+    matrix.clear(1, 0, 1, 0)
+    edits = matrix.unsaved_edits()
+    assert len(edits) == 2
+
+    # Nel frattempo viene aggiunto un partecipante: la griglia riletta lo contiene e conserva le modifiche
+    viewmodel.model.add_participant(viewmodel.active_tournament.id, "Nuovo")
+    matrix.set_matrix(*viewmodel.get_matchday_predictions(), keep_edits=True)
+    assert matrix.rowCount() == 6
+    assert matrix.unsaved_edits() == edits
+    assert matrix.has_unsaved_edits()
+
+    assert viewmodel.submit_matchday_predictions(matrix.sheets())
+    matrix.mark_saved()
+    assert not matrix.has_unsaved_edits()
+    assert load_matrix(viewmodel).unsaved_edits() == {}
+    assert (load_matrix(viewmodel).codes == matrix.codes).all()
@@ -0,0 +1,130 @@
+import logging
+import os
+import pytest
+from PyQt6.QtCore import QCoreApplication
+from benchmarks.synthetic_tournament import build_tournament, OUTCOMES, MAX_PARTICIPANTS, MAX_ROUNDS, MAX_MATCHES_PER_ROUND
+from models.tournament_model import TournamentModel
+from viewmodels.main_viewmodel import MainViewModel
+from utils.metrics import MetricsRegistry
+
+# Numero massimo di query SQL per operazione, misurato con il motore dei punteggi già caricato.
+# Ogni operazione viene eseguita su due tornei che differiscono solo per il numero di partecipanti:
+# il conteggio deve restare uguale, così un ciclo di query per partecipante fa fallire il test
+SMALL_PARTICIPANTS = 20
+
+MODEL_BUDGETS = {
+    'get_standings': 2,
+    'get_tournament_standings': 2,
+    'calculate_round_scores': 1,
+    'get_round_summary': 3,
+    'get_score_matrix': 2,
+    'get_weekly_prize_winners': 1,
+}
+
+VIEWMODEL_BUDGETS = {
+    'load_active_tournament': 1,
+    'update_standings': 2,
+    'submit_predictions': 6,
+    'submit_matchday_predictions': 6,
+    'get_matchday_predictions': 3,
+    'enter_match_results': 5,
+    'get_tournament_statistics': 3,
+    'get_participant_performance': 2,
+    'get_head_to_head': 2,
+}
+
+
+class TournamentEnvironment:
+    def __init__(self, work_dir, num_participants):
+        self.model = TournamentModel(db_url=f"sqlite:///{os.path.join(work_dir, 'torneo_pronostici.db')}")
+        self.tournament = build_tournament(self.model, num_participants=num_participants, num_rounds=MAX_ROUNDS,
+                                           num_matches=MAX_MATCHES_PER_ROUND)
+        self.viewmodel = MainViewModel(self.model)
+        self.registry = MetricsRegistry()
+        self.registry.instrument_engine(self.model.engine)
+
+        rounds = self.model.get_rounds(self.tournament.id)
+        self.played_round, self.open_round = rounds[-2], rounds[-1]
+        self.participant_ids = [p.id for p in self.model.get_participants(self.tournament.id)]
+        self.open_match_ids = [m.id for m in self.model.get_matches(self.open_round.id)]
+
+        self.viewmodel.load_active_tournament()
+        self.viewmodel.current_round = self.open_round
+        self.viewmodel.update_standings()
+        self.model.get_scoring_engine(self.tournament.id)
+
+    def count_queries(self, operation):
+        with self.registry.action('operazione') as scope:
+            operation()
+        return scope.queries
+
+    def model_operations(self):
+        model, tournament_id = self.model, self.tournament.id
+        return {
+            'get_standings': lambda: model.get_standings(tournament_id),
+            'get_tournament_standings': lambda: model.get_tournament_standings(tournament_id),
+            'calculate_round_scores': lambda: model.calculate_round_scores(self.played_round.id),
+            'get_round_summary': lambda: model.get_round_summary(self.played_round.id),
+            'get_score_matrix': lambda: model.get_score_matrix(tournament_id),
+            'get_weekly_prize_winners': lambda: model.get_weekly_prize_winners(self.played_round.id),
+        }
+
+    def viewmodel_operations(self):
+        viewmodel = self.viewmodel
+        sheet = {match_id: OUTCOMES[i % 3].value for i, match_id in enumerate(self.open_match_ids)}
+        # L'ultima partita resta senza risultato, così la giornata non cambia stato
+        results = {match_id: OUTCOMES[i % 3].value for i, match_id in enumerate(self.open_match_ids[:-1])}
+        return {
+            'load_active_tournament': viewmodel.load_active_tournament,
+            'update_standings': viewmodel.update_standings,
+            'submit_predictions': lambda: viewmodel.submit_predictions(self.participant_ids[0], sheet),
+            'get_matchday_predictions': viewmodel.get_matchday_predictions,
+            'submit_matchday_predictions': lambda: viewmodel.submit_matchday_predictions(
+                {participant_id: sheet for participant_id in self.participant_ids}),
+            'enter_match_results': lambda: viewmodel.enter_match_results(results),
+            'get_tournament_statistics': viewmodel.get_tournament_statistics,
+            'get_participant_performance': lambda: viewmodel.get_participant_performance(self.participant_ids[0]),
+            'get_head_to_head': lambda: viewmodel.get_head_to_head(self.participant_ids[0], self.participant_ids[1]),
+        }
+
+
+@pytest.fixture(scope="module")
+def environments(tmp_path_factory):
+    logging.disable(logging.CRITICAL)
+    app = QCoreApplication.instance() or QCoreApplication([])
+    current_dir = os.getcwd()
+    environments = {}
+    try:
+        for num_participants in (SMALL_PARTICIPANTS, MAX_PARTICIPANTS):
+            # MainViewModel crea i backup nella cartella corrente
+            work_dir = tmp_path_factory.mktemp(f"torneo_{num_participants}")
+            os.chdir(work_dir)
+            environments[num_participants] = TournamentEnvironment(str(work_dir), num_participants)
+        yield environments
+    finally:
+        os.chdir(current_dir)
+        logging.disable(logging.NOTSET)
+
+
+def assert_budget(environments, name, budget, operations):
+    counts = {size: environment.count_queries(operations(environment)[name])
+              for size, environment in environments.items()}
+    assert counts[MAX_PARTICIPANTS] <= budget, f"{name}: {counts[MAX_PARTICIPANTS]} query, budget {budget}"
+    assert counts[SMALL_PARTICIPANTS] == counts[MAX_PARTICIPANTS], \
+        f"{name}: le query dipendono dal numero di partecipanti {counts}"
+
+
+@pytest.mark.parametrize("name,budget", MODEL_BUDGETS.items())
+def test_model_query_budget(environments, name, budget):
+    assert_budget(environments, name, budget, TournamentEnvironment.model_operations)
+
+
+@pytest.mark.parametrize("name,budget", VIEWMODEL_BUDGETS.items())
+def test_viewmodel_query_budget(environments, name, budget):
+    assert_budget(environments, name, budget, TournamentEnvironment.viewmodel_operations)
+
+
+def test_tournament_summary_does_not_scale_with_participants(environments):
+    counts = {size: environment.count_queries(lambda: environment.model.get_tournament_summary(environment.tournament.id))
+              for size, environment in environments.items()}
+    assert counts[SMALL_PARTICIPANTS] == counts[MAX_PARTICIPANTS], counts
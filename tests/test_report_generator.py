@@ -0,0 +1,35 @@
+import os
+import logging
+from datetime import date
+import pytest
+from models.tournament_model import TournamentModel
+from utils import report_generator
+from utils.report_generator import REPORTS, ReportGenerator
+
+
+@pytest.fixture
+def empty_tournament(tmp_path):
+    # Torneo appena creato: nessun partecipante, pronostico, risultato o premio
+    logging.disable(logging.WARNING)
+    model = TournamentModel(db_url=f"sqlite:///{os.path.join(tmp_path, 'torneo.db')}")
+    tournament = model.create_tournament("Torneo Vuoto", 2024, date(2024, 8, 18), 2, 3, 4, 9, 10.0, 20.0, 80.0)
+    yield ReportGenerator(model).collect_report_data(tournament.id)
+    logging.disable(logging.NOTSET)
+    model.engine.dispose()
+
+
+def test_all_reports_exported_without_data(empty_tournament, tmp_path):
+    files = ReportGenerator.export_all_reports(empty_tournament, str(tmp_path), max_workers=1)
+    assert len(files) == 2 * len(REPORTS)
+    assert all(os.path.exists(f) for f in files)
+
+
+def test_failed_report_does_not_stop_the_others(empty_tournament, tmp_path, monkeypatch):
+    def broken(data):
+        raise RuntimeError("disegno non riuscito")
+
+    data_sources, _, export = REPORTS['premi_settimanali']
+    monkeypatch.setitem(report_generator.REPORTS, 'premi_settimanali', (data_sources, broken, export))
+    files = ReportGenerator.export_all_reports(empty_tournament, str(tmp_path), max_workers=1)
+    assert len(files) == 2 * (len(REPORTS) - 1)
+    assert not any(os.path.basename(f).startswith('premi_settimanali') for f in files)
@@ -0,0 +1,56 @@
+import glob
+import logging
+import os
+import sqlite3
+from benchmarks.synthetic_tournament import build_tournament
+from models.schema_upgrade import SCHEMA_VERSION
+from models.tournament_model import TournamentModel
+
+
+def make_old_database(path):
+    # Database dello schema attuale riportato a prima del vincolo sui pronostici,
+    # con un secondo pronostico (più recente) per la stessa partita
+    model = TournamentModel(db_url=f"sqlite:///{path}")
+    build_tournament(model, num_participants=2, num_rounds=1, num_matches=2)
+    model.release_session()
+    model.engine.dispose()
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        DROP INDEX uq_predictions_participant_match;
+        PRAGMA user_version = 0;
+        INSERT INTO predictions (participant_id, match_id, prediction)
+        SELECT participant_id, match_id, 'DRAW' FROM predictions ORDER BY id LIMIT 1;
+    """)
+    count = connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+    connection.close()
+    return count
+
+
+def test_duplicate_predictions_removed_once_with_backup(tmp_path, caplog):
+    path = str(tmp_path / "torneo.db")
+    count = make_old_database(path)
+
+    with caplog.at_level(logging.WARNING, logger="models.schema_upgrade"):
+        model = TournamentModel(db_url=f"sqlite:///{path}")
+    assert "Rimossi 1 pronostici duplicati" in caplog.text
+    connection = model.engine.raw_connection()
+    assert connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] == count - 1
+    # Resta il pronostico più recente
+    assert connection.execute("SELECT prediction FROM predictions ORDER BY id DESC LIMIT 1").fetchone()[0] == 'DRAW'
+    assert connection.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    connection.close()
+
+    # La copia fatta prima della cancellazione contiene ancora entrambi i pronostici
+    backups = glob.glob(os.path.join(str(tmp_path), "torneo_pre_schema_1_*.db"))
+    assert len(backups) == 1
+    backup = sqlite3.connect(backups[0])
+    assert backup.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] == count
+    backup.close()
+
+    # Alle aperture successive la migrazione non gira più
+    model.engine.dispose()
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger="models.schema_upgrade"):
+        TournamentModel(db_url=f"sqlite:///{path}").engine.dispose()
+    assert "pronostici duplicati" not in caplog.text
+    assert len(glob.glob(os.path.join(str(tmp_path), "torneo_pre_schema_1_*.db"))) == 1
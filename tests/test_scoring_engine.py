@@ -0,0 +1,98 @@
+import os
+import logging
+from collections import defaultdict
+import numpy as np
+import pytest
+from benchmarks.synthetic_tournament import build_tournament
+from models.database_schema import Participant, Round, Match, Prediction, MatchResult
+from models.tournament_model import TournamentModel
+
+# Confronto tra il motore vettoriale e il calcolo riga per riga (come il vecchio calculate_round_scores)
+# su un torneo fisso: risultati 1/X/2, una partita sospesa e una senza risultato
+SCORING_RESULTS = [MatchResult.WIN_HOME, MatchResult.DRAW, MatchResult.WIN_AWAY]
+
+
+@pytest.fixture(scope="module")
+def tournament(tmp_path_factory):
+    logging.disable(logging.WARNING)
+    work_dir = tmp_path_factory.mktemp("motore")
+    model = TournamentModel(db_url=f"sqlite:///{os.path.join(work_dir, 'torneo.db')}")
+    tournament = build_tournament(model, num_participants=12, num_rounds=4, num_matches=10, seed=7)
+    played_round = model.get_rounds(tournament.id)[0]
+    model.update_match_results({model.get_matches(played_round.id)[0].id: MatchResult.SUSPENDED.value})
+    yield model, tournament
+    logging.disable(logging.NOTSET)
+
+
+def row_by_row_scores(model, tournament_id):
+    # {round_id: {participant_id: pronostici corretti}} leggendo i pronostici uno alla volta
+    scores = defaultdict(dict)
+    participants = model.session.query(Participant).filter_by(tournament_id=tournament_id).all()
+    for round in model.session.query(Round).filter_by(tournament_id=tournament_id):
+        for participant in participants:
+            scores[round.id][participant.id] = 0
+    predictions = model.session.query(Prediction, Match).join(Match).join(Round).filter(
+        Round.tournament_id == tournament_id)
+    for prediction, match in predictions:
+        if match.result in SCORING_RESULTS and prediction.prediction == match.result:
+            scores[match.round_id][prediction.participant_id] += 1
+    return scores
+
+
+def test_round_scores_match_row_by_row(tournament):
+    model, t = tournament
+    expected = row_by_row_scores(model, t.id)
+    for round in model.get_rounds(t.id):
+        assert model.calculate_round_scores(round.id) == expected[round.id]
+
+
+def test_score_matrix_matches_row_by_row(tournament):
+    model, t = tournament
+    expected = row_by_row_scores(model, t.id)
+    matrix = model.get_score_matrix(t.id)
+    for i, round in enumerate(matrix.rounds):
+        for j, participant in enumerate(matrix.participants):
+            assert matrix.scores[i, j] == expected[round.id][participant.id]
+
+
+def test_standings_totals_match_engine(tournament):
+    model, t = tournament
+    expected = row_by_row_scores(model, t.id)
+    totals = {pid: sum(round_scores[pid] for round_scores in expected.values())
+              for pid in next(iter(expected.values()))}
+    assert model.get_tournament_standings(t.id) == totals
+    assert model.get_scoring_engine(t.id).totals() == totals
+
+
+def test_weekly_winners_match_row_by_row(tournament):
+    model, t = tournament
+    engine = model.get_scoring_engine(t.id)
+    for round_id, scores in row_by_row_scores(model, t.id).items():
+        best = max(scores.values())
+        winners, max_score = engine.weekly_winners(round_id, min_correct_predictions=best)
+        assert max_score == best
+        assert sorted(winners) == sorted(pid for pid, score in scores.items() if score == best)
+        assert engine.weekly_winners(round_id, min_correct_predictions=best + 1)[0] == []
+
+
+def test_engine_stays_aligned_after_writes(tournament):
+    model, t = tournament
+    engine = model.get_scoring_engine(t.id)
+    open_round = model.get_rounds(t.id)[-1]
+    match_ids = [m.id for m in model.get_matches(open_round.id)]
+    participant_ids = [p.id for p in model.get_participants(t.id)]
+    model.add_predictions([(participant_ids[0], match_ids[0], "X"), (participant_ids[1], match_ids[0], "1")])
+    model.update_match_results({match_ids[0]: "X", match_ids[1]: MatchResult.CANCELLED.value})
+
+    expected = row_by_row_scores(model, t.id)
+    assert engine.round_scores(open_round.id) == expected[open_round.id]
+    reloaded = type(engine).load(model.session, t.id)
+    assert np.array_equal(reloaded.score_matrix(), engine.score_matrix())
+
+
+def test_rank_standings_shares_positions_on_ties():
+    rows = [(1, "Carla", 5), (2, "Bruno", 7), (3, "Anna", 5), (4, "Dario", 2), (5, "Elena", 7)]
+    standings = TournamentModel.rank_standings(rows)
+    assert [(row['name'], row['position'], row['tied']) for row in standings] == [
+        ("Bruno", 1, True), ("Elena", 1, True), ("Anna", 3, True), ("Carla", 3, True), ("Dario", 5, False),
+    ]
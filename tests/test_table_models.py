@@ -0,0 +1,33 @@
+from types import SimpleNamespace
+from PyQt6.QtCore import QCoreApplication
+from views.table_models import ChoiceTableModel, RESULT_CHOICES, NO_CHOICE
+
+
+def test_untouched_results_are_not_saved():
+    app = QCoreApplication.instance() or QCoreApplication([])
+    matches = [SimpleNamespace(id=i, home_team=f"Casa {i}", away_team=f"Trasferta {i}") for i in range(1, 4)]
+    model = ChoiceTableModel(["Partita", "Casa", "Trasferta", "Risultato"], RESULT_CHOICES)
+    model.set_matches(matches, {2: "X"})
+
+    # Le partite senza risultato restano vuote, non "1"
+    assert [model.index(row, 3).data() for row in range(3)] == [NO_CHOICE, "X", NO_CHOICE]
+    assert model.values() == {2: "X"}
+
+    assert model.setData(model.index(2, 3), "Rinviata")
+    assert not model.setData(model.index(0, 3), "3")
+    assert model.values() == {2: "X", 3: "Rinviata"}
+
+
+def test_closing_editor_on_empty_cell_keeps_it_empty():
+    from PyQt6.QtWidgets import QApplication, QWidget
+    from views.table_models import ChoiceDelegate
+    app = QApplication.instance() or QApplication([])
+    model = ChoiceTableModel(["Partita", "Casa", "Trasferta", "Risultato"], RESULT_CHOICES)
+    model.set_matches([SimpleNamespace(id=1, home_team="A", away_team="B")], {})
+    delegate = ChoiceDelegate(RESULT_CHOICES)
+    index = model.index(0, 3)
+    parent = QWidget()
+    editor = delegate.createEditor(parent, None, index)
+    delegate.setEditorData(editor, index)
+    delegate.setModelData(editor, model, index)
+    assert model.values() == {}
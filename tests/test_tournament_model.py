@@ -0,0 +1,67 @@
+import os
+import logging
+import threading
+import pytest
+from benchmarks.synthetic_tournament import build_tournament
+from models.tournament_model import TournamentModel
+
+
+@pytest.fixture
+def tournament(tmp_path):
+    logging.disable(logging.WARNING)
+    model = TournamentModel(db_url=f"sqlite:///{os.path.join(tmp_path, 'torneo.db')}")
+    tournament = build_tournament(model, num_participants=6, num_rounds=3, num_matches=4)
+    yield model, tournament
+    logging.disable(logging.NOTSET)
+    model.engine.dispose()
+
+
+def test_loaded_collections_see_new_rows(tournament):
+    # expire_on_commit=False: le scritture devono far ricaricare le collezioni già in memoria
+    model, t = tournament
+    round = model.get_rounds(t.id)[-1]
+    participants, matches = len(t.participants), len(round.matches)
+    model.add_participant(t.id, "Nuovo")
+    model.add_match(round.id, "Casa", "Trasferta")
+    assert len(t.participants) == participants + 1
+    assert len(round.matches) == matches + 1
+
+
+def test_failed_write_is_rolled_back(tournament):
+    model, t = tournament
+    with pytest.raises(ValueError):
+        model.edit_participant(-1, "Nessuno")
+    participant = t.participants[0]
+    model.edit_participant(participant.id, "Rinominato")
+    model.release_session()
+    assert model.get_participant_name(participant.id) == "Rinominato"
+
+
+def test_scoring_engine_shared_with_worker_threads(tournament):
+    # I thread dei report leggono il motore mentre la GUI lo aggiorna o lo scarta
+    model, t = tournament
+    rounds = [r.id for r in model.get_rounds(t.id)]
+    errors = []
+
+    def read_scores():
+        try:
+            for _ in range(20):
+                for round_id in rounds:
+                    model.calculate_round_scores(round_id)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            model.release_session()
+
+    workers = [threading.Thread(target=read_scores) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for i in range(20):
+        model.add_participant(t.id, f"Partecipante extra {i}")
+        if i % 5 == 0:
+            model.invalidate_scoring_engine()
+    for worker in workers:
+        worker.join()
+
+    assert errors == []
+    assert model.get_scoring_engine(t.id).totals() == model.get_tournament_standings(t.id)
@@ -0,0 +1,43 @@
+import time
+import pytest
+from PyQt6.QtCore import QCoreApplication
+from utils.update_coalescer import UpdateCoalescer
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def process_events_for(app, seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        app.processEvents()
+
+
+def test_marks_are_flushed_once_per_tick(app):
+    updates = UpdateCoalescer()
+    emitted = []
+    for value in range(50):
+        updates.mark_dirty('standings', lambda value=value: emitted.append(('standings', value)))
+        updates.mark_dirty('results', lambda: emitted.append(('results', None)))
+    assert emitted == []
+
+    process_events_for(app, 0.05)
+    # Una sola emissione per vista, con l'ultimo stato segnato
+    assert emitted == [('standings', 49), ('results', None)]
+
+
+def test_batch_defers_flush_until_outermost_end(app):
+    updates = UpdateCoalescer()
+    emitted = []
+    with updates.batch():
+        with updates.batch():
+            updates.mark_dirty('matches', lambda: emitted.append('matches'))
+        process_events_for(app, 0.05)
+        assert emitted == []
+        updates.mark_dirty('matches', lambda: emitted.append('matches'))
+    assert emitted == ['matches']
+
+    process_events_for(app, 0.05)
+    assert emitted == ['matches']
@@ -9,7 +9,7 @@ class AutoSave:
 
     def save(self):
         try:
-            self.model.session.commit()
+            self.model.save_changes()
             print("Salvataggio automatico completato")
         except Exception as e:
             print(f"Errore durante il salvataggio automatico: {str(e)}")
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import logging
+from datetime import datetime, timedelta
+from .custom_exceptions import DatabaseError
+
+_id_lock = threading.Lock()
+_last_id_time = None
+_store_locks = {}
+
+
+def new_snapshot_id():
+    # Id ordinabili e unici nel processo: data e ora al microsecondo, sempre crescenti anche
+    # se due backup partono nello stesso istante
+    global _last_id_time
+    with _id_lock:
+        now = datetime.now()
+        if _last_id_time is not None and now <= _last_id_time:
+            now = _last_id_time + timedelta(microseconds=1)
+        _last_id_time = now
+        return now.strftime("%Y%m%d_%H%M%S_%f")
+
+
+def _lock_for(store_dir):
+    # Un solo lock per cartella, condiviso da tutte le istanze che usano lo stesso archivio
+    with _id_lock:
+        return _store_locks.setdefault(os.path.realpath(store_dir), threading.RLock())
+
+
+class BackupStore:
+    # Archivio incrementale dei backup: il file del database viene diviso in blocchi di pagine,
+    # ogni blocco è salvato compresso e indirizzato dal suo hash SHA-256. Uno snapshot è solo
+    # l'elenco ordinato degli hash, quindi ogni nuovo snapshot scrive solo i blocchi cambiati.
+    def __init__(self, store_dir, pages_per_chunk=16, compression_level=6):
+        self.store_dir = store_dir
+        self.chunks_dir = os.path.join(store_dir, "chunks")
+        self.snapshots_dir = os.path.join(store_dir, "snapshots")
+        self.pages_per_chunk = pages_per_chunk
+        self.compression_level = compression_level
+        self.logger = logging.getLogger(__name__)
+        # Scrittura di uno snapshot (blocchi + manifest), pulizia e ripristino sono mutuamente
+        # esclusivi: prune non deve mai vedere blocchi di uno snapshot senza ancora il manifest
+        self.lock = _lock_for(store_dir)
+
+        os.makedirs(self.chunks_dir, exist_ok=True)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+        self.remove_orphaned_files()
+
+    def remove_orphaned_files(self):
+        # Uno snapshot interrotto (es. chiusura forzata) lascia file .tmp e blocchi senza manifest
+        with self.lock:
+            for directory, _, filenames in os.walk(self.store_dir):
+                for filename in filenames:
+                    if filename.endswith(".tmp"):
+                        os.remove(os.path.join(directory, filename))
+                        self.logger.warning(f"File temporaneo di un backup interrotto rimosso: {filename}")
+            self._remove_unreferenced_chunks([s['id'] for s in self.list_snapshots()])
+
+    def create_snapshot(self, db_copy_path, snapshot_id=None):
+        # db_copy_path deve essere una copia consistente e non in uso (es. prodotta con l'API di backup)
+        with self.lock:
+            return self._create_snapshot(db_copy_path, snapshot_id or new_snapshot_id())
+
+    def _create_snapshot(self, db_copy_path, snapshot_id):
+        if os.path.exists(self._manifest_path(snapshot_id)):
+            raise DatabaseError(f"Lo snapshot {snapshot_id} esiste già")
+        start_time = time.perf_counter()
+        page_size = self._page_size(db_copy_path)
+        chunk_size = page_size * self.pages_per_chunk
+
+        chunks = []
+        new_chunks = 0
+        stored_bytes = 0
+        db_size = 0
+        with open(db_copy_path, "rb") as db_file:
+            while True:
+                data = db_file.read(chunk_size)
+                if not data:
+                    break
+                db_size += len(data)
+                digest = hashlib.sha256(data).hexdigest()
+                chunks.append(digest)
+                written = self._write_chunk(digest, data)
+                if written:
+                    new_chunks += 1
+                    stored_bytes += written
+
+        manifest = {
+            'id': snapshot_id,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'page_size': page_size,
+            'pages_per_chunk': self.pages_per_chunk,
+            'db_size': db_size,
+            'chunks': chunks,
+            'new_chunks': new_chunks,
+            'stored_bytes': stored_bytes,
+            'duration': round(time.perf_counter() - start_time, 3),
+        }
+        self._write_json(self._manifest_path(snapshot_id), manifest)
+        self.logger.info(f"Snapshot {snapshot_id}: {new_chunks}/{len(chunks)} blocchi nuovi, {stored_bytes} byte scritti")
+        return manifest
+
+    def restore_snapshot(self, snapshot_id, target_path):
+        with self.lock:
+            manifest = self.get_snapshot(snapshot_id)
+            with open(target_path, "wb") as target:
+                for digest in manifest['chunks']:
+                    target.write(self._read_chunk(digest))
+
+    def get_snapshot(self, snapshot_id):
+        path = self._manifest_path(snapshot_id)
+        if not os.path.exists(path):
+            raise DatabaseError(f"Lo snapshot {snapshot_id} non esiste")
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def list_snapshots(self):
+        snapshots = []
+        for filename in sorted(os.listdir(self.snapshots_dir), reverse=True):
+            if filename.endswith(".json"):
+                manifest = self.get_snapshot(filename[:-len(".json")])
+                manifest.pop('chunks')
+                snapshots.append(manifest)
+        return snapshots
+
+    def prune(self, keep):
+        with self.lock:
+            self._prune(keep)
+
+    def _prune(self, keep):
+        # Mantiene gli ultimi `keep` snapshot ed elimina i blocchi non più referenziati
+        snapshot_ids = [s['id'] for s in self.list_snapshots()]
+        for snapshot_id in snapshot_ids[keep:]:
+            os.remove(self._manifest_path(snapshot_id))
+            self.logger.info(f"Snapshot vecchio rimosso: {snapshot_id}")
+
+        self._remove_unreferenced_chunks(snapshot_ids[:keep])
+
+    def _remove_unreferenced_chunks(self, snapshot_ids):
+        referenced = set()
+        for snapshot_id in snapshot_ids:
+            referenced.update(self.get_snapshot(snapshot_id)['chunks'])
+        for prefix in os.listdir(self.chunks_dir):
+            prefix_dir = os.path.join(self.chunks_dir, prefix)
+            for digest in os.listdir(prefix_dir):
+                if digest not in referenced:
+                    os.remove(os.path.join(prefix_dir, digest))
+
+    def _page_size(self, db_path):
+        connection = sqlite3.connect(db_path)
+        try:
+            return connection.execute("PRAGMA page_size").fetchone()[0]
+        finally:
+            connection.close()
+
+    def _chunk_path(self, digest):
+        return os.path.join(self.chunks_dir, digest[:2], digest)
+
+    def _manifest_path(self, snapshot_id):
+        return os.path.join(self.snapshots_dir, f"{snapshot_id}.json")
+
+    def _write_chunk(self, digest, data):
+        path = self._chunk_path(digest)
+        if os.path.exists(path):
+            return 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        compressed = zlib.compress(data, self.compression_level)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(temp_path, path)
+        return len(compressed)
+
+    def _read_chunk(self, digest):
+        with open(self._chunk_path(digest), "rb") as f:
+            data = zlib.decompress(f.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise DatabaseError(f"Blocco di backup corrotto: {digest}")
+        return data
+
+    def _write_json(self, path, data):
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
@@ -1,31 +1,158 @@
 import csv
+import itertools
+from functools import lru_cache
 from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Image
-from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph, Image
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from io import BytesIO
 from .custom_exceptions import ExportError
 
+# Righe scritte per blocco e dimensione del buffer di scrittura dei CSV
+CSV_CHUNK_SIZE = 1000
+CSV_BUFFER_SIZE = 1024 * 1024
+
+# Righe per tabella nei PDF e limiti per l'adattamento alle tabelle larghe
+PDF_CHUNK_SIZE = 200
+PDF_PORTRAIT_MAX_COLUMNS = 8
+PDF_MIN_FONT_SIZE = 5
+PDF_MAX_FONT_SIZE = 12
+
+# Colonne dell'esportazione Parquet dei pronostici (vedi TournamentModel.iter_prediction_batches):
+# "categoria" indica le stringhe ripetute (squadre, nomi, esiti) salvate con codifica a dizionario
+PREDICTION_PARQUET_COLUMNS = [
+    ('torneo_id', 'int32'), ('torneo', 'categoria'), ('anno', 'int16'), ('giornata', 'int16'),
+    ('data_giornata', 'data'), ('partita_id', 'int32'), ('squadra_casa', 'categoria'),
+    ('squadra_trasferta', 'categoria'), ('risultato', 'categoria'), ('partecipante_id', 'int32'),
+    ('partecipante', 'categoria'), ('pronostico', 'categoria'),
+]
+
+
+# Stili dei PDF creati una sola volta e riusati da tutte le tabelle e le esportazioni
+
+@lru_cache(maxsize=None)
+def _paragraph_styles():
+    return getSampleStyleSheet()
+
+
+@lru_cache(maxsize=None)
+def _header_cell_style(font_size):
+    return ParagraphStyle('IntestazioneTabella', parent=_paragraph_styles()['Normal'], fontName='Helvetica-Bold',
+                          fontSize=font_size + 2, leading=font_size + 4, textColor=colors.whitesmoke,
+                          alignment=1)
+
+
+@lru_cache(maxsize=None)
+def _table_style(font_size):
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), font_size),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), font_size),
+        ('TOPPADDING', (0, 1), (-1, -1), font_size // 2),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), font_size // 2),
+        ('GRID', (0, 0), (-1, -1), 1 if font_size >= 10 else 0.5, colors.black)
+    ])
+
+class _LazyFlowables(list):
+    # Lista di flowable riempita a richiesta per doc.build, che consuma gli elementi dalla testa
+    # (len, [0], del [0] e reinserimento delle parti divise): la tabella successiva si costruisce
+    # solo quando le precedenti sono state disegnate e rimosse, quindi in memoria restano al più
+    # un paio di blocchi di righe
+    def __init__(self, head, more):
+        super().__init__(head)
+        self.more = more
+
+    def __len__(self):
+        # Due elementi in testa: handle_keepWithNext può guardare anche il secondo
+        while self.more is not None and list.__len__(self) < 2:
+            following = next(self.more, None)
+            if following is None:
+                self.more = None
+            else:
+                self.append(following)
+        return list.__len__(self)
+
+
 class DataExporter:
     @staticmethod
-    def export_to_csv(data, filename):
+    def standings_to_records(standings):
+        # Converte le righe di TournamentModel.get_standings nel formato tabellare delle esportazioni
+        return [{"Posizione": row['position'], "Partecipante": row['name'], "Punteggio": row['score']}
+                for row in standings]
+
+    @staticmethod
+    def export_to_csv(data, filename, header=None, chunk_size=CSV_CHUNK_SIZE):
+        # data può essere una lista o un qualsiasi iterabile (generatore, risultato di una query con
+        # yield_per) di dizionari oppure di tuple/Row; le righe vengono scritte a blocchi di
+        # chunk_size senza mai materializzare l'intero insieme. Senza header l'intestazione
+        # si ricava dalla prima riga
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            rows = iter(data)
+            first = next(rows, None)
+            with open(filename, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as csvfile:
                 writer = csv.writer(csvfile)
-                writer.writerow(data[0].keys())  # Write header
-                for row in data:
-                    writer.writerow(row.values())
+                if first is None:
+                    if header:
+                        writer.writerow(header)
+                    return
+                is_dict = isinstance(first, dict)
+                if header is None:
+                    header = list(first.keys()) if is_dict else list(getattr(first, '_fields', []))
+                if header:
+                    writer.writerow(header)
+
+                rows = itertools.chain([first], rows)
+                if is_dict:
+                    rows = (row.values() for row in rows)
+                while True:
+                    chunk = list(itertools.islice(rows, chunk_size))
+                    if not chunk:
+                        break
+                    writer.writerows(chunk)
         except Exception as e:
             raise ExportError(f"Errore durante l'esportazione in CSV: {str(e)}")
 
     @staticmethod
-    def export_to_pdf(data, filename, title, image_buffer=None):
+    def export_dataframe_to_csv(df, filename):
+        # Le righe del DataFrame si scrivono come tuple, senza convertirle in una lista di dizionari
+        DataExporter.export_to_csv(df.itertuples(index=False, name=None), filename, header=list(df.columns))
+
+    @staticmethod
+    def export_to_pdf(data, filename, title, image_buffer=None, header=None, chunk_size=PDF_CHUNK_SIZE):
+        # Come export_to_csv accetta liste o iterabili di dizionari o tuple. Le righe sono divise in
+        # blocchi di chunk_size e ogni blocco diventa una LongTable con l'intestazione ripetuta
+        # su ogni pagina; le larghezze delle colonne sono fisse, così reportlab non deve misurare
+        # ogni cella. Le tabelle con molte colonne usano la pagina orizzontale e un font più piccolo.
+        # Le tabelle sono prodotte da un generatore e passate a doc.build con _LazyFlowables: le righe
+        # si leggono man mano che le pagine vengono disegnate. Resta in memoria, fino al salvataggio,
+        # solo il contenuto già impaginato del PDF
         try:
-            doc = SimpleDocTemplate(filename, pagesize=letter)
-            elements = []
+            rows = iter(data)
+            first = next(rows, None)
+            if header is None:
+                if first is None:
+                    header = []
+                elif isinstance(first, dict):
+                    header = list(first.keys())
+                else:
+                    header = list(getattr(first, '_fields', []))
+            if first is not None:
+                rows = itertools.chain([first], rows)
+                if isinstance(first, dict):
+                    rows = (list(row.values()) for row in rows)
+
+            num_columns = len(header) or (len(first) if first is not None else 1)
+            pagesize = landscape(letter) if num_columns > PDF_PORTRAIT_MAX_COLUMNS else letter
+            doc = SimpleDocTemplate(filename, pagesize=pagesize)
+            column_width = doc.width / num_columns
+            font_size = max(PDF_MIN_FONT_SIZE, min(PDF_MAX_FONT_SIZE, int(column_width / 4)))
 
-            styles = getSampleStyleSheet()
-            elements.append(Paragraph(title, styles['Title']))
+            elements = [Paragraph(title, _paragraph_styles()['Title'])]
 
             if image_buffer:
                 img = Image(image_buffer)
@@ -33,38 +160,64 @@ class DataExporter:
                 img.drawWidth = 500
                 elements.append(img)
 
-            table_data = [list(data[0].keys())]  # Header
-            for row in data:
-                table_data.append(list(row.values()))
-
-            table = Table(table_data)
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 14),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 12),
-                ('TOPPADDING', (0, 1), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-
-            elements.append(table)
-            doc.build(elements)
+            header_style = _header_cell_style(font_size)
+            header_row = [Paragraph(str(column), header_style) for column in header]
+            table_style = _table_style(font_size)
+            column_widths = [column_width] * num_columns
+
+            def tables():
+                num_tables = 0
+                while True:
+                    chunk = [list(row) for row in itertools.islice(rows, chunk_size)]
+                    # Senza righe si scrive comunque la sola intestazione
+                    if chunk or (num_tables == 0 and header_row):
+                        table = LongTable(([header_row] if header_row else []) + chunk,
+                                          colWidths=column_widths, repeatRows=1 if header_row else 0)
+                        table.setStyle(table_style)
+                        num_tables += 1
+                        yield table
+                    if len(chunk) < chunk_size:
+                        return
+
+            doc.build(_LazyFlowables(elements, tables()))
         except Exception as e:
             raise ExportError(f"Errore durante l'esportazione in PDF: {str(e)}")
 
+    @staticmethod
+    def export_to_parquet(batches, filename, columns=PREDICTION_PARQUET_COLUMNS, compression='zstd'):
+        # batches: iterabile di dizionari colonna -> lista di valori (uno per giornata); ogni blocco
+        # diventa un row group del file, quindi in memoria c'è un solo blocco alla volta.
+        # pyarrow è una dipendenza opzionale, richiesta solo da questa esportazione
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ExportError("L'esportazione in Parquet richiede pyarrow (pip install pyarrow)")
+
+        types = {
+            'int16': pa.int16(),
+            'int32': pa.int32(),
+            'data': pa.date32(),
+            'categoria': pa.dictionary(pa.int32(), pa.string()),
+        }
+        schema = pa.schema([(name, types[type_name]) for name, type_name in columns])
+        try:
+            with pq.ParquetWriter(filename, schema, compression=compression) as writer:
+                for batch in batches:
+                    writer.write_batch(pa.record_batch(
+                        [pa.array(batch[field.name], type=field.type) for field in schema], schema=schema
+                    ))
+        except Exception as e:
+            raise ExportError(f"Errore durante l'esportazione in Parquet: {str(e)}")
+
     @staticmethod
     def export_participant_performance(df, img_buffer, filename):
         try:
-            DataExporter.export_to_csv(df.reset_index().to_dict('records'), filename + '.csv')
-            DataExporter.export_to_pdf(df.reset_index().to_dict('records'), filename + '.pdf', 'Prestazioni dei Partecipanti', img_buffer)
+            table = df.reset_index()
+            DataExporter.export_dataframe_to_csv(table, filename + '.csv')
+            DataExporter.export_to_pdf(table.itertuples(index=False, name=None), filename + '.pdf',
+                                       'Prestazioni dei Partecipanti', img_buffer, header=list(table.columns))
+            return [filename + '.csv', filename + '.pdf']
         except Exception as e:
             raise ExportError(f"Errore durante l'esportazione delle prestazioni dei partecipanti: {str(e)}")
 
@@ -74,29 +227,54 @@ class DataExporter:
             data = [{'Squadra': team, 'Numero di Pronostici': count} for team, count in series.items()]
             DataExporter.export_to_csv(data, filename + '.csv')
             DataExporter.export_to_pdf(data, filename + '.pdf', 'Squadre più Pronosticate', img_buffer)
+            return [filename + '.csv', filename + '.pdf']
         except Exception as e:
             raise ExportError(f"Errore durante l'esportazione delle squadre più pronosticate: {str(e)}")
 
     @staticmethod
     def export_weekly_prizes(df, img_buffer, filename):
         try:
-            DataExporter.export_to_csv(df.to_dict('records'), filename + '.csv')
+            DataExporter.export_dataframe_to_csv(df, filename + '.csv')
             DataExporter.export_to_pdf(df.to_dict('records'), filename + '.pdf', 'Premi Settimanali Assegnati', img_buffer)
+            return [filename + '.csv', filename + '.pdf']
         except Exception as e:
             raise ExportError(f"Errore durante l'esportazione dei premi settimanali: {str(e)}")
 
     @staticmethod
     def export_final_standings(df, img_buffer, filename):
         try:
-            DataExporter.export_to_csv(df.to_dict('records'), filename + '.csv')
+            DataExporter.export_dataframe_to_csv(df, filename + '.csv')
             DataExporter.export_to_pdf(df.to_dict('records'), filename + '.pdf', 'Classifica Finale del Torneo', img_buffer)
+            return [filename + '.csv', filename + '.pdf']
         except Exception as e:
             raise ExportError(f"Errore durante l'esportazione della classifica finale: {str(e)}")
 
     @staticmethod
-    def export_tournament_summary(summary, filename):
+    def export_prediction_accuracy(accuracy, results, img_buffer, filename):
+        try:
+            data = [{'Pronostico': outcome, 'Numero di Pronostici': count} for outcome, count in results.items()]
+            DataExporter.export_to_csv(data, filename + '.csv')
+            DataExporter.export_to_pdf(data, filename + '.pdf', f'Accuratezza dei Pronostici: {accuracy:.2%}', img_buffer)
+            return [filename + '.csv', filename + '.pdf']
+        except Exception as e:
+            raise ExportError(f"Errore durante l'esportazione dell'accuratezza dei pronostici: {str(e)}")
+
+    @staticmethod
+    def export_team_performance(df, img_buffer, filename):
+        try:
+            data = [{'Squadra': team, 'Vittorie': row['wins'], 'Pareggi': row['draws'], 'Sconfitte': row['losses'],
+                     'Percentuale di Vittorie': f"{row['win_rate']:.2%}"} for team, row in df.iterrows()]
+            DataExporter.export_to_csv(data, filename + '.csv')
+            DataExporter.export_to_pdf(data, filename + '.pdf', 'Prestazioni delle Squadre', img_buffer)
+            return [filename + '.csv', filename + '.pdf']
+        except Exception as e:
+            raise ExportError(f"Errore durante l'esportazione delle prestazioni delle squadre: {str(e)}")
+
+    @staticmethod
+    def export_tournament_summary(summary, img_buffer, filename):
         try:
             DataExporter.export_to_csv([summary], filename + '.csv')
-            DataExporter.export_to_pdf([summary], filename + '.pdf', 'Riepilogo del Torneo')
+            DataExporter.export_to_pdf([summary], filename + '.pdf', 'Riepilogo del Torneo', img_buffer)
+            return [filename + '.csv', filename + '.pdf']
         except Exception as e:
             raise ExportError(f"Errore durante l'esportazione del riepilogo del torneo: {str(e)}")
\ No newline at end of file
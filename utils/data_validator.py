@@ -56,6 +56,18 @@ class DataValidator:
         if prediction not in valid_predictions:
             raise ValidationError("Il pronostico deve essere '1', 'X' o '2'.")
 
+    @staticmethod
+    def validate_prediction_sheets(sheets, match_ids, participant_ids):
+        # sheets: {participant_id: {match_id: pronostico}} per una giornata (None = pronostico cancellato)
+        for participant_id, predictions in sheets.items():
+            if participant_id not in participant_ids:
+                raise ValidationError("Partecipante non valido per questo torneo.")
+            for match_id, prediction in predictions.items():
+                if match_id not in match_ids:
+                    raise ValidationError("La partita non appartiene alla giornata corrente.")
+                if prediction is not None:
+                    DataValidator.validate_prediction(prediction)
+
     @staticmethod
     def validate_match_result(result):
         valid_results = ["1", "X", "2", "Sospesa", "Posticipata", "Rinviata", "Annullata"]
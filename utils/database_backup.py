@@ -1,72 +1,188 @@
-import shutil
+import sqlite3
 import os
 from datetime import datetime
-import schedule
-import time
 import threading
 import logging
 from .custom_exceptions import DatabaseError
+from .backup_store import BackupStore, new_snapshot_id
 
 class DatabaseBackup:
-    def __init__(self, db_path, backup_dir):
+    def __init__(self, db_path, backup_dir, pages_per_step=256, step_sleep=0.005, keep_snapshots=168,
+                 on_complete=None):
         self.db_path = db_path
         self.backup_dir = backup_dir
-        self.scheduler = schedule.Scheduler()
+        # Copia online a blocchi di pagine: tra un blocco e l'altro il database resta libero per chi scrive
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.keep_snapshots = keep_snapshots
+        # on_complete(snapshot_id, errore o None) viene chiamata dal thread del backup a fine lavoro
+        self.on_complete = on_complete
+        self.scheduler = None
         self.scheduler_thread = None
+        self.scheduler_stop = threading.Event()
+        self.pending_backups = []
+        self.pending_lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
 
         if not os.path.exists(self.backup_dir):
             os.makedirs(self.backup_dir)
+        self.remove_orphaned_files()
+        # Snapshot incrementali: vengono scritti solo i blocchi di pagine cambiati dal precedente
+        self.store = BackupStore(os.path.join(self.backup_dir, "store"))
+
+    def remove_orphaned_files(self):
+        # Copie temporanee rimaste da un backup o un ripristino interrotti (es. chiusura forzata)
+        for filename in os.listdir(self.backup_dir):
+            if filename.endswith(".db") and filename.startswith(("staging_", "restore_")):
+                os.remove(os.path.join(self.backup_dir, filename))
+                self.logger.warning(f"Copia temporanea di un backup interrotto rimossa: {filename}")
 
     def backup(self):
+        # Copia, verifica, archiviazione e pulizia girano tutte su un thread di lavoro: chi chiama
+        # (la GUI a fine giornata o lo scheduler) non resta bloccato. Il thread non è daemon:
+        # wait_for_backups (chiamato da shutdown) lo lascia terminare prima dell'uscita
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_filename = f"tournament_backup_{timestamp}.db"
-            backup_path = os.path.join(self.backup_dir, backup_filename)
-            
-            shutil.copy2(self.db_path, backup_path)
-            self.logger.info(f"Backup creato: {backup_path}")
-
-            # Rimuovi i backup più vecchi se ce ne sono più di 5
-            self.cleanup_old_backups()
+            snapshot_id = new_snapshot_id()
+            worker = threading.Thread(target=self.run_backup, args=(snapshot_id,),
+                                      name=f"backup-{snapshot_id}")
+            with self.pending_lock:
+                self.pending_backups = [t for t in self.pending_backups if t.is_alive()] + [worker]
+            worker.start()
+            return snapshot_id
         except Exception as e:
             self.logger.error(f"Errore durante il backup: {str(e)}")
             raise DatabaseError(f"Impossibile creare il backup: {str(e)}")
 
+    def run_backup(self, snapshot_id):
+        staging_path = os.path.join(self.backup_dir, f"staging_{snapshot_id}.db")
+        error = None
+        try:
+            self.copy_database(self.db_path, staging_path)
+            self.logger.info(f"Copia consistente creata: {staging_path}")
+            error = self.verify_and_store(staging_path, snapshot_id)
+        except Exception as e:
+            error = str(e)
+            self.logger.error(f"Errore durante il backup {snapshot_id}: {error}")
+        finally:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+        if self.on_complete:
+            self.on_complete(snapshot_id, error)
+
+    def wait_for_backups(self, timeout=None):
+        with self.pending_lock:
+            pending = list(self.pending_backups)
+        for worker in pending:
+            worker.join(timeout)
+        return not any(worker.is_alive() for worker in pending)
+
+    def shutdown(self):
+        # Alla chiusura dell'applicazione: niente nuovi backup programmati e attesa di quelli in corso
+        self.stop_scheduled_backup()
+        self.wait_for_backups()
+
+    def copy_database(self, source_path, target_path):
+        # API di backup online di SQLite: copia consistente anche con transazioni in corso
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(target_path)
+        try:
+            source.backup(target, pages=self.pages_per_step, sleep=self.step_sleep)
+        finally:
+            target.close()
+            source.close()
+
+    def verify_backup(self, backup_path):
+        connection = sqlite3.connect(backup_path)
+        try:
+            result = connection.execute("PRAGMA integrity_check").fetchone()
+            return result is not None and result[0] == "ok"
+        finally:
+            connection.close()
+
+    def verify_and_store(self, staging_path, snapshot_id):
+        # Restituisce None se lo snapshot è stato archiviato, altrimenti il messaggio di errore
+        try:
+            if self.verify_backup(staging_path):
+                self.store.create_snapshot(staging_path, snapshot_id)
+                self.logger.info(f"Backup verificato e archiviato: {snapshot_id}")
+                # Solo dopo aver archiviato la nuova copia verificata rimuoviamo quelle più vecchie
+                self.store.prune(self.keep_snapshots)
+                self.cleanup_old_backups()
+                return None
+            self.logger.error(f"Backup corrotto, scartato: {snapshot_id}")
+            return "la copia non supera il controllo di integrità"
+        except Exception as e:
+            self.logger.error(f"Errore durante la verifica del backup {snapshot_id}: {str(e)}")
+            return str(e)
+        finally:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+
     def cleanup_old_backups(self):
+        # Copie complete create dalle versioni precedenti
         backups = sorted([f for f in os.listdir(self.backup_dir) if f.startswith("tournament_backup_")], reverse=True)
         for old_backup in backups[5:]:  # Mantieni solo i 5 backup più recenti
             os.remove(os.path.join(self.backup_dir, old_backup))
             self.logger.info(f"Backup vecchio rimosso: {old_backup}")
 
     def start_scheduled_backup(self, interval_hours=24):
+        import schedule
+        self.scheduler = schedule.Scheduler()
         self.scheduler.every(interval_hours).hours.do(self.backup)
+        self.scheduler_stop.clear()
         self.scheduler_thread = threading.Thread(target=self.run_scheduler, daemon=True)
         self.scheduler_thread.start()
         self.logger.info(f"Backup programmato ogni {interval_hours} ore")
 
     def run_scheduler(self):
-        while True:
+        while not self.scheduler_stop.wait(1):
             self.scheduler.run_pending()
-            time.sleep(1)
 
     def stop_scheduled_backup(self):
         if self.scheduler_thread:
             self.scheduler.clear()
+            self.scheduler_stop.set()
             self.scheduler_thread.join()
+            self.scheduler_thread = None
             self.logger.info("Backup programmato fermato")
 
-    def restore_from_backup(self, backup_file):
+    def restore_from_backup(self, backup_id):
+        # backup_id è l'id di uno snapshot oppure il nome di una vecchia copia completa (.db)
+        staging_path = os.path.join(self.backup_dir, f"restore_{backup_id}.db")
+        # Un backup ancora in corso non deve copiare il database mentre viene sovrascritto
+        self.wait_for_backups()
         try:
-            backup_path = os.path.join(self.backup_dir, backup_file)
-            if not os.path.exists(backup_path):
-                raise DatabaseError(f"Il file di backup {backup_file} non esiste")
+            backup_path = os.path.join(self.backup_dir, backup_id)
+            if not (backup_id.endswith(".db") and os.path.exists(backup_path)):
+                self.store.restore_snapshot(backup_id, staging_path)
+                backup_path = staging_path
             
-            shutil.copy2(backup_path, self.db_path)
-            self.logger.info(f"Database ripristinato dal backup: {backup_file}")
+            if not self.verify_backup(backup_path):
+                raise DatabaseError(f"Il backup {backup_id} non supera il controllo di integrità")
+            self.copy_database(backup_path, self.db_path)
+            self.logger.info(f"Database ripristinato dal backup: {backup_id}")
         except Exception as e:
             self.logger.error(f"Errore durante il ripristino del backup: {str(e)}")
             raise DatabaseError(f"Impossibile ripristinare dal backup: {str(e)}")
+        finally:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
 
     def list_backups(self):
-        return sorted([f for f in os.listdir(self.backup_dir) if f.startswith("tournament_backup_")], reverse=True)
\ No newline at end of file
+        # Dal più recente: snapshot dell'archivio (id, data, dimensione del database, byte scritti e
+        # durata) e copie complete .db delle versioni precedenti, ripristinabili con il loro nome
+        backups = self.store.list_snapshots() + self.list_legacy_backups()
+        return sorted(backups, key=lambda b: b['created'], reverse=True)
+
+    def list_legacy_backups(self):
+        backups = []
+        for filename in os.listdir(self.backup_dir):
+            path = os.path.join(self.backup_dir, filename)
+            if filename.startswith("tournament_backup_") and filename.endswith(".db"):
+                backups.append({
+                    'id': filename,
+                    'created': datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec='seconds'),
+                    'db_size': os.path.getsize(path),
+                    'legacy': True,
+                })
+        return backups
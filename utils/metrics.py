@@ -0,0 +1,184 @@
+import functools
+import json
+import threading
+import time
+import logging
+from bisect import bisect_left
+from sqlalchemy import event
+
+# Limiti superiori dei bucket degli istogrammi (l'ultimo bucket raccoglie tutto il resto)
+TIME_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+QUERY_BUCKETS = [0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500, 1000]
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, fraction):
+        # Stima: limite superiore del bucket che contiene il percentile richiesto
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for limit, count in zip(self.buckets + [self.max], self.counts):
+            seen += count
+            if seen >= target:
+                return round(min(limit, self.max), 3)
+        return round(self.max, 3)
+
+    def as_dict(self):
+        labels = [f"<={limit}" for limit in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            'count': self.count,
+            'sum': round(self.total, 3),
+            'mean': round(self.total / self.count, 3) if self.count else None,
+            'min': None if self.min is None else round(self.min, 3),
+            'max': None if self.max is None else round(self.max, 3),
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'buckets': {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+
+class ActionMetrics:
+    def __init__(self):
+        self.wall_ms = Histogram(TIME_BUCKETS_MS)
+        self.sql_ms = Histogram(TIME_BUCKETS_MS)
+        self.queries = Histogram(QUERY_BUCKETS)
+
+    def as_dict(self):
+        return {'wall_ms': self.wall_ms.as_dict(), 'sql_ms': self.sql_ms.as_dict(), 'queries': self.queries.as_dict()}
+
+
+class _ActionScope:
+    def __init__(self, name):
+        self.name = name
+        self.queries = 0
+        self.sql_time = 0.0
+        self.start_time = time.perf_counter()
+
+
+class MetricsRegistry:
+    # Registro delle metriche per azione (query SQL, tempo SQL e tempo totale) con istogrammi.
+    # Le query vengono attribuite a tutte le azioni aperte nel thread corrente, quindi un'azione
+    # che ne chiama un'altra include anche le query di quest'ultima
+    def __init__(self):
+        self.actions = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._instrumented_engines = set()
+        self.logger = logging.getLogger(__name__)
+
+    def _scopes(self):
+        if not hasattr(self._local, 'scopes'):
+            self._local.scopes = []
+        return self._local.scopes
+
+    def instrument_engine(self, engine):
+        # Conta le query e il loro tempo tramite gli eventi del motore SQLAlchemy
+        if id(engine) in self._instrumented_engines:
+            return
+        self._instrumented_engines.add(id(engine))
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            self._local.query_start = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            scopes = self._scopes()
+            if not scopes:
+                return
+            elapsed = time.perf_counter() - getattr(self._local, 'query_start', time.perf_counter())
+            for scope in scopes:
+                scope.queries += 1
+                scope.sql_time += elapsed
+
+    def begin(self, name):
+        scope = _ActionScope(name)
+        self._scopes().append(scope)
+        return scope
+
+    def end(self, scope):
+        wall_time = time.perf_counter() - scope.start_time
+        self._scopes().remove(scope)
+        self.record(scope.name, wall_time, scope.queries, scope.sql_time)
+        return scope
+
+    def action(self, name):
+        return _ActionContext(self, name)
+
+    def record(self, name, wall_time, queries=0, sql_time=0.0):
+        with self._lock:
+            metrics = self.actions.get(name)
+            if metrics is None:
+                metrics = self.actions[name] = ActionMetrics()
+            metrics.wall_ms.observe(wall_time * 1000)
+            metrics.sql_ms.observe(sql_time * 1000)
+            metrics.queries.observe(queries)
+
+    def snapshot(self):
+        with self._lock:
+            return {name: metrics.as_dict() for name, metrics in sorted(self.actions.items())}
+
+    def dump(self, filename=None):
+        # Senza filename il riepilogo finisce nel log
+        snapshot = self.snapshot()
+        if filename:
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=2)
+        else:
+            for name, metrics in snapshot.items():
+                self.logger.info(f"{name}: {metrics['wall_ms']['count']} chiamate, "
+                                 f"query medie {metrics['queries']['mean']}, massime {metrics['queries']['max']}, "
+                                 f"tempo medio {metrics['wall_ms']['mean']} ms (SQL {metrics['sql_ms']['mean']} ms)")
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            self.actions.clear()
+
+
+class _ActionContext:
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+        self.scope = None
+
+    def __enter__(self):
+        self.scope = self.registry.begin(self.name)
+        return self.scope
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.registry.end(self.scope)
+        return False
+
+
+# Registro condiviso dall'applicazione
+metrics_registry = MetricsRegistry()
+
+
+def tracked_action(name=None):
+    # Decoratore per le azioni del ViewModel: registra query, tempo SQL e tempo totale
+    def decorator(func):
+        action_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with metrics_registry.action(action_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,74 @@
+import itertools
+import logging
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class PageLoaderSignals(QObject):
+    loaded = pyqtSignal(str, int, object)   # (pagina, richiesta, dati)
+    failed = pyqtSignal(str, int, str)      # (pagina, richiesta, messaggio)
+
+
+class PageLoadJob(QRunnable):
+    # Lettura dei dati di una pagina fuori dal thread della GUI; il risultato arriva alla GUI
+    # tramite connessione in coda
+    def __init__(self, page, request_id, fetch, model, signals):
+        super().__init__()
+        self.page = page
+        self.request_id = request_id
+        self.fetch = fetch
+        self.model = model
+        self.signals = signals
+        self.logger = logging.getLogger(__name__)
+
+    def run(self):
+        try:
+            self.signals.loaded.emit(self.page, self.request_id, self.fetch())
+        except Exception as e:
+            self.logger.error(f"Errore nel caricamento della pagina {self.page}: {str(e)}")
+            self.signals.failed.emit(self.page, self.request_id, str(e))
+        finally:
+            # Come per i report: la sessione del thread di lavoro va chiusa a fine lettura
+            self.model.release_session()
+
+
+class PageLoader(QObject):
+    # Carica in background i dati delle pagine e li consegna alla funzione populate sul thread della
+    # GUI. Per ogni pagina vale solo l'ultima richiesta: i risultati di richieste superate si scartano
+    failed = pyqtSignal(str, str)   # (pagina, messaggio)
+
+    def __init__(self, model, max_workers=1):
+        super().__init__()
+        self.model = model
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_workers)
+        self.pending = {}
+        self._ids = itertools.count(1)
+        self.signals = PageLoaderSignals()
+        self.signals.loaded.connect(self._on_loaded)
+        self.signals.failed.connect(self._on_failed)
+
+    def load(self, page, fetch, populate):
+        request_id = next(self._ids)
+        self.pending[page] = (request_id, populate)
+        self.pool.start(PageLoadJob(page, request_id, fetch, self.model, self.signals))
+        return request_id
+
+    def is_loading(self, page):
+        return page in self.pending
+
+    def wait_for_done(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+    def _on_loaded(self, page, request_id, data):
+        current_id, populate = self.pending.get(page, (None, None))
+        if current_id != request_id:
+            return
+        del self.pending[page]
+        populate(data)
+
+    def _on_failed(self, page, request_id, message):
+        current_id, _ = self.pending.get(page, (None, None))
+        if current_id != request_id:
+            return
+        del self.pending[page]
+        self.failed.emit(page, message)
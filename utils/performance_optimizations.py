@@ -1,7 +1,7 @@
 from sqlalchemy.orm import joinedload, subqueryload
-from sqlalchemy.sql import func
 import time
 import logging
+from .metrics import metrics_registry
 
 class PerformanceOptimizer:
     def __init__(self):
@@ -25,23 +25,12 @@ class PerformanceOptimizer:
             session.bulk_save_objects(objects[i:i+batch_size])
             session.commit()
 
-    @staticmethod
-    def calculate_standings_optimized(session, tournament_id):
-        return session.query(
-            Prediction.participant_id,
-            func.count(Prediction.id).label('correct_predictions')
-        ).join(Match).join(Round).filter(
-            Round.tournament_id == tournament_id,
-            Prediction.prediction == Match.result,
-            Match.result.in_(['1', 'X', '2'])
-        ).group_by(Prediction.participant_id).all()
-
     def time_function(self, func, *args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        execution_time = end_time - start_time
-        self.logger.info(f"Funzione {func.__name__} eseguita in {execution_time:.4f} secondi")
+        # La misura viene registrata anche in metrics_registry, con il numero di query eseguite
+        with metrics_registry.action(func.__name__) as scope:
+            result = func(*args, **kwargs)
+        execution_time = time.perf_counter() - scope.start_time
+        self.logger.info(f"Funzione {func.__name__} eseguita in {execution_time:.4f} secondi ({scope.queries} query)")
         return result
 
     @staticmethod
@@ -1,205 +1,370 @@
+import os
+import logging
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from io import BytesIO
 import seaborn as sns
-from .custom_exceptions import ValidationError
+from sqlalchemy import func
+from .custom_exceptions import ValidationError, ExportError
+from .data_exporter import DataExporter
+from models.database_schema import Tournament, Participant, Round, Match, Prediction, WeeklyPrize
+from models.tournament_model import SCORING_RESULTS
+
+logger = logging.getLogger(__name__)
+
+# I report sono divisi in due fasi: la lettura dei dati (ReportGenerator, sul database) e il
+# disegno (funzioni render_* a livello di modulo). I render_* ricevono solo strutture semplici
+# e picklabili, così possono girare anche in un processo separato. Ogni grafico è un oggetto
+# Figure indipendente (non lo stato globale di pyplot): più report si disegnano in parallelo.
+
+
+def _figure_to_png(fig):
+    img_buffer = BytesIO()
+    fig.savefig(img_buffer, format='png')
+    img_buffer.seek(0)
+    return img_buffer
+
+
+def _empty_figure(title, figsize=(10, 6)):
+    # Segnaposto per i report senza dati (nessuna giornata conclusa, nessun premio, ...):
+    # seaborn e matplotlib non sanno disegnare una tabella vuota
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+    ax.text(0.5, 0.5, 'Nessun dato disponibile', horizontalalignment='center',
+            verticalalignment='center', fontsize=14, transform=ax.transAxes)
+    ax.set_title(title)
+    ax.axis('off')
+    return _figure_to_png(fig)
+
+
+def _rotate_xticks(ax):
+    ax.tick_params(axis='x', labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+
+
+def render_participant_performance(data):
+    df = pd.DataFrame(
+        data['round_scores'].T,
+        index=pd.Index(data['participant_names'], name='Partecipante'),
+        columns=[f'Giornata {n}' for n in data['round_numbers']]
+    )
+
+    if df.empty:
+        return df, _empty_figure('Prestazioni dei Partecipanti per Giornata', figsize=(12, 6))
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    sns.heatmap(df, annot=True, cmap="YlGnBu", fmt="d", ax=ax)
+    ax.set_title('Prestazioni dei Partecipanti per Giornata')
+    fig.tight_layout()
+
+    return df, _figure_to_png(fig)
+
+
+def render_most_predicted_teams(data):
+    team_counts = pd.Series(data['team_prediction_counts'], dtype='int64').sort_values(ascending=False, kind='stable')
+    if team_counts.empty:
+        return team_counts, _empty_figure('Squadre più Pronosticate')
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    sns.barplot(x=team_counts.index, y=team_counts.values, ax=ax)
+    ax.set_title('Squadre più Pronosticate')
+    ax.set_xlabel('Squadra')
+    ax.set_ylabel('Numero di Pronostici')
+    _rotate_xticks(ax)
+    fig.tight_layout()
+
+    return team_counts, _figure_to_png(fig)
+
+
+def render_weekly_prizes(data):
+    df = pd.DataFrame(data['weekly_prizes'], columns=['Giornata', 'Vincitore', 'Premio'])
+    if df.empty:
+        return df, _empty_figure('Premi Settimanali Assegnati')
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    sns.lineplot(data=df, x='Giornata', y='Premio', ax=ax)
+    ax.set_title('Premi Settimanali Assegnati')
+    ax.set_xlabel('Giornata')
+    ax.set_ylabel('Premio (€)')
+    fig.tight_layout()
+
+    return df, _figure_to_png(fig)
+
+
+def render_final_standings(data):
+    df = pd.DataFrame(DataExporter.standings_to_records(data['standings']),
+                      columns=['Posizione', 'Partecipante', 'Punteggio'])
+    if df.empty:
+        return df, _empty_figure('Classifica Finale del Torneo')
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    sns.barplot(data=df, x='Partecipante', y='Punteggio', ax=ax)
+    ax.set_title('Classifica Finale del Torneo')
+    ax.set_xlabel('Partecipante')
+    ax.set_ylabel('Punteggio Totale')
+    _rotate_xticks(ax)
+    fig.tight_layout()
+
+    return df, _figure_to_png(fig)
+
+
+def render_prediction_accuracy(data):
+    correct_predictions, total_predictions = data['accuracy']
+    accuracy = correct_predictions / total_predictions if total_predictions > 0 else 0
+
+    results = data['prediction_distribution']
+    if not any(results.values()):
+        return accuracy, results, _empty_figure('Distribuzione dei Pronostici')
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.pie(results.values(), labels=results.keys(), autopct='%1.1f%%')
+    ax.set_title(f'Distribuzione dei Pronostici (Accuratezza: {accuracy:.2%})')
+    ax.axis('equal')
+
+    return accuracy, results, _figure_to_png(fig)
+
+
+def render_team_performance(data):
+    team_performance = {}
+    for home_team, away_team, result in data['match_results']:
+        for team in (home_team, away_team):
+            if team not in team_performance:
+                team_performance[team] = {'wins': 0, 'draws': 0, 'losses': 0}
+
+        if result == '1':
+            team_performance[home_team]['wins'] += 1
+            team_performance[away_team]['losses'] += 1
+        elif result == 'X':
+            team_performance[home_team]['draws'] += 1
+            team_performance[away_team]['draws'] += 1
+        else:  # '2'
+            team_performance[home_team]['losses'] += 1
+            team_performance[away_team]['wins'] += 1
+
+    if not team_performance:
+        df = pd.DataFrame(columns=['wins', 'draws', 'losses', 'total', 'win_rate'])
+        return df, _empty_figure('Percentuale di Vittorie per Squadra', figsize=(12, 6))
+
+    df = pd.DataFrame.from_dict(team_performance, orient='index', columns=['wins', 'draws', 'losses'])
+    df['total'] = df['wins'] + df['draws'] + df['losses']
+    df['win_rate'] = df['wins'] / df['total']
+    df = df.sort_values('win_rate', ascending=False)
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    sns.barplot(data=df, x=df.index, y='win_rate', ax=ax)
+    ax.set_title('Percentuale di Vittorie per Squadra')
+    ax.set_xlabel('Squadra')
+    ax.set_ylabel('Percentuale di Vittorie')
+    _rotate_xticks(ax)
+    fig.tight_layout()
+
+    return df, _figure_to_png(fig)
+
+
+def render_tournament_summary(data):
+    tournament = data['tournament']
+    summary = {
+        'Nome Torneo': tournament['name'],
+        'Anno': tournament['year'],
+        'Numero di Giornate': tournament['num_rounds'],
+        'Numero di Partecipanti': tournament['num_participants'],
+        'Quota di Partecipazione': f"€{tournament['participant_fee']:.2f}",
+        'Premio Settimanale': f"€{tournament['weekly_budget']:.2f}",
+        'Premio Finale Totale': f"€{tournament['final_budget']:.2f}",
+    }
+
+    winners = [row for row in data['standings'] if row['position'] == 1]
+    if winners:
+        winner_names = ", ".join(row['name'] for row in winners)
+        summary['Vincitore del Torneo'] = f"{winner_names} (Punteggio: {winners[0]['score']})"
+    else:
+        summary['Vincitore del Torneo'] = "N/A"
+
+    correct_predictions, total_predictions = data['accuracy']
+
+    summary['Totale Pronostici'] = total_predictions
+    summary['Pronostici Corretti'] = correct_predictions
+    summary['Accuratezza Pronostici'] = f"{(correct_predictions / total_predictions * 100):.2f}%" if total_predictions > 0 else "N/A"
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.text(0.5, 0.5, '\n'.join(f"{k}: {v}" for k, v in summary.items()),
+            horizontalalignment='center', verticalalignment='center', fontsize=12, transform=ax.transAxes)
+    ax.axis('off')
+    fig.tight_layout()
+
+    return summary, _figure_to_png(fig)
+
+
+# Nome del report -> (dati richiesti, render, esportazione in CSV e PDF)
+REPORTS = {
+    'prestazioni_partecipanti': (('performance',), render_participant_performance,
+                                 DataExporter.export_participant_performance),
+    'squadre_piu_pronosticate': (('team_predictions',), render_most_predicted_teams,
+                                 DataExporter.export_most_predicted_teams),
+    'premi_settimanali': (('weekly_prizes',), render_weekly_prizes,
+                          DataExporter.export_weekly_prizes),
+    'classifica_finale': (('standings',), render_final_standings,
+                          DataExporter.export_final_standings),
+    'accuratezza_pronostici': (('accuracy',), render_prediction_accuracy,
+                               DataExporter.export_prediction_accuracy),
+    'prestazioni_squadre': (('match_results',), render_team_performance,
+                            DataExporter.export_team_performance),
+    'riepilogo_torneo': (('tournament', 'standings', 'accuracy'), render_tournament_summary,
+                         DataExporter.export_tournament_summary),
+}
+
+
+def render_and_export(report_name, data, filename):
+    # Eseguita nei processi di lavoro di export_all_reports
+    _, render, export = REPORTS[report_name]
+    return export(*render(data), filename)
+
 
 class ReportGenerator:
     def __init__(self, model):
         self.model = model
 
+    # Lettura dei dati: ogni metodo restituisce una parte del dizionario passato ai render_*
+
+    def _performance_data(self, tournament_id):
+        matrix = self.model.get_score_matrix(tournament_id)
+        return {
+            'participant_names': [p.name for p in matrix.participants],
+            'round_numbers': matrix.round_numbers,
+            'round_scores': matrix.scores,
+        }
+
+    def _team_predictions_data(self, tournament_id):
+        # Pronostici contati per partita in SQL, poi sommati per squadra (casa e trasferta)
+        rows = self.model.session.query(
+            Match.home_team, Match.away_team, func.count(Prediction.id)
+        ).join(Prediction, Prediction.match_id == Match.id).join(Match.round).filter(
+            Round.tournament_id == tournament_id
+        ).group_by(Match.id).all()
+
+        team_counts = Counter()
+        for home_team, away_team, count in rows:
+            team_counts[home_team] += count
+            team_counts[away_team] += count
+        return {'team_prediction_counts': dict(team_counts)}
+
+    def _weekly_prizes_data(self, tournament_id):
+        rows = self.model.session.query(
+            Round.round_number, Participant.name, WeeklyPrize.amount
+        ).join(WeeklyPrize.round).join(WeeklyPrize.winner).filter(
+            WeeklyPrize.tournament_id == tournament_id
+        ).order_by(WeeklyPrize.id).all()
+        return {'weekly_prizes': [tuple(row) for row in rows]}
+
+    def _standings_data(self, tournament_id):
+        return {'standings': self.model.get_standings(tournament_id)}
+
+    def _accuracy_data(self, tournament_id):
+        with self.model.engine_lock:
+            engine = self.model.get_scoring_engine(tournament_id)
+            return {'accuracy': engine.accuracy(), 'prediction_distribution': engine.prediction_distribution()}
+
+    def _match_results_data(self, tournament_id):
+        rows = self.model.session.query(Match.home_team, Match.away_team, Match.result).join(Match.round).filter(
+            Round.tournament_id == tournament_id, Match.result.in_(SCORING_RESULTS)
+        ).all()
+        return {'match_results': [(home_team, away_team, result.value) for home_team, away_team, result in rows]}
+
+    def _tournament_data(self, tournament_id):
+        tournament = self.model.session.get(Tournament, tournament_id)
+        if not tournament:
+            raise ValidationError("Torneo non trovato")
+        return {'tournament': {
+            'name': tournament.name,
+            'year': tournament.year,
+            'num_rounds': tournament.num_rounds,
+            'num_participants': tournament.num_participants,
+            'participant_fee': tournament.participant_fee,
+            'weekly_budget': tournament.weekly_budget,
+            'final_budget': tournament.final_budget,
+        }}
+
+    def collect_report_data(self, tournament_id, report_names=None):
+        # Legge una sola volta i dati di tutti i report richiesti (di default tutti)
+        report_names = list(REPORTS) if report_names is None else report_names
+        sources = []
+        for report_name in report_names:
+            for source in REPORTS[report_name][0]:
+                if source not in sources:
+                    sources.append(source)
+
+        data = {}
+        for source in sources:
+            data.update(getattr(self, f'_{source}_data')(tournament_id))
+        return data
+
+    def generate_report(self, report_name, tournament_id):
+        return REPORTS[report_name][1](self.collect_report_data(tournament_id, [report_name]))
+
     def generate_participant_performance_report(self, tournament_id):
-        participants = self.model.get_participants(tournament_id)
-        rounds = self.model.get_rounds(tournament_id)
-        
-        data = []
-        for participant in participants:
-            participant_data = {'Partecipante': participant.name}
-            for round in rounds:
-                score = self.model.calculate_round_scores(round.id).get(participant.id, 0)
-                participant_data[f'Giornata {round.round_number}'] = score
-            data.append(participant_data)
-        
-        df = pd.DataFrame(data)
-        df.set_index('Partecipante', inplace=True)
-        
-        plt.figure(figsize=(12, 6))
-        sns.heatmap(df, annot=True, cmap="YlGnBu", fmt="d")
-        plt.title('Prestazioni dei Partecipanti per Giornata')
-        plt.tight_layout()
-        
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png')
-        img_buffer.seek(0)
-        
-        return df, img_buffer
+        return self.generate_report('prestazioni_partecipanti', tournament_id)
 
     def generate_most_predicted_teams_report(self, tournament_id):
-        predictions = self.model.session.query(Prediction).join(Match).join(Round).filter(Round.tournament_id == tournament_id).all()
-        
-        home_teams = [p.match.home_team for p in predictions]
-        away_teams = [p.match.away_team for p in predictions]
-        all_teams = home_teams + away_teams
-        
-        team_counts = pd.Series(all_teams).value_counts()
-        
-        plt.figure(figsize=(10, 6))
-        sns.barplot(x=team_counts.index, y=team_counts.values)
-        plt.title('Squadre più Pronosticate')
-        plt.xlabel('Squadra')
-        plt.ylabel('Numero di Pronostici')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png')
-        img_buffer.seek(0)
-        
-        return team_counts, img_buffer
+        return self.generate_report('squadre_piu_pronosticate', tournament_id)
 
     def generate_weekly_prizes_report(self, tournament_id):
-        weekly_prizes = self.model.session.query(WeeklyPrize).filter_by(tournament_id=tournament_id).all()
-        
-        data = [{'Giornata': wp.round.round_number, 'Vincitore': wp.winner.name, 'Premio': wp.amount} for wp in weekly_prizes]
-        df = pd.DataFrame(data)
-        
-        plt.figure(figsize=(10, 6))
-        sns.lineplot(data=df, x='Giornata', y='Premio')
-        plt.title('Premi Settimanali Assegnati')
-        plt.xlabel('Giornata')
-        plt.ylabel('Premio (€)')
-        plt.tight_layout()
-        
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png')
-        img_buffer.seek(0)
-        
-        return df, img_buffer
+        return self.generate_report('premi_settimanali', tournament_id)
 
     def generate_final_standings_report(self, tournament_id):
-        standings = self.model.get_tournament_standings(tournament_id)
-        
-        data = [{'Posizione': i+1, 'Partecipante': self.model.session.query(Participant).get(p_id).name, 'Punteggio': score} 
-                for i, (p_id, score) in enumerate(sorted(standings.items(), key=lambda x: x[1], reverse=True))]
-        df = pd.DataFrame(data)
-        
-        plt.figure(figsize=(10, 6))
-        sns.barplot(data=df, x='Partecipante', y='Punteggio')
-        plt.title('Classifica Finale del Torneo')
-        plt.xlabel('Partecipante')
-        plt.ylabel('Punteggio Totale')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png')
-        img_buffer.seek(0)
-        
-        return df, img_buffer
+        return self.generate_report('classifica_finale', tournament_id)
 
     def generate_prediction_accuracy_report(self, tournament_id):
-        predictions = self.model.session.query(Prediction).join(Match).join(Round).filter(Round.tournament_id == tournament_id).all()
-        
-        correct_predictions = sum(1 for p in predictions if p.prediction == p.match.result and p.match.result in ['1', 'X', '2'])
-        total_predictions = len(predictions)
-        
-        accuracy = correct_predictions / total_predictions if total_predictions > 0 else 0
-        
-        results = {'1': 0, 'X': 0, '2': 0}
-        for p in predictions:
-            if p.prediction in results:
-                results[p.prediction] += 1
-        
-        plt.figure(figsize=(10, 6))
-        plt.pie(results.values(), labels=results.keys(), autopct='%1.1f%%')
-        plt.title(f'Distribuzione dei Pronostici (Accuratezza: {accuracy:.2%})')
-        plt.axis('equal')
-        
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png')
-        img_buffer.seek(0)
-        
-        return accuracy, results, img_buffer
+        return self.generate_report('accuratezza_pronostici', tournament_id)
 
     def generate_team_performance_report(self, tournament_id):
-        matches = self.model.session.query(Match).join(Round).filter(Round.tournament_id == tournament_id).all()
-        
-        team_performance = {}
-        for match in matches:
-            if match.result in ['1', 'X', '2']:
-                if match.home_team not in team_performance:
-                    team_performance[match.home_team] = {'wins': 0, 'draws': 0, 'losses': 0}
-                if match.away_team not in team_performance:
-                    team_performance[match.away_team] = {'wins': 0, 'draws': 0, 'losses': 0}
-                
-                if match.result == '1':
-                    team_performance[match.home_team]['wins'] += 1
-                    team_performance[match.away_team]['losses'] += 1
-                elif match.result == 'X':
-                    team_performance[match.home_team]['draws'] += 1
-                    team_performance[match.away_team]['draws'] += 1
-                else:  # '2'
-                    team_performance[match.home_team]['losses'] += 1
-                    team_performance[match.away_team]['wins'] += 1
-        
-        df = pd.DataFrame(team_performance).T
-        df['total'] = df['wins'] + df['draws'] + df['losses']
-        df['win_rate'] = df['wins'] / df['total']
-        df = df.sort_values('win_rate', ascending=False)
-        
-        plt.figure(figsize=(12, 6))
-        sns.barplot(data=df, x=df.index, y='win_rate')
-        plt.title('Percentuale di Vittorie per Squadra')
-        plt.xlabel('Squadra')
-        plt.ylabel('Percentuale di Vittorie')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png')
-        img_buffer.seek(0)
-        
-        return df, img_buffer
+        return self.generate_report('prestazioni_squadre', tournament_id)
 
     def generate_tournament_summary_report(self, tournament_id):
-        tournament = self.model.session.query(Tournament).get(tournament_id)
-        if not tournament:
-            raise ValidationError("Torneo non trovato")
-        
-        summary = {
-            'Nome Torneo': tournament.name,
-            'Anno': tournament.year,
-            'Numero di Giornate': tournament.num_rounds,
-            'Numero di Partecipanti': tournament.num_participants,
-            'Quota di Partecipazione': f"€{tournament.participant_fee:.2f}",
-            'Premio Settimanale': f"€{tournament.weekly_budget:.2f}",
-            'Premio Finale Totale': f"€{tournament.final_budget:.2f}",
-        }
-        
-        standings = self.model.get_tournament_standings(tournament_id)
-        winner = max(standings, key=standings.get)
-        winner_name = self.model.session.query(Participant).get(winner).name
-        summary['Vincitore del Torneo'] = f"{winner_name} (Punteggio: {standings[winner]})"
-        
-        total_predictions = self.model.session.query(Prediction).join(Match).join(Round).filter(Round.tournament_id == tournament_id).count()
-        correct_predictions = self.model.session.query(Prediction).join(Match).join(Round).filter(
-            Round.tournament_id == tournament_id,
-            Prediction.prediction == Match.result,
-            Match.result.in_(['1', 'X', '2'])
-        ).count()
-        
-        summary['Totale Pronostici'] = total_predictions
-        summary['Pronostici Corretti'] = correct_predictions
-        summary['Accuratezza Pronostici'] = f"{(correct_predictions / total_predictions * 100):.2f}%" if total_predictions > 0 else "N/A"
-        
-        plt.figure(figsize=(10, 6))
-        plt.text(0.5, 0.5, '\n'.join(f"{k}: {v}" for k, v in summary.items()),
-                 horizontalalignment='center', verticalalignment='center', fontsize=12)
-        plt.axis('off')
-        plt.tight_layout()
-        
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png')
-        img_buffer.seek(0)
-        
-        return summary, img_buffer
\ No newline at end of file
+        return self.generate_report('riepilogo_torneo', tournament_id)
+
+    @staticmethod
+    def export_all_reports(data, directory, report_names=None, max_workers=None):
+        # Disegna ed esporta i report in un pool di processi (matplotlib e reportlab usano un core
+        # ciascuno). "spawn" evita di duplicare con fork lo stato di Qt e le connessioni SQLite.
+        # Ogni processo paga l'import di pandas/matplotlib/reportlab: con un solo core (o un solo
+        # report) si disegna direttamente nel processo corrente
+        report_names = list(REPORTS) if report_names is None else report_names
+        max_workers = max_workers or min(len(report_names), os.cpu_count() or 1)
+        files = []
+        errors = []
+
+        # Un report non riuscito non ferma gli altri: l'errore si registra nel log e si
+        # restituiscono comunque i file prodotti
+        def collect(report_name, get_files):
+            try:
+                files.extend(get_files())
+            except Exception as e:
+                logger.exception(f"Errore durante la generazione del report {report_name}")
+                errors.append(f"{report_name}: {str(e)}")
+
+        if max_workers <= 1:
+            for report_name in report_names:
+                collect(report_name, lambda: render_and_export(report_name, data, os.path.join(directory, report_name)))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                futures = {
+                    report_name: pool.submit(render_and_export, report_name, data, os.path.join(directory, report_name))
+                    for report_name in report_names
+                }
+                for report_name, future in futures.items():
+                    collect(report_name, future.result)
+
+        if errors and not files:
+            raise ExportError("Nessun report generato: " + "; ".join(errors))
+        return files
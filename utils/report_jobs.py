@@ -0,0 +1,104 @@
+import itertools
+import threading
+import logging
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class ReportJobSignals(QObject):
+    progress = pyqtSignal(str, int)      # (id job, percentuale)
+    finished = pyqtSignal(str, list)     # (id job, file prodotti)
+    failed = pyqtSignal(str, str)        # (id job, messaggio di errore)
+    cancelled = pyqtSignal(str)          # id job
+
+
+class ReportJob(QRunnable):
+    # Un report eseguito fuori dal thread della GUI: `steps` è una lista di funzioni eseguite in
+    # sequenza, ognuna riceve il risultato della precedente; l'ultima restituisce i file prodotti.
+    # I segnali arrivano alla GUI tramite connessioni in coda.
+    def __init__(self, job_id, steps, model, signals):
+        super().__init__()
+        self.job_id = job_id
+        self.steps = steps
+        self.model = model
+        self.signals = signals
+        self._cancel_event = threading.Event()
+        self.logger = logging.getLogger(__name__)
+
+    def cancel(self):
+        # La cancellazione ha effetto tra un passo e l'altro
+        self._cancel_event.set()
+
+    @property
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def run(self):
+        try:
+            result = None
+            for index, step in enumerate(self.steps):
+                if self.is_cancelled:
+                    self.signals.cancelled.emit(self.job_id)
+                    return
+                result = step() if index == 0 else step(result)
+                self.signals.progress.emit(self.job_id, int((index + 1) * 100 / len(self.steps)))
+            self.signals.finished.emit(self.job_id, list(result or []))
+        except Exception as e:
+            self.logger.error(f"Errore nel job {self.job_id}: {str(e)}")
+            self.signals.failed.emit(self.job_id, str(e))
+        finally:
+            # Ogni thread di lavoro usa la propria sessione: va chiusa a fine job
+            self.model.release_session()
+
+
+class ReportJobManager(QObject):
+    progress = pyqtSignal(str, int)
+    started = pyqtSignal(str)
+    finished = pyqtSignal(str, list)
+    failed = pyqtSignal(str, str)
+    cancelled = pyqtSignal(str)
+
+    def __init__(self, model, max_workers=None):
+        super().__init__()
+        self.model = model
+        self.pool = QThreadPool()
+        if max_workers:
+            self.pool.setMaxThreadCount(max_workers)
+        self.jobs = {}
+        self._ids = itertools.count(1)
+        self.signals = ReportJobSignals()
+        self.signals.progress.connect(self.progress)
+        self.signals.finished.connect(self._on_finished)
+        self.signals.failed.connect(self._on_failed)
+        self.signals.cancelled.connect(self._on_cancelled)
+
+    def submit(self, name, steps):
+        job_id = f"{name}-{next(self._ids)}"
+        job = ReportJob(job_id, steps, self.model, self.signals)
+        job.setAutoDelete(False)
+        self.jobs[job_id] = job
+        self.pool.start(job)
+        self.started.emit(job_id)
+        return job_id
+
+    def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job:
+            job.cancel()
+            # Se il job è ancora in coda lo togliamo direttamente
+            if self.pool.tryTake(job):
+                self._on_cancelled(job_id)
+
+    def wait_for_done(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+    def _on_finished(self, job_id, files):
+        self.jobs.pop(job_id, None)
+        self.finished.emit(job_id, files)
+
+    def _on_failed(self, job_id, message):
+        self.jobs.pop(job_id, None)
+        self.failed.emit(job_id, message)
+
+    def _on_cancelled(self, job_id):
+        self.jobs.pop(job_id, None)
+        self.cancelled.emit(job_id)
@@ -0,0 +1,39 @@
+import time
+import logging
+
+
+class StartupTimer:
+    # Misura le fasi dell'avvio (import, apertura del database, costruzione della finestra,
+    # primo paint) a partire dalla creazione del timer, da fare prima degli import pesanti.
+    # Se il totale supera il budget il report viene registrato come warning.
+    def __init__(self, budget_seconds=2.0):
+        self.budget_seconds = budget_seconds
+        self.start_time = time.perf_counter()
+        self.last_time = self.start_time
+        self.phases = []
+        self.logger = logging.getLogger(__name__)
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last_time))
+        self.last_time = now
+
+    @property
+    def total(self):
+        return self.last_time - self.start_time
+
+    def as_dict(self):
+        report = {phase: round(duration, 4) for phase, duration in self.phases}
+        report['totale'] = round(self.total, 4)
+        report['budget'] = self.budget_seconds
+        return report
+
+    def report(self):
+        lines = [f"  {phase:<12} {duration * 1000:8.1f} ms" for phase, duration in self.phases]
+        lines.append(f"  {'totale':<12} {self.total * 1000:8.1f} ms (budget {self.budget_seconds * 1000:.0f} ms)")
+        message = "Tempi di avvio:\n" + "\n".join(lines)
+        if self.total > self.budget_seconds:
+            self.logger.warning(message)
+        else:
+            self.logger.info(message)
+        return self.as_dict()
@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from PyQt6.QtCore import QObject, QTimer
+
+
+class UpdateCoalescer(QObject):
+    # Raggruppa gli aggiornamenti della GUI: mark_dirty segna una vista da aggiornare con la funzione
+    # che emette il segnale; più segnalazioni della stessa vista prima del flush ne producono una sola
+    # (vince l'ultima funzione registrata). Il flush avviene al giro successivo del ciclo degli eventi,
+    # o dopo interval_ms dalla prima segnalazione, oppure alla chiusura del batch più esterno
+    def __init__(self, interval_ms=0, parent=None):
+        super().__init__(parent)
+        self.pending = {}
+        self.batch_depth = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def mark_dirty(self, key, refresh):
+        self.pending[key] = refresh
+        if not self.batch_depth and not self.timer.isActive():
+            self.timer.start()
+
+    def is_dirty(self, key):
+        return key in self.pending
+
+    def begin_batch(self):
+        self.batch_depth += 1
+        self.timer.stop()
+
+    def end_batch(self):
+        self.batch_depth = max(0, self.batch_depth - 1)
+        if not self.batch_depth:
+            self.flush()
+
+    @contextmanager
+    def batch(self):
+        self.begin_batch()
+        try:
+            yield self
+        finally:
+            self.end_batch()
+
+    def flush(self):
+        self.timer.stop()
+        # Le funzioni di aggiornamento possono segnare altre viste: si continua fino a esaurimento
+        while self.pending and not self.batch_depth:
+            pending, self.pending = self.pending, {}
+            for refresh in pending.values():
+                refresh()
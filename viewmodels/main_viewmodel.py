@@ -2,14 +2,20 @@ from PyQt6.QtCore import QObject, pyqtSignal
 from datetime import datetime, timedelta, time
 from datetime import date as date_type
 from utils.auto_save import AutoSave
-from utils.report_generator import ReportGenerator
-from utils.data_exporter import DataExporter
 from utils.custom_exceptions import *
 from utils.data_validator import DataValidator
 from utils.notification_manager import NotificationManager
 from utils.performance_optimizations import PerformanceOptimizer
 from utils.database_backup import DatabaseBackup
-from models.database_schema import Tournament, Round, RoundState, TournamentState, ProgramState, MatchResult
+from utils.report_jobs import ReportJobManager
+from utils.page_loader import PageLoader
+from utils.metrics import metrics_registry, tracked_action
+from utils.update_coalescer import UpdateCoalescer
+from sqlalchemy import func, desc
+from models.database_schema import Tournament, Round, Match, Prediction, RoundState, TournamentState, ProgramState, MatchResult
+
+# Finestra entro cui gli aggiornamenti di classifica, partite, pronostici e risultati vengono raggruppati
+UPDATE_INTERVAL_MS = 30
 
 class MainViewModel(QObject):
     # Segnali
@@ -25,35 +31,100 @@ class MainViewModel(QObject):
     round_state_changed = pyqtSignal(int, RoundState)
     matches_updated = pyqtSignal(list)
     predictions_updated = pyqtSignal(list)
-    results_updated = pyqtSignal(dict)
+    results_updated = pyqtSignal(list)
     standings_updated = pyqtSignal(list)
     weekly_prize_assigned = pyqtSignal(float, list)
     final_prizes_assigned = pyqtSignal(list)
     error_occurred = pyqtSignal(str)
+    backup_completed = pyqtSignal(str)       # id dello snapshot
+    report_started = pyqtSignal(str)         # id job
+    report_progress = pyqtSignal(str, int)   # (id job, percentuale)
+    report_finished = pyqtSignal(str, list)  # (id job, file prodotti)
+    report_failed = pyqtSignal(str, str)     # (id job, messaggio)
+    report_cancelled = pyqtSignal(str)       # id job
 
     def __init__(self, model):
         super().__init__()
         self.model = model
         self.active_tournament = None
         self.current_round = None
+        # Classifica mantenuta in memoria e aggiornata in modo incrementale ad ogni risultato
+        self.standings = None
+        self.participant_names = {}
         self.auto_save = AutoSave(self.model)
-        self.report_generator = ReportGenerator(self.model)
-        self.data_exporter = DataExporter()
+        # ReportGenerator e DataExporter (pandas, matplotlib, seaborn, reportlab) si creano al primo uso
+        self._report_generator = None
+        self._data_exporter = None
         self.validator = DataValidator()
         self.notification_manager = NotificationManager()
         self.performance_optimizer = PerformanceOptimizer()
-        self.db_backup = DatabaseBackup("torneo_pronostici.db", "backups")
+        self.db_backup = DatabaseBackup("torneo_pronostici.db", "backups", on_complete=self.on_backup_complete)
+        # I report (pandas, seaborn, reportlab) girano su un pool di thread, non sul thread della GUI
+        self.report_jobs = ReportJobManager(self.model)
+        self.report_jobs.started.connect(self.report_started)
+        self.report_jobs.progress.connect(self.report_progress)
+        self.report_jobs.finished.connect(self.report_finished)
+        self.report_jobs.failed.connect(self.report_failed)
+        self.report_jobs.cancelled.connect(self.report_cancelled)
+        # Dati delle pagine della finestra, letti in background alla loro apertura
+        self.page_loader = PageLoader(self.model)
+        # Query SQL, tempo SQL e tempo totale di ogni azione (vedi dump_metrics)
+        self.metrics = metrics_registry
+        self.metrics.instrument_engine(self.model.engine)
+        # standings_updated, matches_updated, predictions_updated e results_updated non vengono emessi
+        # ad ogni scrittura: le viste si segnano da aggiornare e il coalescer emette una volta sola
+        self.updates = UpdateCoalescer(UPDATE_INTERVAL_MS, self)
+        self.dirty_prediction_participants = set()
+
+    def start_background_services(self):
+        # Chiamato dopo il primo paint della finestra, per non rallentare l'avvio
         self.db_backup.start_scheduled_backup()
 
+    def stop_background_services(self):
+        # Alla chiusura: i backup in corso terminano (niente copie temporanee lasciate a metà)
+        self.db_backup.shutdown()
+
+    def dump_metrics(self, filename=None):
+        return self.metrics.dump(filename)
+
+    def batch_updates(self):
+        # with viewmodel.batch_updates(): ... per le operazioni in blocco; i segnali partono alla fine
+        return self.updates.batch()
+
+    def begin_batch(self):
+        self.updates.begin_batch()
+
+    def end_batch(self):
+        self.updates.end_batch()
+
+    def flush_updates(self):
+        self.updates.flush()
+
+    @property
+    def report_generator(self):
+        if self._report_generator is None:
+            from utils.report_generator import ReportGenerator
+            self._report_generator = ReportGenerator(self.model)
+        return self._report_generator
+
+    @property
+    def data_exporter(self):
+        if self._data_exporter is None:
+            from utils.data_exporter import DataExporter
+            self._data_exporter = DataExporter()
+        return self._data_exporter
+
+    @tracked_action()
     def load_active_tournament(self):
         self.active_tournament = self.model.get_active_tournament()
+        self.standings = None
         if self.active_tournament:
+            # I partecipanti li carica la relativa pagina, solo se viene aperta
             self.tournament_updated.emit(self.active_tournament)
-            participants = self.model.get_participants(self.active_tournament.id)
-            self.participants_updated.emit(participants)
             self.update_tournament_state()
         return self.active_tournament
 
+    @tracked_action()
     def create_tournament(self, name, start_date, num_rounds, num_matches_per_round, num_participants, 
                           min_correct_predictions, participant_fee, weekly_prize_percentage, 
                           final_prizes_percentage):
@@ -68,6 +139,7 @@ class MainViewModel(QObject):
                 min_correct_predictions, participant_fee, weekly_prize_percentage, final_prizes_percentage
             )
             self.active_tournament = tournament
+            self.standings = None
             self.tournament_created.emit(tournament)
             self.update_tournament_state()
         except ValueError as e:
@@ -77,6 +149,7 @@ class MainViewModel(QObject):
         except Exception as e:
             self.error_occurred.emit(f"Errore imprevisto: {str(e)}")
 
+    @tracked_action()
     def add_participant(self, name):
         try:
             self.validator.validate_participant_name(name)
@@ -85,6 +158,7 @@ class MainViewModel(QObject):
                 raise ValidationError("Un partecipante con questo nome esiste già.")
         
             participant = self.model.add_participant(self.active_tournament.id, name)
+            self.standings = None
             participants = self.model.get_participants(self.active_tournament.id)
             self.participants_updated.emit(participants)
         
@@ -95,10 +169,13 @@ class MainViewModel(QObject):
         except Exception as e:
             self.error_occurred.emit(f"Errore nell'aggiunta del partecipante: {str(e)}")
 
+    @tracked_action()
     def edit_participant(self, participant_id, new_name):
         try:
             self.validator.validate_participant_name(new_name)
             self.model.edit_participant(participant_id, new_name)
+            if participant_id in self.participant_names:
+                self.participant_names[participant_id] = new_name
             participants = self.model.get_participants(self.active_tournament.id)
             self.participants_updated.emit(participants)
         except ValidationError as e:
@@ -106,6 +183,7 @@ class MainViewModel(QObject):
         except Exception as e:
             self.error_occurred.emit(f"Errore durante la modifica del partecipante: {str(e)}")
     
+    @tracked_action()
     def start_tournament(self):
         try:
             if not self.active_tournament:
@@ -180,6 +258,7 @@ class MainViewModel(QObject):
             self.model.update_round_state(self.current_round.id, new_state)
             self.round_state_changed.emit(self.current_round.round_number, new_state)
 
+    @tracked_action()
     def set_round_date(self, date_type):
         try:
             self.validator.validate_date(date_type)
@@ -193,50 +272,167 @@ class MainViewModel(QObject):
             self.error_occurred.emit(f"Errore nell'impostazione della data: {str(e)}")
             print(f"Errore dettagliato: {e}")  # Per il debug
 
+    @tracked_action()
     def add_match(self, home_team, away_team):
         try:
             self.validator.validate_match(home_team, away_team, self.model.get_matches(self.current_round.id))
             match = self.model.add_match(self.current_round.id, home_team, away_team)
             matches = self.model.get_matches(self.current_round.id)
-            self.matches_updated.emit(matches)
+            self.updates.mark_dirty('matches', lambda: self.matches_updated.emit(matches))
             if len(matches) == self.active_tournament.num_matches_per_round:
                 self.update_round_state()
         except ValidationError as e:
             self.error_occurred.emit(str(e))
 
+    @tracked_action()
     def add_prediction(self, participant_id, match_id, prediction):
         try:
             self.validator.validate_prediction(prediction)
             self.model.add_prediction(participant_id, match_id, prediction)
-            predictions = self.model.get_predictions(participant_id, self.current_round.id)
-            self.predictions_updated.emit(predictions)
+            if self.model.get_match_result(match_id) is not None:
+                self.standings = None
+            self.mark_predictions_dirty([participant_id])
             if self.are_all_predictions_entered():
                 self.update_round_state()
         except ValidationError as e:
             self.error_occurred.emit(str(e))
 
+    @tracked_action()
+    def submit_predictions(self, participant_id, predictions):
+        # Schedina completa di un partecipante: {match_id: pronostico}
+        self.submit_matchday_predictions({participant_id: predictions})
+
+    @tracked_action()
+    def submit_matchday_predictions(self, sheets):
+        # Intera giornata {participant_id: {match_id: pronostico}}: validazione completa,
+        # una sola transazione e un solo predictions_updated. Un pronostico None cancella quello
+        # salvato. Restituisce False se il salvataggio non è riuscito (errore già segnalato)
+        try:
+            matches = self.model.get_matches(self.current_round.id)
+            participants = self.model.get_participants(self.active_tournament.id)
+            self.validator.validate_prediction_sheets(
+                sheets, {m.id for m in matches}, {p.id for p in participants}
+            )
+            rows = [(participant_id, match_id, prediction)
+                    for participant_id, predictions in sheets.items()
+                    for match_id, prediction in predictions.items() if prediction is not None]
+            deletions = [(participant_id, match_id)
+                         for participant_id, predictions in sheets.items()
+                         for match_id, prediction in predictions.items() if prediction is None]
+            self.model.add_predictions(rows, deletions)
+            if any(m.result is not None for m in matches):
+                self.standings = None
+            self.mark_predictions_dirty(sheets)
+            if self.are_all_predictions_entered():
+                self.update_round_state()
+            return True
+        except ValidationError as e:
+            self.error_occurred.emit(str(e))
+        except Exception as e:
+            self.error_occurred.emit(f"Errore durante il salvataggio dei pronostici: {str(e)}")
+        return False
+
+    def mark_predictions_dirty(self, participant_ids):
+        # Un solo predictions_updated con le schedine di tutti i partecipanti modificati nel frattempo
+        self.dirty_prediction_participants.update(participant_ids)
+        self.updates.mark_dirty('predictions', self.emit_predictions)
+
+    def emit_predictions(self):
+        participant_ids, self.dirty_prediction_participants = list(self.dirty_prediction_participants), set()
+        if self.current_round and participant_ids:
+            self.predictions_updated.emit(self.model.get_round_predictions(self.current_round.id, participant_ids))
+
+    @tracked_action()
+    def get_matchday_predictions(self):
+        # Dati per la griglia partecipanti × partite della giornata corrente:
+        # (partecipanti, partite, pronostici già inseriti)
+        if not self.active_tournament or not self.current_round:
+            return [], [], []
+        return self.model.get_matchday_predictions(self.active_tournament.id, self.current_round.id)
+
+    @tracked_action()
     def enter_match_result(self, match_id, result):
+        self.enter_match_results({match_id: result})
+
+    @tracked_action()
+    def enter_match_results(self, results):
+        # Tutti i risultati di una giornata {match_id: risultato} (1/X/2 oppure Sospesa, Rinviata, ...):
+        # una transazione, un solo ricalcolo dei punteggi e un solo controllo di completamento
         try:
-            self.validator.validate_match_result(result)
-            self.model.update_match_result(match_id, result)
-            self.update_standings()
+            for result in results.values():
+                self.validator.validate_match_result(result)
+            previous_results = self.model.update_match_results(results)
+            self.apply_result_changes({
+                match_id: (previous_result, results[match_id])
+                for match_id, previous_result in previous_results.items()
+            })
+            round_id = self.current_round.id
+            self.updates.mark_dirty('results', lambda: self.results_updated.emit(self.model.get_matches(round_id)))
             if self.are_all_results_entered():
                 self.update_round_state()
         except ValidationError as e:
             self.error_occurred.emit(str(e))
 
+    @tracked_action()
     def complete_round(self):
         if self.current_round.state != RoundState.VIEWING_REPORT:
             raise StateError("La giornata non può essere completata in questo momento.")
-        
-        self.assign_weekly_prize()
-        self.model.update_round_state(self.current_round.id, RoundState.ROUND_CONCLUDED)
-        self.round_state_changed.emit(self.current_round.round_number, RoundState.ROUND_CONCLUDED)
-        
-        if self.is_tournament_completed():
-            self.complete_tournament()
+
+        with self.batch_updates():
+            self.assign_weekly_prize()
+            self.model.update_round_state(self.current_round.id, RoundState.ROUND_CONCLUDED)
+            self.round_state_changed.emit(self.current_round.round_number, RoundState.ROUND_CONCLUDED)
+            self.backup_database()
+
+            if self.is_tournament_completed():
+                self.complete_tournament()
+            else:
+                self.update_current_round()
+        self.release_session()
+
+    def release_session(self):
+        # Fine dell'unità di lavoro della giornata: si riparte da una sessione vuota
+        # e si ricollegano torneo e giornata correnti
+        self.model.release_session()
+        if self.active_tournament:
+            self.active_tournament = self.model.session.get(Tournament, self.active_tournament.id)
+        if self.current_round:
+            self.current_round = self.model.session.get(Round, self.current_round.id)
+
+    def backup_database(self):
+        # Snapshot incrementale a fine giornata: vengono scritte solo le pagine cambiate.
+        # Copia e verifica girano in background, l'esito arriva con on_backup_complete
+        try:
+            self.db_backup.backup()
+        except DatabaseError as e:
+            self.error_occurred.emit(str(e))
+
+    def on_backup_complete(self, snapshot_id, error):
+        # Chiamato dal thread del backup: i segnali arrivano alla GUI tramite connessione in coda
+        if error:
+            self.error_occurred.emit(f"Backup {snapshot_id} non riuscito: {error}")
         else:
-            self.update_current_round()
+            self.backup_completed.emit(snapshot_id)
+
+    def list_backups(self):
+        return self.db_backup.list_backups()
+
+    @tracked_action()
+    def restore_backup(self, backup_id):
+        # Dopo il ripristino motore dei punteggi, classifica in memoria e oggetti della sessione
+        # descrivono il database precedente: si scartano e si ricarica il torneo attivo
+        try:
+            self.db_backup.restore_from_backup(backup_id)
+        except DatabaseError as e:
+            self.error_occurred.emit(str(e))
+            return False
+        self.model.invalidate_scoring_engine()
+        self.model.release_session()
+        self.standings = None
+        self.participant_names = {}
+        self.active_tournament = None
+        self.current_round = None
+        return True
 
     def assign_weekly_prize(self):
         winners, prize_amount = self.model.get_weekly_prize_winners(self.current_round.id)
@@ -249,13 +445,45 @@ class MainViewModel(QObject):
         else:
             next_round = self.get_next_round()
             if next_round:
-                next_round.weekly_budget += self.current_round.weekly_budget
-                self.model.session.commit()
+                self.model.add_to_weekly_budget(next_round.id, self.current_round.weekly_budget)
 
+    @tracked_action()
     def update_standings(self):
-        standings = self.model.get_tournament_standings(self.active_tournament.id)
-        sorted_standings = sorted(standings.items(), key=lambda x: x[1], reverse=True)
-        self.standings_updated.emit([(self.model.get_participant_name(p_id), score) for p_id, score in sorted_standings])
+        # Ricalcolo completo: ricarica la classifica dal database e la tiene in memoria
+        self.apply_standings(self.model.get_standings(self.active_tournament.id))
+
+    def apply_standings(self, standings):
+        # Classifica completa già letta (anche da un thread di lavoro, vedi MainWindow)
+        self.standings = {row['participant_id']: row['score'] for row in standings}
+        self.participant_names = {row['participant_id']: row['name'] for row in standings}
+        rows = [(row['position'], row['name'], row['score']) for row in standings]
+        self.updates.mark_dirty('standings', lambda: self.standings_updated.emit(rows))
+
+    def apply_result_change(self, match_id, previous_result, new_result):
+        self.apply_result_changes({match_id: (previous_result, new_result)})
+
+    @tracked_action()
+    def apply_result_changes(self, changes):
+        # Aggiornamento incrementale: tocca solo chi ha pronosticato le partite modificate, gestendo
+        # anche la correzione di un risultato già inserito (es. una partita sospesa che ottiene 1/X/2)
+        if self.standings is None:
+            self.update_standings()
+            return
+        deltas = self.model.get_score_deltas_for_matches(changes)
+        if not deltas:
+            return
+        for participant_id, delta in deltas.items():
+            self.standings[participant_id] = self.standings.get(participant_id, 0) + delta
+        # L'ordinamento della classifica si calcola una volta sola, al flush
+        self.updates.mark_dirty('standings', self.emit_standings)
+
+    def emit_standings(self):
+        if self.standings is None:
+            return
+        rows = [(participant_id, self.participant_names.get(participant_id, ""), score)
+                for participant_id, score in self.standings.items()]
+        standings = self.model.rank_standings(rows)
+        self.standings_updated.emit([(row['position'], row['name'], row['score']) for row in standings])
 
     def complete_tournament(self):
         if self.active_tournament.state != TournamentState.IN_PROGRESS:
@@ -265,19 +493,18 @@ class MainViewModel(QObject):
         self.model.update_tournament_state(self.active_tournament.id, TournamentState.CONCLUDED)
         self.tournament_completed.emit()
 
+    @tracked_action()
     def assign_final_prizes(self):
-        standings = self.model.get_tournament_standings(self.active_tournament.id)
-        sorted_standings = sorted(standings.items(), key=lambda x: x[1], reverse=True)
+        standings = self.model.get_standings(self.active_tournament.id)
         total_prize = self.active_tournament.final_budget
         prize_distribution = self.get_prize_distribution()
         
         prizes = []
-        for position, (participant_id, _) in enumerate(sorted_standings[:len(prize_distribution)], start=1):
+        for position, row in enumerate(standings[:len(prize_distribution)], start=1):
             prize_percentage = prize_distribution[position]
             prize_amount = total_prize * (prize_percentage / 100)
-            self.model.assign_final_prizes(self.active_tournament.id, participant_id, position, prize_amount)
-            participant_name = self.model.get_participant_name(participant_id)
-            prizes.append((position, participant_name, prize_amount))
+            self.model.assign_final_prizes(self.active_tournament.id, row['participant_id'], position, prize_amount)
+            prizes.append((position, row['name'], prize_amount))
         
         self.final_prizes_assigned.emit(prizes)
 
@@ -308,19 +535,39 @@ class MainViewModel(QObject):
     def generate_tournament_report(self):
         return self.model.get_tournament_summary(self.active_tournament.id)
 
+    @tracked_action()
     def export_standings_to_csv(self, filename):
-        standings = self.model.get_tournament_standings(self.active_tournament.id)
-        sorted_standings = sorted(standings.items(), key=lambda x: x[1], reverse=True)
-        data = [{"Posizione": i+1, "Partecipante": self.model.get_participant_name(p_id), "Punteggio": score} 
-                for i, (p_id, score) in enumerate(sorted_standings)]
-        self.data_exporter.export_to_csv(data, filename)
+        standings = self.model.get_standings(self.active_tournament.id)
+        self.data_exporter.export_to_csv(self.data_exporter.standings_to_records(standings), filename)
 
+    @tracked_action()
     def export_standings_to_pdf(self, filename):
-        standings = self.model.get_tournament_standings(self.active_tournament.id)
-        sorted_standings = sorted(standings.items(), key=lambda x: x[1], reverse=True)
-        data = [{"Posizione": i+1, "Partecipante": self.model.get_participant_name(p_id), "Punteggio": score} 
-                for i, (p_id, score) in enumerate(sorted_standings)]
-        self.data_exporter.export_to_pdf(data, filename, f"Classifica del Torneo: {self.active_tournament.name}")
+        standings = self.model.get_standings(self.active_tournament.id)
+        self.data_exporter.export_to_pdf(self.data_exporter.standings_to_records(standings), filename,
+                                         f"Classifica del Torneo: {self.active_tournament.name}")
+
+    def export_predictions_to_csv(self, filename, all_tournaments=False):
+        # Esportazione completa dei pronostici in streaming (righe lette con yield_per e scritte a
+        # blocchi), eseguita in background: la memoria non cresce con il numero di stagioni
+        from models.tournament_model import PREDICTION_EXPORT_COLUMNS
+        tournament_id = None if all_tournaments else self.active_tournament.id
+
+        def export():
+            self.data_exporter.export_to_csv(self.model.iter_prediction_rows(tournament_id), filename,
+                                             header=PREDICTION_EXPORT_COLUMNS)
+            return [filename]
+
+        return self.report_jobs.submit("pronostici_csv", [export])
+
+    def export_predictions_to_parquet(self, filename, all_tournaments=False):
+        # Formato colonnare per l'analisi con pandas: una giornata alla volta in memoria
+        tournament_id = None if all_tournaments else self.active_tournament.id
+
+        def export():
+            self.data_exporter.export_to_parquet(self.model.iter_prediction_batches(tournament_id), filename)
+            return [filename]
+
+        return self.report_jobs.submit("pronostici_parquet", [export])
 
     # Metodi di supporto
     def are_all_participants_added(self):
@@ -366,34 +613,74 @@ class MainViewModel(QObject):
             return False
         return datetime.now().date() >= self.current_round.date and datetime.now().time() >= time(12, 0)
 
+    def submit_report_job(self, name, generate, export):
+        # Il motore dei punteggi si prepara qui, sul thread della GUI, così i job lo trovano già
+        # caricato e le scritture successive continuano a tenerlo allineato
+        tournament_id = self.active_tournament.id
+        self.model.get_scoring_engine(tournament_id)
+        return self.report_jobs.submit(name, [
+            lambda: generate(tournament_id),
+            export,
+        ])
+
+    def cancel_report(self, job_id):
+        self.report_jobs.cancel(job_id)
+
+    def running_reports(self):
+        # Id dei job in coda o in esecuzione, nell'ordine di avvio
+        return list(self.report_jobs.jobs)
+
     def generate_and_export_participant_performance_report(self, filename):
-        df, img_buffer = self.report_generator.generate_participant_performance_report(self.active_tournament.id)
-        self.data_exporter.export_participant_performance(df, img_buffer, filename)
+        return self.submit_report_job(
+            "prestazioni_partecipanti",
+            self.report_generator.generate_participant_performance_report,
+            lambda report: self.data_exporter.export_participant_performance(*report, filename)
+        )
 
     def generate_and_export_most_predicted_teams_report(self, filename):
-        series, img_buffer = self.report_generator.generate_most_predicted_teams_report(self.active_tournament.id)
-        self.data_exporter.export_most_predicted_teams(series, img_buffer, filename)
+        return self.submit_report_job(
+            "squadre_piu_pronosticate",
+            self.report_generator.generate_most_predicted_teams_report,
+            lambda report: self.data_exporter.export_most_predicted_teams(*report, filename)
+        )
 
     def generate_and_export_weekly_prizes_report(self, filename):
-        df, img_buffer = self.report_generator.generate_weekly_prizes_report(self.active_tournament.id)
-        self.data_exporter.export_weekly_prizes(df, img_buffer, filename)
+        return self.submit_report_job(
+            "premi_settimanali",
+            self.report_generator.generate_weekly_prizes_report,
+            lambda report: self.data_exporter.export_weekly_prizes(*report, filename)
+        )
 
     def generate_and_export_final_standings_report(self, filename):
-        df, img_buffer = self.report_generator.generate_final_standings_report(self.active_tournament.id)
-        self.data_exporter.export_final_standings(df, img_buffer, filename)
+        return self.submit_report_job(
+            "classifica_finale",
+            self.report_generator.generate_final_standings_report,
+            lambda report: self.data_exporter.export_final_standings(*report, filename)
+        )
+
+    def export_all_reports(self, directory):
+        # Tutti i report in una volta: i dati si leggono una sola volta, il disegno e
+        # l'esportazione girano in parallelo in un pool di processi
+        return self.submit_report_job(
+            "tutti_i_report",
+            self.report_generator.collect_report_data,
+            lambda data: self.report_generator.export_all_reports(data, directory)
+        )
 
     def save_tournament(self):
         try:
-            self.model.session.commit()
+            self.model.save_changes()
             self.notification_manager.notify("Salvataggio", "Torneo salvato con successo")
         except Exception as e:
             self.error_occurred.emit(f"Errore durante il salvataggio: {str(e)}")
 
+    @tracked_action()
     def load_tournament(self, tournament_id):
         try:
             tournament = self.model.session.query(Tournament).get(tournament_id)
             if tournament:
                 self.active_tournament = tournament
+                self.standings = None
                 self.tournament_updated.emit(tournament)
                 self.update_tournament_state()
             else:
@@ -401,18 +688,14 @@ class MainViewModel(QObject):
         except Exception as e:
             self.error_occurred.emit(f"Errore durante il caricamento del torneo: {str(e)}")
 
+    @tracked_action()
     def delete_tournament(self, tournament_id):
         try:
-            tournament = self.model.session.query(Tournament).get(tournament_id)
-            if tournament:
-                self.model.session.delete(tournament)
-                self.model.session.commit()
-                self.notification_manager.notify("Eliminazione", "Torneo eliminato con successo")
-                if self.active_tournament and self.active_tournament.id == tournament_id:
-                    self.active_tournament = None
-                    self.tournament_updated.emit(None)
-            else:
-                raise ValueError("Torneo non trovato")
+            self.model.delete_tournament(tournament_id)
+            self.notification_manager.notify("Eliminazione", "Torneo eliminato con successo")
+            if self.active_tournament and self.active_tournament.id == tournament_id:
+                self.active_tournament = None
+                self.tournament_updated.emit(None)
         except Exception as e:
             self.error_occurred.emit(f"Errore durante l'eliminazione del torneo: {str(e)}")
 
@@ -424,32 +707,19 @@ class MainViewModel(QObject):
             self.validator.validate_prize_distribution(distribution)
             if self.active_tournament:
                 # Aggiorna la distribuzione dei premi nel database
-                self.active_tournament.final_prizes_distribution = distribution
-                self.model.session.commit()
+                with self.model.transaction():
+                    self.active_tournament.final_prizes_distribution = distribution
                 self.notification_manager.notify("Aggiornamento", "Distribuzione dei premi aggiornata con successo")
             else:
                 raise StateError("Nessun torneo attivo")
         except (ValidationError, StateError) as e:
             self.error_occurred.emit(str(e))
 
+    @tracked_action()
     def get_tournament_statistics(self):
         if not self.active_tournament:
             raise StateError("Nessun torneo attivo")
-        
-        stats = {
-            'total_participants': self.active_tournament.num_participants,
-            'completed_rounds': self.model.session.query(Round).filter(
-                Round.tournament_id == self.active_tournament.id,
-                Round.state == RoundState.ROUND_CONCLUDED
-            ).count(),
-            'total_matches': self.model.session.query(Match).join(Round).filter(
-                Round.tournament_id == self.active_tournament.id
-            ).count(),
-            'total_predictions': self.model.session.query(Prediction).join(Match).join(Round).filter(
-                Round.tournament_id == self.active_tournament.id
-            ).count(),
-        }
-        return stats
+        return self.model.get_tournament_statistics(self.active_tournament.id)
 
     def notify_upcoming_round(self):
         if self.current_round and self.current_round.date:
@@ -473,20 +743,19 @@ class MainViewModel(QObject):
             # Per ora, chiediamo all'utente di inserire il nuovo risultato
             new_result = yield f"Inserisci il nuovo risultato per {match.home_team} vs {match.away_team}"
             if new_result in [MatchResult.WIN_HOME, MatchResult.DRAW, MatchResult.WIN_AWAY]:
-                match.result = new_result
-                self.model.session.commit()
+                self.enter_match_result(match.id, new_result.value)
                 self.notification_manager.notify("Aggiornamento", f"Risultato aggiornato per {match.home_team} vs {match.away_team}")
 
+    @tracked_action()
     def get_participant_performance(self, participant_id):
         if not self.active_tournament:
             raise StateError("Nessun torneo attivo")
         
-        performance = []
-        for round in self.active_tournament.rounds:
-            score = self.model.calculate_round_scores(round.id).get(participant_id, 0)
-            performance.append((round.round_number, score))
-        return performance
+        matrix = self.model.get_score_matrix(self.active_tournament.id)
+        scores = matrix.participant_scores(participant_id)
+        return [(round_number, int(score)) for round_number, score in zip(matrix.round_numbers, scores)]
 
+    @tracked_action()
     def get_most_successful_predictions(self):
         if not self.active_tournament:
             raise StateError("Nessun torneo attivo")
@@ -502,15 +771,15 @@ class MainViewModel(QObject):
 
         return [(result.value, count) for result, count in correct_predictions]
 
+    @tracked_action()
     def get_participant_streak(self, participant_id):
         if not self.active_tournament:
             raise StateError("Nessun torneo attivo")
         
-        rounds = self.model.get_rounds(self.active_tournament.id)
+        matrix = self.model.get_score_matrix(self.active_tournament.id)
         current_streak = 0
         max_streak = 0
-        for round in rounds:
-            score = self.model.calculate_round_scores(round.id).get(participant_id, 0)
+        for score in matrix.participant_scores(participant_id):
             if score > 0:
                 current_streak += 1
                 max_streak = max(max_streak, current_streak)
@@ -518,15 +787,13 @@ class MainViewModel(QObject):
                 current_streak = 0
         return max_streak
 
+    @tracked_action()
     def get_head_to_head(self, participant1_id, participant2_id):
         if not self.active_tournament:
             raise StateError("Nessun torneo attivo")
         
-        rounds = self.model.get_rounds(self.active_tournament.id)
-        head_to_head = []
-        for round in rounds:
-            scores = self.model.calculate_round_scores(round.id)
-            score1 = scores.get(participant1_id, 0)
-            score2 = scores.get(participant2_id, 0)
-            head_to_head.append((round.round_number, score1, score2))
-        return head_to_head
\ No newline at end of file
+        matrix = self.model.get_score_matrix(self.active_tournament.id)
+        scores1 = matrix.participant_scores(participant1_id)
+        scores2 = matrix.participant_scores(participant2_id)
+        return [(round_number, int(score1), int(score2))
+                for round_number, score1, score2 in zip(matrix.round_numbers, scores1, scores2)]
\ No newline at end of file
@@ -1,10 +1,13 @@
 from PyQt6.QtWidgets import (QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QPushButton, QLabel, QDoubleSpinBox,
                              QLineEdit, QListWidget, QMessageBox, QDateEdit, QScrollArea, QFileDialog, QPushButton,
                              QSpinBox, QGroupBox, QStackedWidget, QComboBox, QTableWidget, QGridLayout, QFrame, QWidget, 
-                             QTableWidgetItem, QInputDialog, QToolBar, QStatusBar, QSystemTrayIcon, QMenu, QApplication)
+                             QTableWidgetItem, QInputDialog, QToolBar, QStatusBar, QSystemTrayIcon, QMenu, QApplication,
+                             QTableView, QAbstractItemView, QListView)
 from PyQt6.QtGui import QIcon, QAction, QPageLayout
 from PyQt6.QtCore import Qt, QDate
 from utils.theme_manager import ThemeManager
+from views.table_models import (StandingsTableModel, ChoiceTableModel, ChoiceDelegate, ParticipantListModel,
+                                ParticipantDelegate, filter_proxy, RESULT_CHOICES)
 from models.tournament_model import TournamentState, RoundState
 
 class MainWindow(QMainWindow):
@@ -75,21 +78,32 @@ class MainWindow(QMainWindow):
         self.main_area = QStackedWidget()
         self.main_layout.addWidget(self.main_area, 3)
 
-        self.create_tournament_page = self.create_tournament_page()
-        self.add_participants_page = self.create_add_participants_page()
-        self.manage_round_page = self.create_manage_round_page()
-        self.enter_predictions_page = self.create_enter_predictions_page()
-        self.enter_results_page = self.create_enter_results_page()
-        self.view_standings_page = self.create_view_standings_page()
-        self.view_statistics_page = self.create_view_statistics_page()
-
-        self.main_area.addWidget(self.create_tournament_page)
-        self.main_area.addWidget(self.add_participants_page)
-        self.main_area.addWidget(self.manage_round_page)
-        self.main_area.addWidget(self.enter_predictions_page)
-        self.main_area.addWidget(self.enter_results_page)
-        self.main_area.addWidget(self.view_standings_page)
-        self.main_area.addWidget(self.view_statistics_page)
+        # Le pagine si costruiscono alla prima apertura (show_page); nel frattempo i loro dati
+        # vengono letti in background e al loro posto si vede il segnaposto di caricamento
+        self.page_builders = {
+            'create_tournament': self.create_tournament_page,
+            'add_participants': self.create_add_participants_page,
+            'manage_round': self.create_manage_round_page,
+            'enter_predictions': self.create_enter_predictions_page,
+            'enter_results': self.create_enter_results_page,
+            'view_standings': self.create_view_standings_page,
+            'view_statistics': self.create_view_statistics_page,
+        }
+        # Per ogni pagina: funzione che restituisce (lettura in background, popolamento) oppure None
+        self.page_data = {
+            'add_participants': self.participants_page_data,
+            'manage_round': self.manage_round_page_data,
+            'enter_predictions': self.enter_predictions_page_data,
+            'enter_results': self.enter_results_page_data,
+            'view_standings': self.view_standings_page_data,
+            'view_statistics': self.view_statistics_page_data,
+        }
+        self.pages = {}
+        self.current_page = None
+
+        self.loading_page = QLabel("Caricamento...")
+        self.loading_page.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.main_area.addWidget(self.loading_page)
 
     def setup_toolbar(self):
         toolbar = QToolBar()
@@ -103,10 +117,32 @@ class MainWindow(QMainWindow):
         export_action.triggered.connect(self.export_standings)
         toolbar.addAction(export_action)
 
+        export_reports_action = QAction(QIcon("icons/export.png"), "Esporta Tutti i Report", self)
+        export_reports_action.triggered.connect(self.export_all_reports)
+        toolbar.addAction(export_reports_action)
+
+        export_predictions_action = QAction(QIcon("icons/export.png"), "Esporta Pronostici", self)
+        export_predictions_action.triggered.connect(self.export_predictions)
+        toolbar.addAction(export_predictions_action)
+
+        export_metrics_action = QAction("Esporta Metriche", self)
+        export_metrics_action.triggered.connect(self.export_metrics)
+        toolbar.addAction(export_metrics_action)
+
+        restore_backup_action = QAction("Ripristina Backup", self)
+        restore_backup_action.triggered.connect(self.restore_backup)
+        toolbar.addAction(restore_backup_action)
+
     def setup_statusbar(self):
         self.statusbar = QStatusBar()
         self.setStatusBar(self.statusbar)
 
+        # Visibile solo mentre ci sono report in coda o in esecuzione
+        self.cancel_reports_btn = QPushButton("Annulla Report")
+        self.cancel_reports_btn.clicked.connect(self.cancel_reports)
+        self.cancel_reports_btn.setVisible(False)
+        self.statusbar.addPermanentWidget(self.cancel_reports_btn)
+
     def setup_system_tray(self):
         self.tray_icon = QSystemTrayIcon(self)
         self.tray_icon.setIcon(QIcon("icons/app_icon.png"))
@@ -151,11 +187,21 @@ class MainWindow(QMainWindow):
 
         # Segnali relativi agli errori
         self.viewmodel.error_occurred.connect(self.show_error)
+
+        # Segnali relativi ai report generati in background
+        self.viewmodel.backup_completed.connect(
+            lambda snapshot_id: self.statusbar.showMessage(f"Backup {snapshot_id} completato", 10000)
+        )
+        self.viewmodel.report_started.connect(self.update_cancel_reports_button)
+        self.viewmodel.report_progress.connect(self.on_report_progress)
+        self.viewmodel.report_finished.connect(self.on_report_finished)
+        self.viewmodel.report_failed.connect(self.on_report_failed)
+        self.viewmodel.report_cancelled.connect(self.on_report_cancelled)
+        self.viewmodel.page_loader.failed.connect(self.on_page_load_failed)
         
         # Connessione dei pulsanti
         self.new_tournament_btn.clicked.connect(self.show_create_tournament_page)
         self.add_participants_btn.clicked.connect(self.show_add_participants_page)
-        self.set_date_btn.clicked.connect(self.set_round_date)
         self.manage_round_btn.clicked.connect(self.show_manage_round_page)
         self.enter_predictions_btn.clicked.connect(self.show_enter_predictions_page)
         self.enter_results_btn.clicked.connect(self.show_enter_results_page)
@@ -299,13 +345,31 @@ class MainWindow(QMainWindow):
         self.remaining_slots_label = QLabel()
         layout.addWidget(self.remaining_slots_label)
 
-        # Griglia scrollable per i partecipanti
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_content = QWidget()
-        self.participants_grid = QGridLayout(scroll_content)
-        scroll_area.setWidget(scroll_content)
-        layout.addWidget(scroll_area)
+        # Filtro sui nomi dei partecipanti
+        self.participants_model = ParticipantListModel(self)
+        self.participants_proxy = filter_proxy(self.participants_model, filter_column=0, parent=self)
+        self.participants_proxy.setFilterRole(Qt.ItemDataRole.EditRole)
+        self.participants_filter_input = QLineEdit()
+        self.participants_filter_input.setPlaceholderText("Cerca partecipante...")
+        self.participants_filter_input.textChanged.connect(self.participants_proxy.setFilterFixedString)
+        layout.addWidget(self.participants_filter_input)
+
+        # Griglia dei partecipanti: vengono disegnati solo gli elementi visibili
+        self.participants_delegate = ParticipantDelegate(parent=self)
+        self.participants_delegate.edit_requested.connect(self.edit_participant)
+        self.participants_view = QListView()
+        self.participants_view.setModel(self.participants_proxy)
+        self.participants_view.setItemDelegate(self.participants_delegate)
+        self.participants_view.setViewMode(QListView.ViewMode.IconMode)
+        self.participants_view.setFlow(QListView.Flow.LeftToRight)
+        self.participants_view.setWrapping(True)
+        self.participants_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.participants_view.setMovement(QListView.Movement.Static)
+        self.participants_view.setUniformItemSizes(True)
+        self.participants_view.setGridSize(ParticipantDelegate.ITEM_SIZE)
+        self.participants_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.participants_view.activated.connect(self.participants_delegate.request_edit)
+        layout.addWidget(self.participants_view)
 
         return page
 
@@ -370,6 +434,10 @@ class MainWindow(QMainWindow):
         
         self.set_date_btn = QPushButton("Imposta Data")
         self.set_date_btn.clicked.connect(self.set_round_date)
+        # round_updated e round_date_set emessi prima della costruzione della pagina non sono
+        # arrivati qui: data e stato dei controlli si leggono dalla giornata corrente
+        if self.viewmodel.current_round:
+            self.show_round_date(self.viewmodel.current_round)
 
         self.matches_list = QListWidget()
 
@@ -397,20 +465,24 @@ class MainWindow(QMainWindow):
         return page
 
     def create_enter_predictions_page(self):
+        from views.prediction_matrix import PredictionMatrixModel, PredictionMatrixView
+
         page = QWidget()
         layout = QVBoxLayout(page)
 
-        self.participant_combo = QComboBox()
-        self.predictions_table = QTableWidget()
-        self.predictions_table.setColumnCount(4)
-        self.predictions_table.setHorizontalHeaderLabels(["Partita", "Casa", "Trasferta", "Pronostico"])
+        # Griglia partecipanti × partite: 1/X/2 da tastiera, Ctrl+V incolla da un foglio di calcolo
+        self.predictions_model = PredictionMatrixModel(self)
+        self.predictions_model.completion_changed.connect(self.update_predictions_completion)
+        self.predictions_table = PredictionMatrixView()
+        self.predictions_table.setModel(self.predictions_model)
+        self.predictions_completion_label = QLabel()
 
         save_btn = QPushButton("Salva Pronostici")
         save_btn.clicked.connect(self.save_predictions)
 
-        layout.addWidget(QLabel("Seleziona Partecipante:"))
-        layout.addWidget(self.participant_combo)
+        layout.addWidget(QLabel("Pronostici della giornata (1/X/2, Canc per cancellare, Ctrl+V per incollare):"))
         layout.addWidget(self.predictions_table)
+        layout.addWidget(self.predictions_completion_label)
         layout.addWidget(save_btn)
 
         return page
@@ -419,9 +491,8 @@ class MainWindow(QMainWindow):
         page = QWidget()
         layout = QVBoxLayout(page)
 
-        self.results_table = QTableWidget()
-        self.results_table.setColumnCount(4)
-        self.results_table.setHorizontalHeaderLabels(["Partita", "Casa", "Trasferta", "Risultato"])
+        self.results_model = ChoiceTableModel(["Partita", "Casa", "Trasferta", "Risultato"], RESULT_CHOICES, self)
+        self.results_table = self.create_choice_table(self.results_model, RESULT_CHOICES)
 
         save_btn = QPushButton("Salva Risultati")
         save_btn.clicked.connect(self.save_results)
@@ -435,14 +506,36 @@ class MainWindow(QMainWindow):
         page = QWidget()
         layout = QVBoxLayout(page)
 
-        self.standings_table = QTableWidget()
-        self.standings_table.setColumnCount(3)
-        self.standings_table.setHorizontalHeaderLabels(["Posizione", "Partecipante", "Punteggio"])
-
+        # Modello sulla classifica in memoria, con proxy per ordinamento e ricerca per nome
+        self.standings_model = StandingsTableModel(self)
+        self.standings_proxy = filter_proxy(self.standings_model, filter_column=1, parent=self)
+        self.standings_filter_input = QLineEdit()
+        self.standings_filter_input.setPlaceholderText("Cerca partecipante...")
+        self.standings_filter_input.textChanged.connect(self.standings_proxy.setFilterFixedString)
+
+        self.standings_table = QTableView()
+        self.standings_table.setModel(self.standings_proxy)
+        self.standings_table.setSortingEnabled(True)
+        self.standings_table.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self.standings_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.standings_table.horizontalHeader().setStretchLastSection(True)
+        self.standings_table.verticalHeader().setVisible(False)
+
+        layout.addWidget(self.standings_filter_input)
         layout.addWidget(self.standings_table)
 
         return page
 
+    def create_choice_table(self, model, choices):
+        # Tabella delle partite: la scelta si modifica con una tendina creata solo durante la modifica
+        table = QTableView()
+        table.setModel(filter_proxy(model, parent=table))
+        table.setItemDelegateForColumn(model.choice_column, ChoiceDelegate(choices, table))
+        table.setEditTriggers(QAbstractItemView.EditTrigger.AllEditTriggers)
+        table.setSortingEnabled(True)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
     def create_view_statistics_page(self):
         page = QWidget()
         layout = QVBoxLayout(page)
@@ -452,29 +545,115 @@ class MainWindow(QMainWindow):
 
         return page
 
+    def page(self, name):
+        page = self.pages.get(name)
+        if page is None:
+            page = self.pages[name] = self.page_builders[name]()
+            self.main_area.addWidget(page)
+        return page
+
+    def is_page_built(self, name):
+        return name in self.pages
+
+    def show_page(self, name):
+        first_time = not self.is_page_built(name)
+        page = self.page(name)
+        self.current_page = name
+        data = self.page_data[name]() if name in self.page_data else None
+        if data is None:
+            self.main_area.setCurrentWidget(page)
+            return
+
+        # Alla prima apertura si mostra il segnaposto fino all'arrivo dei dati; dopo, la pagina
+        # resta visibile e viene solo aggiornata
+        fetch, populate = data
+        self.main_area.setCurrentWidget(self.loading_page if first_time else page)
+
+        def on_loaded(result):
+            populate(result)
+            if self.current_page == name:
+                self.main_area.setCurrentWidget(page)
+
+        self.viewmodel.page_loader.load(name, fetch, on_loaded)
+
+    def on_page_load_failed(self, name, message):
+        if self.current_page == name:
+            self.main_area.setCurrentWidget(self.page(name))
+        self.show_error(f"Errore nel caricamento dei dati: {message}")
+
+    def participants_page_data(self):
+        if not self.viewmodel.active_tournament:
+            return None
+        tournament_id = self.viewmodel.active_tournament.id
+        return lambda: self.viewmodel.model.get_participants(tournament_id), self.update_participants_list
+
+    def manage_round_page_data(self):
+        if not self.viewmodel.current_round:
+            return None
+        round_id = self.viewmodel.current_round.id
+        return lambda: self.viewmodel.model.get_matches(round_id), self.update_matches_list
+
+    def enter_predictions_page_data(self):
+        if not self.viewmodel.active_tournament or not self.viewmodel.current_round:
+            return None
+        # Gli id si leggono qui, sul thread della GUI: il thread di lavoro non tocca il ViewModel
+        tournament_id, round_id = self.viewmodel.active_tournament.id, self.viewmodel.current_round.id
+
+        def populate(data):
+            # Alle aperture successive la griglia è già visibile: le modifiche non ancora salvate
+            # restano sopra i pronostici appena riletti
+            self.predictions_model.set_matrix(*data, keep_edits=True)
+            self.predictions_table.setFocus()
+        return lambda: self.viewmodel.model.get_matchday_predictions(tournament_id, round_id), populate
+
+    def enter_results_page_data(self):
+        if not self.viewmodel.current_round:
+            return None
+        round_id = self.viewmodel.current_round.id
+        return lambda: self.viewmodel.model.get_matches(round_id), self.update_results_table
+
+    def view_standings_page_data(self):
+        if not self.viewmodel.active_tournament:
+            return None
+        if self.viewmodel.standings is not None:
+            # Classifica già in memoria: nessuna lettura dal database
+            self.viewmodel.emit_standings()
+            return None
+        tournament_id = self.viewmodel.active_tournament.id
+
+        def populate(standings):
+            # Se nel frattempo la classifica è stata caricata o aggiornata, vale quella in memoria
+            if self.viewmodel.standings is None:
+                self.viewmodel.apply_standings(standings)
+                self.viewmodel.flush_updates()
+        return lambda: self.viewmodel.model.get_standings(tournament_id), populate
+
+    def view_statistics_page_data(self):
+        if not self.viewmodel.active_tournament:
+            return None
+        tournament_id = self.viewmodel.active_tournament.id
+        return lambda: self.viewmodel.model.get_tournament_statistics(tournament_id), self.show_statistics
+
     def show_create_tournament_page(self):
-        self.main_area.setCurrentWidget(self.create_tournament_page)
+        self.show_page('create_tournament')
 
     def show_add_participants_page(self):
-        self.main_area.setCurrentWidget(self.add_participants_page)
-        if self.viewmodel.active_tournament:
-            participants = self.viewmodel.model.get_participants(self.viewmodel.active_tournament.id)
-            self.update_participants_list(participants)
+        self.show_page('add_participants')
 
     def show_manage_round_page(self):
-        self.main_area.setCurrentWidget(self.manage_round_page)
+        self.show_page('manage_round')
 
     def show_enter_predictions_page(self):
-        self.main_area.setCurrentWidget(self.enter_predictions_page)
+        self.show_page('enter_predictions')
 
     def show_enter_results_page(self):
-        self.main_area.setCurrentWidget(self.enter_results_page)
+        self.show_page('enter_results')
 
     def show_view_standings_page(self):
-        self.main_area.setCurrentWidget(self.view_standings_page)
+        self.show_page('view_standings')
 
     def show_view_statistics_page(self):
-        self.main_area.setCurrentWidget(self.view_statistics_page)
+        self.show_page('view_statistics')
 
     def create_tournament(self):
         try:
@@ -507,6 +686,8 @@ class MainWindow(QMainWindow):
         self.viewmodel.set_round_date(selected_date)
     
     def disable_date_input(self, round_id):
+        if not self.is_page_built('manage_round'):
+            return
         if self.viewmodel.current_round and self.viewmodel.current_round.id == round_id:
             self.round_date_input.setEnabled(False)
             self.set_date_btn.setEnabled(False)
@@ -520,17 +701,12 @@ class MainWindow(QMainWindow):
             self.away_team_input.clear()
 
     def save_predictions(self):
-        participant_id = self.participant_combo.currentData()
-        for row in range(self.predictions_table.rowCount()):
-            match_id = self.predictions_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-            prediction = self.predictions_table.cellWidget(row, 3).currentText()
-            self.viewmodel.add_prediction(participant_id, match_id, prediction)
+        # Tutta la griglia in un'unica transazione, comprese le celle svuotate da cancellare
+        if self.viewmodel.submit_matchday_predictions(self.predictions_model.sheets()):
+            self.predictions_model.mark_saved()
 
     def save_results(self):
-        for row in range(self.results_table.rowCount()):
-            match_id = self.results_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-            result = self.results_table.cellWidget(row, 3).currentText()
-            self.viewmodel.enter_match_result(match_id, result)
+        self.viewmodel.enter_match_results(self.results_model.values())
 
     def on_tournament_created(self, tournament):
         QMessageBox.information(self, "Successo", f"Il torneo '{tournament.name}' è stato creato con successo!")
@@ -546,46 +722,22 @@ class MainWindow(QMainWindow):
         self.show_appropriate_page(state)
 
     def update_participants_list(self, participants):
-        # Rimuovi tutti i widget esistenti dalla griglia
-        while self.participants_grid.count():
-            item = self.participants_grid.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-
-        # Calcola il numero di colonne in base alla larghezza della finestra
-        grid_width = self.participants_grid.parent().width()
-        num_columns = max(1, grid_width // 200)  # Assumiamo che ogni elemento sia largo circa 200px
-
-        for index, participant in enumerate(participants):
-            row = index // num_columns
-            col = index % num_columns
-
-            # Crea un widget per ogni partecipante
-            participant_widget = QWidget()
-            participant_layout = QHBoxLayout(participant_widget)
-
-            label = QLabel(f"{index + 1}. {participant.name}")
-            edit_button = QPushButton()
-            edit_button.setIcon(QIcon("path/images/edit_icon.png"))  # Sostituisci con il percorso della tua icona
-            edit_button.clicked.connect(lambda checked, p=participant: self.edit_participant(p))
-
-            participant_layout.addWidget(label)
-            participant_layout.addWidget(edit_button)
-
-            self.participants_grid.addWidget(participant_widget, row, col)
-
+        if not self.is_page_built('add_participants'):
+            return
+        self.participants_model.set_participants(participants)
         self.update_remaining_slots(len(participants))
 
-    def edit_participant(self, participant):
-        new_name, ok = QInputDialog.getText(self, "Modifica Partecipante", "Nuovo nome:", text=participant.name)
+    def edit_participant(self, participant_id, current_name):
+        new_name, ok = QInputDialog.getText(self, "Modifica Partecipante", "Nuovo nome:", text=current_name)
         if ok and new_name:
             try:
-                self.viewmodel.edit_participant(participant.id, new_name)
+                self.viewmodel.edit_participant(participant_id, new_name)
             except Exception as e:
                 QMessageBox.critical(self, "Errore", f"Impossibile modificare il partecipante: {str(e)}")
 
     def update_remaining_slots(self, current_participants):
+        if not self.is_page_built('add_participants'):
+            return
         remaining = self.viewmodel.active_tournament.num_participants - current_participants
         self.remaining_slots_label.setText(f"Posti rimanenti: {remaining}")
         if remaining == 0:
@@ -606,12 +758,19 @@ class MainWindow(QMainWindow):
     def on_round_updated(self, round):
         self.round_number_label.setText(f"Numero Giornata: {round.round_number}")
         self.round_state_label.setText(f"Stato Giornata: {round.state.name}")
+        if self.is_page_built('manage_round'):
+            self.show_round_date(round)
+
+    def show_round_date(self, round):
         if round.date:
            self.round_date_input.setDate(round.date)
         else:
-            # Impostiamo una data predefinita, ad esempio la prossima domenica
-            next_sunday = self.viewmodel.get_next_sunday()
-            self.round_date_input.setDate(next_sunday)
+            # Data predefinita: oggi, oppure l'inizio del torneo se è ancora futuro
+            self.round_date_input.setDate(self.viewmodel.get_today_or_future_date())
+        # La data si sceglie una sola volta per giornata (vedi disable_date_input)
+        date_editable = round.state in [RoundState.CREATING_FIRST_ROUND, RoundState.CREATING_NEXT_ROUND, RoundState.SELECTING_DATE]
+        self.round_date_input.setEnabled(date_editable)
+        self.set_date_btn.setEnabled(date_editable)
 
     def on_round_state_changed(self, round_number, state):
         self.round_state_label.setText(f"Stato Giornata: {state.name}")
@@ -619,41 +778,32 @@ class MainWindow(QMainWindow):
         self.show_appropriate_round_page(state)
 
     def update_matches_list(self, matches):
+        if not self.is_page_built('manage_round'):
+            return
         self.matches_list.clear()
         for match in matches:
             self.matches_list.addItem(f"{match.home_team} vs {match.away_team}")
 
     def update_predictions_table(self, predictions):
-        self.predictions_table.setRowCount(len(predictions))
-        for row, prediction in enumerate(predictions):
-            self.predictions_table.setItem(row, 0, QTableWidgetItem(f"{prediction.match.home_team} vs {prediction.match.away_team}"))
-            self.predictions_table.item(row, 0).setData(Qt.ItemDataRole.UserRole, prediction.match.id)
-            self.predictions_table.setItem(row, 1, QTableWidgetItem(prediction.match.home_team))
-            self.predictions_table.setItem(row, 2, QTableWidgetItem(prediction.match.away_team))
-            combo = QComboBox()
-            combo.addItems(["1", "X", "2"])
-            combo.setCurrentText(prediction.prediction)
-            self.predictions_table.setCellWidget(row, 3, combo)
+        if not self.is_page_built('enter_predictions'):
+            return
+        self.predictions_model.apply_predictions(predictions)
+
+    def update_predictions_completion(self, filled, total, complete):
+        self.predictions_completion_label.setText(
+            f"Pronostici inseriti: {filled}/{total} - Schedine complete: {complete}/{self.predictions_model.rowCount()}"
+        )
 
     def update_results_table(self, matches):
-        self.results_table.setRowCount(len(matches))
-        for row, match in enumerate(matches):
-            self.results_table.setItem(row, 0, QTableWidgetItem(f"{match.home_team} vs {match.away_team}"))
-            self.results_table.item(row, 0).setData(Qt.ItemDataRole.UserRole, match.id)
-            self.results_table.setItem(row, 1, QTableWidgetItem(match.home_team))
-            self.results_table.setItem(row, 2, QTableWidgetItem(match.away_team))
-            combo = QComboBox()
-            combo.addItems(["1", "X", "2", "Sospesa", "Posticipata", "Rinviata", "Annullata"])
-            if match.result:
-                combo.setCurrentText(match.result.value)
-            self.results_table.setCellWidget(row, 3, combo)
+        if not self.is_page_built('enter_results'):
+            return
+        self.results_model.set_matches(matches, {m.id: m.result.value for m in matches if m.result})
 
     def update_standings(self, standings):
-        self.standings_table.setRowCount(len(standings))
-        for row, (participant, score) in enumerate(standings):
-            self.standings_table.setItem(row, 0, QTableWidgetItem(str(row + 1)))
-            self.standings_table.setItem(row, 1, QTableWidgetItem(participant))
-            self.standings_table.setItem(row, 2, QTableWidgetItem(str(score)))
+        # Solo le righe con posizione, nome o punteggio cambiati vengono ridisegnate
+        if not self.is_page_built('view_standings'):
+            return
+        self.standings_model.set_standings(standings)
 
     def show_weekly_prize_winners(self, amount, winners):
         winners_str = ", ".join(winners)
@@ -669,8 +819,6 @@ class MainWindow(QMainWindow):
         active_tournament = self.viewmodel.load_active_tournament()
         if active_tournament:
             self.update_tournament_info(active_tournament)
-            participants = self.viewmodel.model.get_participants(active_tournament.id)
-            self.update_participants_list(participants)
             self.show_appropriate_page(active_tournament.state)
         else:
             self.show_create_tournament_page()
@@ -717,6 +865,32 @@ class MainWindow(QMainWindow):
     def show_error(self, message):
         QMessageBox.critical(self, "Errore", message)
 
+    def on_report_progress(self, job_id, percent):
+        self.statusbar.showMessage(f"Report {job_id}: {percent}%")
+
+    def on_report_finished(self, job_id, files):
+        self.update_cancel_reports_button()
+        self.statusbar.showMessage(f"Report {job_id} completato: {', '.join(files)}", 10000)
+
+    def on_report_failed(self, job_id, message):
+        self.update_cancel_reports_button()
+        self.statusbar.clearMessage()
+        self.show_error(f"Errore nella generazione del report {job_id}: {message}")
+
+    def on_report_cancelled(self, job_id):
+        self.update_cancel_reports_button()
+        self.statusbar.showMessage(f"Report {job_id} annullato", 10000)
+
+    def update_cancel_reports_button(self):
+        self.cancel_reports_btn.setVisible(bool(self.viewmodel.running_reports()))
+
+    def cancel_reports(self):
+        # Un job già in esecuzione si ferma alla fine del passo in corso (lettura dati o esportazione)
+        for job_id in self.viewmodel.running_reports():
+            self.viewmodel.cancel_report(job_id)
+        if self.viewmodel.running_reports():
+            self.statusbar.showMessage("Annullamento dei report in corso...")
+
     def export_standings(self):
         filename, _ = QFileDialog.getSaveFileName(self, "Esporta Classifica", "", "CSV Files (*.csv);;PDF Files (*.pdf)")
         if filename:
@@ -726,6 +900,56 @@ class MainWindow(QMainWindow):
                 self.viewmodel.export_standings_to_pdf(filename)
             QMessageBox.information(self, "Esportazione Completata", f"La classifica è stata esportata in {filename}")
 
+    def export_all_reports(self):
+        if not self.viewmodel.active_tournament:
+            self.show_error("Nessun torneo attivo")
+            return
+        directory = QFileDialog.getExistingDirectory(self, "Cartella dei Report")
+        if directory:
+            self.viewmodel.export_all_reports(directory)
+            self.statusbar.showMessage("Generazione dei report in corso...")
+
+    def export_predictions(self):
+        if not self.viewmodel.active_tournament:
+            self.show_error("Nessun torneo attivo")
+            return
+        filename, _ = QFileDialog.getSaveFileName(self, "Esporta Pronostici", "",
+                                                  "CSV Files (*.csv);;Parquet Files (*.parquet)")
+        if filename:
+            all_tournaments = QMessageBox.question(
+                self, "Esporta Pronostici", "Esportare i pronostici di tutti i tornei?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No
+            ) == QMessageBox.StandardButton.Yes
+            if filename.endswith('.parquet'):
+                self.viewmodel.export_predictions_to_parquet(filename, all_tournaments)
+            else:
+                self.viewmodel.export_predictions_to_csv(filename, all_tournaments)
+            self.statusbar.showMessage("Esportazione dei pronostici in corso...")
+
+    def export_metrics(self):
+        filename, _ = QFileDialog.getSaveFileName(self, "Esporta Metriche", "metriche.json", "JSON Files (*.json)")
+        if filename:
+            self.viewmodel.dump_metrics(filename)
+            self.statusbar.showMessage(f"Metriche esportate in {filename}", 10000)
+
+    def restore_backup(self):
+        backups = {f"{b['id']} ({b['created']})": b['id'] for b in self.viewmodel.list_backups()}
+        if not backups:
+            QMessageBox.information(self, "Ripristina Backup", "Nessun backup disponibile.")
+            return
+        choice, ok = QInputDialog.getItem(self, "Ripristina Backup", "Backup da ripristinare:", list(backups), 0, False)
+        if not ok:
+            return
+        reply = QMessageBox.question(self, "Conferma Ripristino",
+                                     "I dati attuali verranno sostituiti dal backup selezionato. Continuare?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                     QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes and self.viewmodel.restore_backup(backups[choice]):
+            self.load_active_tournament()
+            self.update_button_states()
+            self.statusbar.showMessage(f"Backup {backups[choice]} ripristinato", 10000)
+
     def closeEvent(self, event):
         reply = QMessageBox.question(self, 'Conferma Uscita',
                                      "Sei sicuro di voler chiudere l'applicazione?",
@@ -734,12 +958,17 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             self.viewmodel.save_tournament()
+            self.viewmodel.stop_background_services()
             event.accept()
         else:
             event.ignore()
 
     def update_statistics(self):
-        stats = self.viewmodel.get_tournament_statistics()
+        self.show_statistics(self.viewmodel.get_tournament_statistics())
+
+    def show_statistics(self, stats):
+        if not self.is_page_built('view_statistics'):
+            return
         stats_text = f"""
         Statistiche del Torneo:
         Partecipanti Totali: {stats['total_participants']}
@@ -797,10 +1026,12 @@ class MainWindow(QMainWindow):
         self.viewmodel.notify_upcoming_round()
 
     def check_suspended_matches(self):
-        for match, new_result in self.viewmodel.check_and_update_suspended_matches():
-            result, ok = QInputDialog.getItem(self, f"Aggiorna Risultato",
-                                              f"Nuovo risultato per {match.home_team} vs {match.away_team}:",
-                                              ["1", "X", "2", "Sospesa", "Posticipata", "Rinviata", "Annullata"],
-                                              0, False)
-            if ok:
-                new_result(result)
\ No newline at end of file
+        # Classifica e risultati si aggiornano una volta sola, dopo l'ultima partita
+        with self.viewmodel.batch_updates():
+            for match, new_result in self.viewmodel.check_and_update_suspended_matches():
+                result, ok = QInputDialog.getItem(self, f"Aggiorna Risultato",
+                                                  f"Nuovo risultato per {match.home_team} vs {match.away_team}:",
+                                                  ["1", "X", "2", "Sospesa", "Posticipata", "Rinviata", "Annullata"],
+                                                  0, False)
+                if ok:
+                    new_result(result)
\ No newline at end of file
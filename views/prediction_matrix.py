@@ -0,0 +1,235 @@
+import numpy as np
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QKeySequence
+from PyQt6.QtWidgets import QTableView, QAbstractItemView, QApplication
+from models.scoring_engine import MISSING, OUTCOME_CODES, CODE_OUTCOMES
+
+# Tasti e testi incollati accettati per una cella: "1", "X" (anche minuscola), "2"
+PREDICTION_CODES = {result.value: code for result, code in OUTCOME_CODES.items()}
+CLEAR_KEYS = (Qt.Key.Key_Delete, Qt.Key.Key_Backspace)
+
+
+class PredictionMatrixModel(QAbstractTableModel):
+    # Pronostici dell'intera giornata: righe = partecipanti, colonne = partite, celle codificate
+    # in una matrice int8 come nel ScoringEngine (0 = mancante). I conteggi di completamento sono
+    # aggiornati ad ogni modifica ed emessi con completion_changed(inseriti, totali, schedine complete).
+    # saved contiene i codici presenti nel database: le celle che ne differiscono sono modifiche
+    # non salvate, e svuotare una cella salvata significa cancellarne il pronostico
+    completion_changed = pyqtSignal(int, int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.participant_ids = []
+        self.participant_names = []
+        self.match_ids = []
+        self.match_labels = []
+        self.participant_index = {}
+        self.match_index = {}
+        self.codes = np.zeros((0, 0), dtype=np.int8)
+        self.saved = np.zeros((0, 0), dtype=np.int8)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.participant_ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.match_ids)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal:
+                return self.match_labels[section]
+            filled = int(np.count_nonzero(self.codes[section]))
+            return f"{self.participant_names[section]} ({filled}/{len(self.match_ids)})"
+        if role == Qt.ItemDataRole.ToolTipRole and orientation == Qt.Orientation.Horizontal:
+            return self.match_labels[section].replace("\n", " vs ")
+        return None
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemFlag.ItemIsEditable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            code = int(self.codes[index.row(), index.column()])
+            return CODE_OUTCOMES[code].value if code != MISSING else ""
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return False
+        code = self.encode(value)
+        if code is None:
+            return False
+        if self.codes[index.row(), index.column()] != code:
+            self.codes[index.row(), index.column()] = code
+            self.dataChanged.emit(index, index)
+            self.headerDataChanged.emit(Qt.Orientation.Vertical, index.row(), index.row())
+            self.emit_completion()
+        return True
+
+    @staticmethod
+    def encode(value):
+        # Codice della cella per un testo digitato o incollato; "" svuota, None se non valido
+        value = str(value).strip().upper()
+        if not value:
+            return MISSING
+        return PREDICTION_CODES.get(value)
+
+    def set_matrix(self, participants, matches, predictions, keep_edits=False):
+        # keep_edits: le modifiche non salvate restano sopra i pronostici ricaricati, per i
+        # partecipanti e le partite ancora presenti
+        edits = self.unsaved_edits() if keep_edits else {}
+        self.beginResetModel()
+        self.participant_ids = [p.id for p in participants]
+        self.participant_names = [p.name for p in participants]
+        self.match_ids = [m.id for m in matches]
+        self.match_labels = [f"{m.home_team}\n{m.away_team}" for m in matches]
+        self.participant_index = {pid: row for row, pid in enumerate(self.participant_ids)}
+        self.match_index = {mid: col for col, mid in enumerate(self.match_ids)}
+        self.codes = np.zeros((len(self.participant_ids), len(self.match_ids)), dtype=np.int8)
+        self.saved = np.zeros(self.codes.shape, dtype=np.int8)
+        self._store_predictions(predictions)
+        for (participant_id, match_id), code in edits.items():
+            row = self.participant_index.get(participant_id)
+            col = self.match_index.get(match_id)
+            if row is not None and col is not None:
+                self.codes[row, col] = code
+        self.endResetModel()
+        self.emit_completion()
+
+    def unsaved_edits(self):
+        # {(participant_id, match_id): codice} delle celle diverse da quanto salvato
+        rows, cols = np.nonzero(self.codes != self.saved)
+        return {(self.participant_ids[row], self.match_ids[col]): int(self.codes[row, col])
+                for row, col in zip(rows.tolist(), cols.tolist())}
+
+    def has_unsaved_edits(self):
+        return bool((self.codes != self.saved).any())
+
+    def apply_predictions(self, predictions):
+        # Pronostici salvati (anche di una parte dei partecipanti): un solo aggiornamento della vista
+        if self._store_predictions(predictions) and self.codes.size:
+            self.dataChanged.emit(self.index(0, 0), self.index(self.codes.shape[0] - 1, self.codes.shape[1] - 1))
+            self.headerDataChanged.emit(Qt.Orientation.Vertical, 0, self.codes.shape[0] - 1)
+            self.emit_completion()
+
+    def _store_predictions(self, predictions):
+        stored = 0
+        for p in predictions:
+            row = self.participant_index.get(p.participant_id)
+            col = self.match_index.get(p.match_id)
+            if row is not None and col is not None:
+                self.codes[row, col] = self.saved[row, col] = OUTCOME_CODES.get(p.prediction, MISSING)
+                stored += 1
+        return stored
+
+    def mark_saved(self):
+        # Dopo un salvataggio riuscito il database contiene esattamente le celle inserite
+        self.saved = self.codes.copy()
+
+    def paste(self, top, left, text):
+        # Blocco tabulato (come copiato da un foglio di calcolo) a partire dalla cella (top, left).
+        # Le celle vuote lasciano il valore attuale, quelle non valide vengono scartate.
+        # Restituisce (celle impostate, celle scartate)
+        lines = text.rstrip("\r\n").splitlines()
+        block = [line.split("\t") for line in lines]
+        rows, cols = self.codes.shape
+        applied = rejected = 0
+        bottom, right = top - 1, left - 1
+        for r, values in enumerate(block, start=top):
+            if r >= rows:
+                break
+            for c, value in enumerate(values, start=left):
+                if c >= cols or not value.strip():
+                    continue
+                code = self.encode(value)
+                if code is None:
+                    rejected += 1
+                    continue
+                self.codes[r, c] = code
+                applied += 1
+                bottom, right = max(bottom, r), max(right, c)
+        if applied:
+            self.dataChanged.emit(self.index(top, left), self.index(bottom, right))
+            self.headerDataChanged.emit(Qt.Orientation.Vertical, top, bottom)
+            self.emit_completion()
+        return applied, rejected
+
+    def clear(self, top, left, bottom, right):
+        self.codes[top:bottom + 1, left:right + 1] = MISSING
+        self.dataChanged.emit(self.index(top, left), self.index(bottom, right))
+        self.headerDataChanged.emit(Qt.Orientation.Vertical, top, bottom)
+        self.emit_completion()
+
+    def copy(self, top, left, bottom, right):
+        return "\n".join(
+            "\t".join(self.data(self.index(r, c)) for c in range(left, right + 1))
+            for r in range(top, bottom + 1)
+        )
+
+    def completion(self):
+        filled = int(np.count_nonzero(self.codes))
+        complete = int(np.count_nonzero((self.codes != MISSING).all(axis=1))) if self.codes.shape[1] else 0
+        return filled, self.codes.size, complete
+
+    def emit_completion(self):
+        self.completion_changed.emit(*self.completion())
+
+    def sheets(self):
+        # {participant_id: {match_id: pronostico}} con le celle inserite e None per quelle salvate
+        # e poi svuotate, nel formato di MainViewModel.submit_matchday_predictions
+        sheets = {}
+        rows, cols = np.nonzero((self.codes != MISSING) | (self.saved != MISSING))
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            sheet = sheets.setdefault(self.participant_ids[row], {})
+            code = int(self.codes[row, col])
+            sheet[self.match_ids[col]] = CODE_OUTCOMES[code].value if code != MISSING else None
+        return sheets
+
+
+class PredictionMatrixView(QTableView):
+    # Inserimento da tastiera: 1/X/2 scrivono la cella e passano alla successiva (a fine riga si va
+    # al partecipante seguente), Canc/Backspace svuotano la selezione, Ctrl+C/Ctrl+V copiano e incollano
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ContiguousSelection)
+        self.horizontalHeader().setDefaultSectionSize(72)
+        self.verticalHeader().setDefaultSectionSize(24)
+
+    def keyPressEvent(self, event):
+        model = self.model()
+        index = self.currentIndex()
+        if model is None or not index.isValid():
+            super().keyPressEvent(event)
+            return
+
+        if event.matches(QKeySequence.StandardKey.Paste):
+            model.paste(index.row(), index.column(), QApplication.clipboard().text())
+        elif event.matches(QKeySequence.StandardKey.Copy):
+            top, left, bottom, right = self.selected_block()
+            QApplication.clipboard().setText(model.copy(top, left, bottom, right))
+        elif event.key() in CLEAR_KEYS:
+            model.clear(*self.selected_block())
+        elif event.text().upper() in PREDICTION_CODES:
+            model.setData(index, event.text())
+            self.move_to_next_cell(index)
+        else:
+            super().keyPressEvent(event)
+
+    def selected_block(self):
+        indexes = self.selectedIndexes() or [self.currentIndex()]
+        rows = [i.row() for i in indexes]
+        cols = [i.column() for i in indexes]
+        return min(rows), min(cols), max(rows), max(cols)
+
+    def move_to_next_cell(self, index):
+        model = self.model()
+        row, col = index.row(), index.column() + 1
+        if col >= model.columnCount():
+            row, col = row + 1, 0
+        if row < model.rowCount():
+            self.setCurrentIndex(model.index(row, col))
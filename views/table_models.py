@@ -0,0 +1,235 @@
+from PyQt6.QtCore import (Qt, QAbstractTableModel, QAbstractListModel, QModelIndex, QSortFilterProxyModel, QEvent,
+                          QRect, QSize, pyqtSignal)
+from PyQt6.QtGui import QIcon
+from PyQt6.QtWidgets import (QStyledItemDelegate, QComboBox, QStyle, QStyleOptionButton, QStyleOptionViewItem,
+                             QApplication)
+
+PREDICTION_CHOICES = ["1", "X", "2"]
+RESULT_CHOICES = ["1", "X", "2", "Sospesa", "Posticipata", "Rinviata", "Annullata"]
+# Cella di una ChoiceTableModel non ancora compilata: non compare in values()
+NO_CHOICE = ""
+
+
+class RowTableModel(QAbstractTableModel):
+    # Tabella in sola lettura su una lista di tuple (una per riga) e una chiave per riga
+    # (es. l'id della partita). set_rows confronta le nuove righe con quelle attuali e notifica
+    # alla vista solo gli intervalli di righe cambiati: nessun oggetto Qt per cella
+    def __init__(self, headers, parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        self.rows = []
+        self.keys = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self.rows[index.row()][index.column()]
+        if role == Qt.ItemDataRole.UserRole:
+            return self.keys[index.row()]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def set_rows(self, rows, keys=None):
+        rows = [tuple(row) for row in rows]
+        keys = list(range(len(rows))) if keys is None else list(keys)
+        if len(rows) != len(self.rows):
+            self.beginResetModel()
+            self.rows, self.keys = rows, keys
+            self.endResetModel()
+            return
+
+        old_rows = self.rows
+        self.rows, self.keys = rows, keys
+        start = None
+        for row in range(len(rows) + 1):
+            changed = row < len(rows) and rows[row] != old_rows[row]
+            if changed and start is None:
+                start = row
+            elif not changed and start is not None:
+                self.dataChanged.emit(self.index(start, 0), self.index(row - 1, len(self.headers) - 1))
+                start = None
+
+
+class StandingsTableModel(RowTableModel):
+    def __init__(self, parent=None):
+        super().__init__(["Posizione", "Partecipante", "Punteggio"], parent)
+
+    def set_standings(self, standings):
+        # standings: [(posizione, nome, punteggio)] come emesso da MainViewModel.standings_updated
+        self.set_rows(standings)
+
+
+class ChoiceTableModel(RowTableModel):
+    # Tabella delle partite con l'ultima colonna modificabile tramite ChoiceDelegate
+    # (pronostico o risultato); values() restituisce {chiave: valore scelto} per le sole celle
+    # compilate, così le partite mai toccate non vengono salvate con un valore predefinito
+    def __init__(self, headers, choices, parent=None):
+        super().__init__(headers, parent)
+        self.choices = choices
+        self.choice_column = len(headers) - 1
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() == self.choice_column:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or not index.isValid() or value not in self.choices:
+            return False
+        row = list(self.rows[index.row()])
+        row[index.column()] = value
+        self.rows[index.row()] = tuple(row)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def set_matches(self, matches, values):
+        # matches: partite (con id, home_team, away_team); values: {match_id: valore} già inseriti
+        self.set_rows(
+            [(f"{m.home_team} vs {m.away_team}", m.home_team, m.away_team, values.get(m.id, NO_CHOICE))
+             for m in matches],
+            [m.id for m in matches]
+        )
+
+    def values(self):
+        return {key: row[self.choice_column] for key, row in zip(self.keys, self.rows)
+                if row[self.choice_column] != NO_CHOICE}
+
+
+class ChoiceDelegate(QStyledItemDelegate):
+    # Editor a tendina creato solo durante la modifica, invece di un QComboBox permanente per riga
+    def __init__(self, choices, parent=None):
+        super().__init__(parent)
+        self.choices = choices
+
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        editor.addItems(self.choices)
+        editor.activated.connect(lambda: self.commit_and_close(editor))
+        return editor
+
+    def commit_and_close(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
+
+    def setEditorData(self, editor, index):
+        # Cella vuota: nessuna voce selezionata, così chiudere l'editor senza scegliere (es. perdita
+        # del focus) non salva la prima voce
+        value = index.data(Qt.ItemDataRole.EditRole)
+        editor.setCurrentIndex(self.choices.index(value) if value in self.choices else -1)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.ItemDataRole.EditRole)
+
+
+class ParticipantListModel(QAbstractListModel):
+    # Partecipanti come coppie (id, nome). set_participants notifica alla vista solo le righe
+    # aggiunte in coda o rinominate; il reset completo resta per i cambi di torneo
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.ids = []
+        self.names = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ids)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{index.row() + 1}. {self.names[index.row()]}"
+        if role == Qt.ItemDataRole.EditRole:
+            return self.names[index.row()]
+        if role == Qt.ItemDataRole.UserRole:
+            return self.ids[index.row()]
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self.names[index.row()]
+        return None
+
+    def set_participants(self, participants):
+        ids = [p.id for p in participants]
+        names = [p.name for p in participants]
+        count = len(self.ids)
+        if ids[:count] != self.ids:
+            self.beginResetModel()
+            self.ids, self.names = ids, names
+            self.endResetModel()
+            return
+
+        for row in range(count):
+            if self.names[row] != names[row]:
+                self.names[row] = names[row]
+                self.dataChanged.emit(self.index(row), self.index(row))
+        if len(ids) > count:
+            # Partecipanti aggiunti in coda: inserimento delle sole nuove righe
+            self.beginInsertRows(QModelIndex(), count, len(ids) - 1)
+            self.ids, self.names = ids, names
+            self.endInsertRows()
+
+
+class ParticipantDelegate(QStyledItemDelegate):
+    # Disegna nome e pulsante di modifica di ogni partecipante senza creare widget: il pulsante
+    # è solo dipinto e il click viene intercettato in editorEvent
+    edit_requested = pyqtSignal(int, str)
+
+    BUTTON_SIZE = 24
+    ITEM_SIZE = QSize(200, 32)
+
+    def __init__(self, icon_path="images/edit_icon.png", parent=None):
+        super().__init__(parent)
+        self.icon = QIcon(icon_path)
+
+    def button_rect(self, rect):
+        size = self.BUTTON_SIZE
+        return QRect(rect.right() - size - 4, rect.top() + (rect.height() - size) // 2, size, size)
+
+    def sizeHint(self, option, index):
+        return self.ITEM_SIZE
+
+    def paint(self, painter, option, index):
+        style = option.widget.style() if option.widget else QApplication.style()
+
+        item_option = QStyleOptionViewItem(option)
+        self.initStyleOption(item_option, index)
+        item_option.rect = option.rect.adjusted(0, 0, -(self.BUTTON_SIZE + 8), 0)
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, item_option, painter, option.widget)
+
+        button_option = QStyleOptionButton()
+        button_option.rect = self.button_rect(option.rect)
+        button_option.icon = self.icon
+        button_option.iconSize = QSize(self.BUTTON_SIZE - 8, self.BUTTON_SIZE - 8)
+        button_option.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button_option, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and self.button_rect(option.rect).contains(event.position().toPoint())):
+            self.request_edit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
+
+    def request_edit(self, index):
+        self.edit_requested.emit(index.data(Qt.ItemDataRole.UserRole), index.data(Qt.ItemDataRole.EditRole))
+
+
+def filter_proxy(source_model, filter_column=-1, parent=None):
+    # Proxy per ordinamento e filtro testuale (senza distinzione tra maiuscole e minuscole)
+    proxy = QSortFilterProxyModel(parent)
+    proxy.setSourceModel(source_model)
+    proxy.setFilterKeyColumn(filter_column)
+    proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+    return proxy